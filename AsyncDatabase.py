@@ -0,0 +1,288 @@
+# asyncio variant of the Database.py API: the same functions as coroutines, with the same ReturnValue and
+# bad object results, served from one event loop over Utility/AsyncDBConnector's pool instead of holding a
+# thread per call. the statements, the read cache and the identity map are the ones Database.py uses, and
+# writes invalidate them the same way. creating, clearing and dropping the tables, the bulk loads and
+# transaction() stay synchronous in Database.py
+from typing import Dict, List, Iterable
+import Database
+import Utility.Cache as Cache
+import Utility.IdentityMap as IdentityMap
+from Utility.AsyncDBConnector import AsyncDBConnector
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Business.Dashboard import Dashboard
+
+_succeeded = Database._succeeded
+_insertResults = Database._insertResults
+_addStadiumResults = dict(_insertResults)
+_addStadiumResults[DatabaseException.FOREIGN_KEY_VIOLATION] = ReturnValue.BAD_PARAMS
+_deleteResults = {DatabaseException.NOT_NULL_VIOLATION: ReturnValue.ERROR,
+                  DatabaseException.CHECK_VIOLATION: ReturnValue.ERROR,
+                  DatabaseException.UNIQUE_VIOLATION: ReturnValue.ERROR,
+                  DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.ERROR}
+# playerScoredInMatch and matchInStadium, the synchronous functions report the other errors as OK
+_recordResults = {DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+                  DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.NOT_EXISTS,
+                  DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+                  DatabaseException.UNKNOWN_ERROR: ReturnValue.ERROR}
+
+
+# runs one write statement and reports it like the synchronous function: results maps the DatabaseExceptions
+# it tells apart, any other error gives otherwise, and with missing set a statement that changed no row
+# gives missing
+async def _modify(statement: str, params: tuple, results: dict, otherwise=ReturnValue.ERROR,
+                  missing=None) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    try:
+        conn = await AsyncDBConnector.connect()
+        rows_effected, _ = await conn.executePrepared(statement, params)
+        if missing is not None and rows_effected == 0:
+            result = missing
+    except DatabaseException.ConnectionInvalid:
+        result = ReturnValue.ERROR
+    except Exception as e:
+        result = results.get(type(e), otherwise)
+    finally:
+        if conn is not None:
+            conn.close()
+    return result
+
+
+# the rows of one read statement, None when the connection is unusable. with raising set other errors are
+# raised, as the synchronous analytics functions let them through, otherwise they give None too
+async def _read(statement: str, params: tuple = (), raising: bool = False) -> list:
+    conn = None
+    try:
+        conn = await AsyncDBConnector.connect()
+        effected_rows, tuples = await conn.executePrepared(statement, params)
+        return tuples
+    except DatabaseException.ConnectionInvalid:
+        return None
+    except Exception:
+        if raising:
+            raise
+        return None
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+async def _ids(statement: str, params: tuple = ()) -> List[int]:
+    tuples = await _read(statement, params, raising=True)
+    if tuples is None:
+        return []
+    return [r[0] for r in tuples.rows]
+
+
+async def _profile(kind: str, statement: str, entityID, fromResultSet, bad):
+    hit, entity, token = IdentityMap.lookup(kind, entityID)
+    if hit:
+        return entity if entity is not None else bad()
+    tuples = await _read(statement, (entityID,))
+    if tuples is None:
+        return bad()
+    entities = fromResultSet(tuples)
+    IdentityMap.remember(kind, entityID, entities[0] if len(entities) != 0 else None, token)
+    return entities[0] if len(entities) != 0 else bad()
+
+
+# get*Profiles: like Database._profiles, ids the identity map holds are served from it and the others are
+# read in one round trip
+async def _profiles(kind: str, statement: str, ids: Iterable[int], fromResultSet, entityID, bad) -> list:
+    ids = list(ids)
+    known = {}
+    tokens = {}
+    for i in ids:
+        if type(i) is int and i in Database._INTEGER and i not in known:
+            hit, entity, token = IdentityMap.lookup(kind, i)
+            if hit:
+                known[i] = entity
+            else:
+                tokens[i] = token
+    if len(tokens) != 0:
+        tuples = await _read(statement, (list(tokens),))
+        if tuples is not None:
+            found = {entityID(entity): entity for entity in fromResultSet(tuples)}
+            for i, token in tokens.items():
+                known[i] = found.get(i)
+                IdentityMap.remember(kind, i, known[i], token)
+    return [known[i] if type(i) is int and i in Database._INTEGER and known.get(i) is not None else bad()
+            for i in ids]
+
+
+async def addTeam(teamID: int) -> ReturnValue:
+    return await _modify("addTeam", (teamID,), _insertResults)
+
+
+@Cache.invalidates(Database.addMatch.changes, _succeeded)
+async def addMatch(match: Match) -> ReturnValue:
+    return await _modify("addMatch", (match.getMatchID(), match.getCompetition(), match.getHomeTeamID(),
+                                      match.getAwayTeamID()), _insertResults)
+
+
+async def getMatchProfile(matchID: int) -> Match:
+    return await _profile("Match", "getMatchProfile", matchID, Database.matchesFromResultSet, Match.badMatch)
+
+
+async def getMatchProfiles(matchIDs: Iterable[int]) -> List[Match]:
+    return await _profiles("Match", "getMatchProfiles", matchIDs, Database.matchesFromResultSet, Match.getMatchID,
+                           Match.badMatch)
+
+
+@Cache.invalidates(Database.deleteMatch.changes, _succeeded)
+async def deleteMatch(match: Match) -> ReturnValue:
+    return await _modify("deleteMatch", (match.getMatchID(), match.getHomeTeamID(), match.getAwayTeamID(),
+                                         match.getCompetition()), _deleteResults, missing=ReturnValue.NOT_EXISTS)
+
+
+@Cache.invalidates(Database.addPlayer.changes, _succeeded)
+async def addPlayer(player: Player) -> ReturnValue:
+    return await _modify("addPlayer", (player.getPlayerID(), player.getTeamID(), player.getAge(), player.getHeight(),
+                                       player.getFoot()), _insertResults)
+
+
+async def getPlayerProfile(playerID: int) -> Player:
+    return await _profile("Player", "getPlayerProfile", playerID, Database.playersFromResultSet, Player.badPlayer)
+
+
+async def getPlayerProfiles(playerIDs: Iterable[int]) -> List[Player]:
+    return await _profiles("Player", "getPlayerProfiles", playerIDs, Database.playersFromResultSet,
+                           Player.getPlayerID, Player.badPlayer)
+
+
+@Cache.invalidates(Database.deletePlayer.changes, _succeeded)
+async def deletePlayer(player: Player) -> ReturnValue:
+    return await _modify("deletePlayer", (player.getPlayerID(), player.getTeamID()), _deleteResults,
+                         missing=ReturnValue.NOT_EXISTS)
+
+
+@Cache.invalidates(Database.addStadium.changes, _succeeded)
+async def addStadium(stadium: Stadium) -> ReturnValue:
+    return await _modify("addStadium", (stadium.getStadiumID(), stadium.getCapacity(), stadium.getBelongsTo()),
+                         _addStadiumResults)
+
+
+async def getStadiumProfile(stadiumID: int) -> Stadium:
+    return await _profile("Stadium", "getStadiumProfile", stadiumID, Database.stadiumsFromResultSet,
+                          Stadium.badStadium)
+
+
+async def getStadiumProfiles(stadiumIDs: Iterable[int]) -> List[Stadium]:
+    return await _profiles("Stadium", "getStadiumProfiles", stadiumIDs, Database.stadiumsFromResultSet,
+                           Stadium.getStadiumID, Stadium.badStadium)
+
+
+@Cache.invalidates(Database.deleteStadium.changes, _succeeded)
+async def deleteStadium(stadium: Stadium) -> ReturnValue:
+    return await _modify("deleteStadium", (stadium.getStadiumID(), stadium.getCapacity(), stadium.getBelongsTo()),
+                         _deleteResults, missing=ReturnValue.NOT_EXISTS)
+
+
+@Cache.invalidates(Database.playerScoredInMatch.changes, _succeeded)
+async def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValue:
+    return await _modify("playerScoredInMatch", (player.getPlayerID(), match.getMatchID(), amount), _recordResults,
+                         otherwise=ReturnValue.OK)
+
+
+# like the synchronous function, errors other than the ones it checks for are not reported
+@Cache.invalidates(Database.playerDidntScoreInMatch.changes, _succeeded)
+async def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
+    return await _modify("playerDidntScoreInMatch", (player.getPlayerID(), match.getMatchID()), _deleteResults,
+                         otherwise=ReturnValue.OK, missing=ReturnValue.NOT_EXISTS)
+
+
+@Cache.invalidates(Database.matchInStadium.changes, _succeeded)
+async def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnValue:
+    return await _modify("matchInStadium", (stadium.getStadiumID(), match.getMatchID(), attendance), _recordResults,
+                         otherwise=ReturnValue.OK)
+
+
+# like the synchronous function, errors other than the ones it checks for are not reported
+@Cache.invalidates(Database.matchNotInStadium.changes, _succeeded)
+async def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
+    return await _modify("matchNotInStadium", (stadium.getStadiumID(), match.getMatchID()), _deleteResults,
+                         otherwise=ReturnValue.OK, missing=ReturnValue.NOT_EXISTS)
+
+
+# -1 when the connection is unusable and, like the synchronous function, 0 on any other error
+@Cache.cached(Database.averageAttendanceInStadium.dependencies, unless=-1)
+async def averageAttendanceInStadium(stadiumID: int) -> float:
+    try:
+        tuples = await _read("averageAttendanceInStadium", (stadiumID,), raising=True)
+    except Exception:
+        return 0
+    if tuples is None:
+        return -1
+    if len(tuples.rows) == 0 or tuples.rows[0][0] is None:
+        return 0
+    return tuples.rows[0][0]
+
+
+@Cache.cached(Database.stadiumTotalGoals.dependencies, unless=-1)
+async def stadiumTotalGoals(stadiumID: int) -> int:
+    tuples = await _read("stadiumTotalGoals", (stadiumID,), raising=True)
+    if tuples is None:
+        return -1
+    return tuples.rows[0][0] if len(tuples.rows) != 0 else 0
+
+
+@Cache.cached(Database.playerIsWinner.dependencies)
+async def playerIsWinner(playerID: int, matchID: int) -> bool:
+    tuples = await _read("playerIsWinner", (playerID, matchID), raising=True)
+    return tuples is not None and len(tuples.rows) != 0
+
+
+@Cache.cached(Database.getActiveTallTeams.dependencies)
+async def getActiveTallTeams() -> List[int]:
+    return await _ids("getActiveTallTeams")
+
+
+@Cache.cached(Database.getActiveTallRichTeams.dependencies)
+async def getActiveTallRichTeams() -> List[int]:
+    return await _ids("getActiveTallRichTeams")
+
+
+@Cache.cached(Database.popularTeams.dependencies)
+async def popularTeams() -> List[int]:
+    return await _ids("popularTeams")
+
+
+# fetched at once, asynchronous connections cannot hold the server-side cursor Database.py streams it with
+@Cache.cached(Database.getMostAttractiveStadiums.dependencies)
+async def getMostAttractiveStadiums() -> List[int]:
+    return await _ids("getMostAttractiveStadiums")
+
+
+@Cache.cached(Database.mostGoalsForTeam.dependencies)
+async def mostGoalsForTeam(teamID: int) -> List[int]:
+    return await _ids("mostGoalsForTeam", (teamID,))
+
+
+async def mostGoalsForTeams(teamIDs: Iterable[int], k: int = 5) -> Dict[int, List[int]]:
+    teamIDs = list(dict.fromkeys(teamIDs))
+    tuples = await _read("mostGoalsForTeams", (teamIDs, k))
+    if tuples is None:
+        return {}
+    res = {teamID: [] for teamID in teamIDs}
+    for teamID, playerID in tuples:
+        res[teamID].append(playerID)
+    return res
+
+
+@Cache.cached(Database.getClosePlayers.dependencies)
+async def getClosePlayers(playerID: int) -> List[int]:
+    return await _ids("getClosePlayers", (playerID,))
+
+
+async def getDashboard(stadiumIDs: Iterable[int] = ()) -> Dashboard:
+    stadiumIDs = list(dict.fromkeys(stadiumIDs))
+    tuples = await _read("getDashboard", (stadiumIDs,))
+    if tuples is None or len(tuples.rows) == 0:
+        return Dashboard.badDashboard()
+    tallTeams, tallRichTeams, popular, attractive, attendance, goals = tuples.rows[0]
+    return Dashboard(tallTeams, tallRichTeams, popular, attractive, dict(zip(stadiumIDs, attendance)),
+                     dict(zip(stadiumIDs, goals)))
@@ -1,740 +1,1505 @@
-from typing import List
-import Utility.DBConnector as Connector
-from Utility.ReturnValue import ReturnValue
-from Utility.Exceptions import DatabaseException
-from Business.Match import Match
-from Business.Player import Player
-from Business.Stadium import Stadium
-from psycopg2 import sql
-
-
-def createTables():
-    conn = None
-    try:
-        conn = Connector.DBConnector()
-        conn.execute("CREATE TABLE Team(id INTEGER PRIMARY KEY CHECK(id >0)); \
-                      CREATE TABLE Match(match_id INTEGER PRIMARY KEY, CHECK(match_id >0), \
-                                         competition TEXT NOT NULL, \
-                                         homeTeam_id INTEGER NOT NULL, \
-                                         awayTeam_id INTEGER NOT NULL, \
-                                         FOREIGN KEY(homeTeam_id) REFERENCES Team(id), \
-                                         FOREIGN KEY(awayTeam_id) REFERENCES Team(id), \
-                                         CHECK(homeTeam_id != awayTeam_id), \
-                                         CHECK(competition='International' OR competition='Domestic')); \
-                    CREATE TABLE Player(player_id INTEGER PRIMARY KEY CHECK(player_id >0), \
-                                         team_id INTEGER NOT NULL CHECK(team_id >0), \
-                                         age INTEGER NOT NULL CHECK(age >0), \
-                                         height INTEGER NOT NULL CHECK(height >0), \
-                                         preferred_foot TEXT NOT NULL ,\
-                                         FOREIGN KEY(team_id) REFERENCES Team(id), \
-                                         CHECK(preferred_foot='Left' OR preferred_foot='Right')); \
-                    CREATE TABLE Stadium(stadium_id INTEGER PRIMARY KEY CHECK(stadium_id >0),\
-                                           belong_to INTEGER, \
-                                           capacity INTEGER NOT NULL CHECK(capacity >0), \
-                                           FOREIGN KEY(belong_to) REFERENCES Team(id), \
-                                           UNIQUE(belong_to)); \
-                    CREATE TABLE PlayerScores(player_id INTEGER , \
-                                                match_id INTEGER , \
-                                                goals INTEGER CHECK(goals >0), \
-                                                UNIQUE(player_id, match_id), \
- 			                                    FOREIGN KEY(player_id) REFERENCES Player(player_id) ON DELETE CASCADE , \
-			                                    FOREIGN KEY(match_id) REFERENCES Match(match_id) ON DELETE CASCADE); \
-                    CREATE TABLE MatchInStadium(stadium_id INTEGER, \
-                                                  match_id INTEGER , \
-                                                  attendance INTEGER CHECK(attendance>0), \
-                                                  PRIMARY KEY (match_id), \
-			                                      FOREIGN KEY(stadium_id) REFERENCES Stadium(stadium_id) ON DELETE CASCADE,\
-			                                      FOREIGN KEY(match_id) REFERENCES Match(match_id) ON DELETE CASCADE); \
-                    CREATE VIEW active_tall_teams AS\
-                            SELECT team_id FROM Player P, Match M\
-                            WHERE (team_id=M.homeTeam_id AND P.height > 190)\
-                            OR (team_id=M.awayTeam_id AND P.height > 190)\
-                            GROUP BY team_id\
-                            HAVING COUNT(height)>=2;\
-                    CREATE VIEW scores_in_stadium AS\
-                            SELECT Stadium.stadium_id, PlayerScores.goals FROM Stadium\
-                            LEFT OUTER JOIN MatchInStadium ON(Stadium.stadium_id=MatchInStadium.stadium_id)\
-                            FULL JOIN PlayerScores ON(PlayerScores.match_id=MatchInStadium.match_id);\
-                    CREATE VIEW all_players_score AS \
-                            SELECT Player.player_id, Player.team_id, PlayerScores.match_id, PlayerScores.goals FROM Player \
-                            LEFT OUTER JOIN PlayerScores ON(Player.player_id=PlayerScores.player_id);")
-
-    except DatabaseException.ConnectionInvalid as e:
-        print(e)
-    except DatabaseException.NOT_NULL_VIOLATION as e:
-        print(e)
-    except DatabaseException.CHECK_VIOLATION as e:
-        print(e)
-    except DatabaseException.UNIQUE_VIOLATION as e:
-        print(e)
-    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
-        print(e)
-    except Exception as e:
-        print(e)
-    finally:
-        conn.close()
-
-
-def clearTables():
-    conn = None
-    try:
-       conn = Connector.DBConnector()
-       conn.execute("DELETE FROM Team;\
-                     DELETE FROM Match;\
-                     DELETE FROM Player;\
-                     DELETE FROM Stadium;\
-                     DELETE FROM PlayerScores;\
-                     DELETE FROM MatchInStadium;")
-    except DatabaseException.ConnectionInvalid as e:
-        print(e)
-    except DatabaseException.NOT_NULL_VIOLATION as e:
-        print(e)
-    except DatabaseException.CHECK_VIOLATION as e:
-        print(e)
-    except DatabaseException.UNIQUE_VIOLATION as e:
-        print(e)
-    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
-        print(e)
-    except Exception as e:
-        print(e)
-    finally:
-        conn.close()
-
-
-def dropTables():
-    conn = None
-    try:
-        conn = Connector.DBConnector()
-        conn.execute("DROP TABLE IF EXISTS Team CASCADE ;\
-                      DROP TABLE IF EXISTS Match CASCADE ;\
-                      DROP TABLE IF EXISTS Player CASCADE ;\
-                      DROP TABLE IF EXISTS Stadium CASCADE;\
-                      DROP TABLE IF EXISTS PlayerScores;\
-                      DROP TABLE IF EXISTS MatchInStadium;\
-                      DROP VIEW IF EXISTS active_tall_teams; \
-                      DROP VIEW IF EXISTS scores_in_stadium; \
-                      DROP VIEW IF EXISTS all_players_score;")
-    except DatabaseException.ConnectionInvalid as e:
-        print(e)
-    except DatabaseException.NOT_NULL_VIOLATION as e:
-        print(e)
-    except DatabaseException.CHECK_VIOLATION as e:
-        print(e)
-    #except DatabaseException.UNIQUE_VIOLATION as e:
-     #   print(e)
-    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
-        print(e)
-    except Exception as e:
-        print(e)
-    finally:
-        conn.close()
-
-
-def addTeam(teamID: int) -> ReturnValue:
-        conn = None
-        result = ReturnValue.OK
-        try:
-            conn = Connector.DBConnector()
-            query = sql.SQL("INSERT INTO Team(id) VALUES({id})").format(id=sql.Literal(teamID))
-
-            rows_effected, _ = conn.execute(query)
-        except DatabaseException.ConnectionInvalid:
-            conn.rollback()
-            result = ReturnValue.ERROR
-        except DatabaseException.UNIQUE_VIOLATION:
-            conn.rollback()
-            result = ReturnValue.ALREADY_EXISTS
-        except DatabaseException.CHECK_VIOLATION:
-            conn.rollback()
-            result = ReturnValue.BAD_PARAMS
-        except DatabaseException.NOT_NULL_VIOLATION:
-            conn.rollback()
-            result = ReturnValue.BAD_PARAMS
-        except DatabaseException.UNKNOWN_ERROR:
-            conn.rollback()
-            result = ReturnValue.ERROR
-        except Exception:
-            result = ReturnValue.ERROR
-        finally:
-            conn.close()
-            return result
-
-
-def addMatch(match: Match) -> ReturnValue:
-    conn = None
-    result = ReturnValue.OK
-    try:
-        conn = Connector.DBConnector()
-        matches = sql.SQL(
-            "INSERT INTO Match(match_id,competition,homeTeam_id,awayTeam_id) \
-            VALUES({id},{competition},{homeTeam_id},{awayTeam_id});").format(
-            id=sql.Literal(match.getMatchID())
-            , competition=sql.Literal(match.getCompetition()), homeTeam_id=sql.Literal(match.getHomeTeamID()),
-            awayTeam_id=sql.Literal(match.getAwayTeamID()))
-        rows_effected, _ = conn.execute(matches)
-        conn.commit()
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ALREADY_EXISTS
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.UNKNOWN_ERROR:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def getMatchProfile(matchID: int) -> Match:
-    conn = None
-    match = Match()
-    try:
-        conn = Connector.DBConnector()
-        matches = sql.SQL("SELECT * FROM Match WHERE Match.match_id = {id}").format(id=sql.Literal(matchID))
-        rows_effected, result = conn.execute(matches)
-        conn.commit()
-        match = Match(result.rows[0][0], result.rows[0][1], result.rows[0][2], result.rows[0][3])
-    except DatabaseException.ConnectionInvalid:
-        match = Match.badMatch()
-    except DatabaseException.CHECK_VIOLATION:
-        match = Match.badMatch()
-    except DatabaseException.NOT_NULL_VIOLATION:
-        match = Match.badMatch()
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        match = Match.badMatch()
-    except DatabaseException.UNKNOWN_ERROR:
-        match = Match.badMatch()
-    except Exception:
-        match = Match.badMatch()
-    finally:
-        conn.close()
-        return match
-
-
-def deleteMatch(match: Match) -> ReturnValue:
-    conn = None
-    result, rows_effected = ReturnValue.OK, None
-    try:
-        conn = Connector.DBConnector()
-        matches = sql.SQL(
-            "DELETE FROM Match WHERE Match.match_id={id} AND Match.homeTeam_id={homeTeam_id} AND Match.awayTeam_id={awayTeam_id} AND Match.competition={competition}").format(
-            id=sql.Literal(match.getMatchID()), homeTeam_id=sql.Literal(match.getHomeTeamID()), competition=sql.Literal(match.getCompetition()),
-            awayTeam_id=sql.Literal(match.getAwayTeamID()))
-        rows_effected, _ = conn.execute(matches)
-        if rows_effected is not None and rows_effected == 0:
-            result = ReturnValue.NOT_EXISTS
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        conn.rollback()
-        result = ReturnValue.ERROR
-
-    finally:
-        conn.close()
-        return result
-
-
-def addPlayer(player: Player) -> ReturnValue:
-    conn = None
-    result = ReturnValue.OK
-    try:
-        conn = Connector.DBConnector()
-        players = sql.SQL(
-            "INSERT INTO Player(player_id,team_id,age,height,preferred_foot) VALUES({id},{team_id},{age},{height},{preferred_foot});").format(
-            id=sql.Literal(player.getPlayerID())
-            , team_id=sql.Literal(player.getTeamID()), age=sql.Literal(player.getAge()),
-            height=sql.Literal(player.getHeight()), preferred_foot=sql.Literal(player.getFoot()))
-        rows_effected, _ = conn.execute(players)
-        conn.commit()
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ALREADY_EXISTS
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.UNKNOWN_ERROR:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def getPlayerProfile(playerID: int) -> Player:
-    conn = None
-    player = Player()
-    try:
-        conn = Connector.DBConnector()
-        players = sql.SQL("SELECT * FROM Player WHERE Player.player_id = {id}").format(id=sql.Literal(playerID))
-        rows_effected, result = conn.execute(players)
-        conn.commit()
-        player = Player(result.rows[0][0], result.rows[0][1], result.rows[0][2], result.rows[0][3], result.rows[0][4])
-    except DatabaseException.ConnectionInvalid:
-        player = Player.badPlayer()
-    except DatabaseException.CHECK_VIOLATION:
-        player = Player.badPlayer()
-    except DatabaseException.NOT_NULL_VIOLATION:
-        player = Player.badPlayer()
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        player = Player.badPlayer()
-    except DatabaseException.UNKNOWN_ERROR:
-        player = Player.badPlayer()
-    except Exception:
-        player = Player.badPlayer()
-    finally:
-        conn.close()
-        return player
-
-
-def deletePlayer(player: Player) -> ReturnValue:
-    conn = None
-    result, rows_effected = ReturnValue.OK, None
-    try:
-        conn = Connector.DBConnector()
-        players = sql.SQL("DELETE FROM Player WHERE Player.player_id={id} AND Player.team_id={team_id}").format(
-            id=sql.Literal(player.getPlayerID())
-            , team_id=sql.Literal(player.getTeamID()))
-        rows_effected, _ = conn.execute(players)
-        if rows_effected is not None and rows_effected == 0:
-            result = ReturnValue.NOT_EXISTS
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        conn.rollback()
-        result = ReturnValue.ERROR
-
-    finally:
-        conn.close()
-        return result
-
-
-def addStadium(stadium: Stadium) -> ReturnValue:
-    conn = None
-    result = ReturnValue.OK
-    try:
-        conn = Connector.DBConnector()
-        stadiums = sql.SQL(
-            "INSERT INTO Stadium(stadium_id,capacity,belong_to) VALUES({id},{capacity},{belong_to});").format(
-            id=sql.Literal(stadium.getStadiumID())
-            , capacity=sql.Literal(stadium.getCapacity()), belong_to=sql.Literal(stadium.getBelongsTo()))
-        rows_effected, _ = conn.execute(stadiums)
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ALREADY_EXISTS
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.UNKNOWN_ERROR:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def getStadiumProfile(stadiumID: int) -> Stadium:
-    conn = None
-    try:
-        conn = Connector.DBConnector()
-        stadiums = sql.SQL("SELECT * FROM Stadium WHERE Stadium.stadium_id = {id}").format(id=sql.Literal(stadiumID))
-        rows_effected, result = conn.execute(stadiums)
-        conn.commit()
-        stadium = Stadium(result.rows[0][0], result.rows[0][2], result.rows[0][1])
-    except DatabaseException.ConnectionInvalid:
-        stadium = Stadium.badStadium()
-    except DatabaseException.CHECK_VIOLATION:
-        stadium = Stadium.badStadium()
-    except DatabaseException.NOT_NULL_VIOLATION:
-        stadium = Stadium.badStadium()
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        stadium = Stadium.badStadium()
-    except DatabaseException.UNKNOWN_ERROR:
-        stadium = Stadium.badStadium()
-    except Exception:
-        stadium = Stadium.badStadium()
-    finally:
-        conn.close()
-        return stadium
-
-
-def deleteStadium(stadium: Stadium) -> ReturnValue:
-    conn = None
-    result, rows_effected = ReturnValue.OK, None
-    try:
-        conn = Connector.DBConnector()
-        stadiums = sql.SQL("DELETE FROM Stadium WHERE Stadium.stadium_id={id} AND Stadium.capacity={capacity} AND Stadium.belong_to={belong_to}").format(
-            id=sql.Literal(stadium.getStadiumID()), capacity=sql.Literal(stadium.getCapacity()), belong_to=sql.Literal(stadium.getBelongsTo()))
-        rows_effected,_ = conn.execute(stadiums)
-        if rows_effected is not None and rows_effected == 0:
-            result = ReturnValue.NOT_EXISTS
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except Exception:
-        conn.rollback()
-        result = ReturnValue.ERROR
-
-    finally:
-        conn.close()
-        return result
-
-
-def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValue:
-    conn = None
-    result = ReturnValue.OK
-    try:
-        conn = Connector.DBConnector()
-        playersScores = sql.SQL(
-            "INSERT INTO PlayerScores(player_id,match_id,goals) VALUES({id},{match_id},{goals});").format(
-            id=sql.Literal(player.getPlayerID())
-            , match_id=sql.Literal(match.getMatchID()), goals=sql.Literal(amount)
-        )
-        rows_effected, _ = conn.execute(playersScores)
-        conn.commit()
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION or DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.FOREIGN_KEY_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.NOT_EXISTS
-    except DatabaseException.UNIQUE_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ALREADY_EXISTS
-    except DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
-    conn = None
-    result, rows_effected = ReturnValue.OK, None
-    try:
-        conn = Connector.DBConnector()
-        playerscore = sql.SQL(
-            "Delete FROM PlayerScores WHERE PlayerScores.player_id = {id} AND PlayerScores.match_id={match_id} ").format(
-            id=sql.Literal(player.getPlayerID()),
-            match_id=sql.Literal(match.getMatchID()))
-        rows_effected, _ = conn.execute(playerscore)
-        conn.commit()
-        if rows_effected is not None and rows_effected == 0:
-            result = ReturnValue.NOT_EXISTS
-
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnValue:
-    conn = None
-    result = ReturnValue.OK
-    sid = stadium.getStadiumID()
-    mid = match.getMatchID()
-    try:
-        conn = Connector.DBConnector()
-        matchesStaduim = sql.SQL(
-            "INSERT INTO MatchInStadium(stadium_id,match_id,attendance) VALUES({id},{match_id},{atten});").format(
-            id=sql.Literal(sid), match_id=sql.Literal(mid), atten=sql.Literal(attendance) )
-        rows_effected, _ = conn.execute(matchesStaduim)
-        conn.commit()
-    except DatabaseException.ConnectionInvalid as e:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION or DatabaseException.NOT_NULL_VIOLATION as e:
-        conn.rollback()
-        result = ReturnValue.BAD_PARAMS
-    except DatabaseException.UNIQUE_VIOLATION as e:
-        conn.rollback()
-        result = ReturnValue.ALREADY_EXISTS
-    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
-        conn.rollback()
-        result = ReturnValue.NOT_EXISTS
-    except DatabaseException.UNKNOWN_ERROR or Exception as e:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
-    conn = None
-    result, rows_effected = ReturnValue.OK, None
-    try:
-        conn = Connector.DBConnector()
-        match_not_in = sql.SQL(
-            "DELETE FROM MatchInStadium WHERE MatchInStadium.stadium_id = {id} AND MatchInStadium.match_id={match_id} ").format(
-            id=sql.Literal(stadium.getStadiumID()),
-            match_id=sql.Literal(match.getMatchID()))
-        rows_effected, _ = conn.execute(match_not_in)
-        conn.commit()
-        if rows_effected is not None and rows_effected == 0:
-            result = ReturnValue.NOT_EXISTS
-    except DatabaseException.ConnectionInvalid:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.NOT_NULL_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    except DatabaseException.CHECK_VIOLATION:
-        conn.rollback()
-        result = ReturnValue.ERROR
-    finally:
-        conn.close()
-        return result
-
-
-def averageAttendanceInStadium(stadiumID: int) -> float:
-    conn = None
-    result, rows_effected =0, None
-    try:
-        conn = Connector.DBConnector()
-        averageAttendance = sql.SQL(
-            "SELECT  AVG(attendance) FROM MatchInStadium WHERE stadium_id={ss} ").format(
-            ss=sql.Literal(stadiumID))
-        rows_effected, tuples = conn.execute(averageAttendance)
-        conn.commit()
-        if tuples.rows[0][0] is None or len(tuples.rows) == 0:
-            result = 0
-        else:
-            result = tuples.rows[0][0]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        result = -1
-    finally:
-        conn.close()
-        return result
-
-
-def stadiumTotalGoals(stadiumID: int) -> int:
-    conn = None
-    result = 0
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT COALESCE(SUM(goals),0) FROM PlayerScores \
-                         WHERE match_id IN \
-                         (SELECT MatchInStadium.match_id FROM MatchInStadium \
-                         WHERE MatchInStadium.stadium_id={0})").format(sql.Literal(stadiumID))
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            result = tuples.rows[0][0]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        result = -1
-    conn.close()
-    return result
-
-
-def playerIsWinner(playerID: int, matchID: int) -> bool:
-    conn = None
-    result = False
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT player_id\
-                         FROM PlayerScores \
-                         WHERE (player_id={PID}) AND (match_id={MID}) \
-                         GROUP BY player_id \
-                         HAVING (2*COALESCE(SUM(goals),0)>=(SELECT COALESCE(SUM(goals),0) FROM PlayerScores WHERE match_id={MID})) \
-                         AND (COALESCE(SUM(goals),0)!=0);").format(PID=sql.Literal(playerID), MID=sql.Literal(matchID))
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            result = True
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        result = False
-    conn.close()
-    return result
-
-
-def getActiveTallTeams() -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT team_id FROM active_tall_teams ORDER BY team_id DESC LIMIT 5")
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-             res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
-
-
-def getActiveTallRichTeams() -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT team_id FROM active_tall_teams \
-                         WHERE team_id IN (SELECT belong_to FROM Stadium WHERE capacity>55000) \
-                         ORDER BY team_id ASC LIMIT 5")
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
-
-
-def popularTeams() -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT T.homeTeam_id FROM  \
-                            (SELECT Match.homeTeam_id, MatchInStadium.attendance FROM \
-                            Match LEFT OUTER JOIN MatchInStadium ON(Match.match_id=MatchInStadium.match_id)) T\
-                         GROUP BY T.homeTeam_id \
-                         HAVING MIN(COALESCE(T.attendance,0)) > 40000 \
-                         ORDER BY T.homeTeam_id DESC LIMIT 10;")
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
-
-
-def getMostAttractiveStadiums() -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT stadium_id ,COALESCE(SUM(goals),0) AS scores \
-                         FROM scores_in_stadium \
-                         GROUP BY stadium_id \
-                         ORDER BY scores DESC, stadium_id ASC;")
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
-
-
-def mostGoalsForTeam(teamID: int) -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT player_id, COALESCE(SUM(goals),0) AS scores \
-                         FROM all_players_score \
-                         WHERE team_id={0} \
-                         GROUP BY player_id \
-                         ORDER BY scores DESC, player_id DESC LIMIT 5;").format(sql.Literal(teamID))
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
-
-
-def getClosePlayers(playerID: int) -> List[int]:
-    conn = None
-    res = []
-    try:
-        conn = Connector.DBConnector()
-        query = sql.SQL("SELECT AP.player_id \
-                         FROM all_players_score AP \
-                         WHERE AP.player_id!={0} \
-                         AND AP.match_id IN(SELECT match_id FROM PlayerScores WHERE player_id={0}) \
-                         GROUP BY AP.player_id \
-                         HAVING 2*COUNT(AP.match_id) >= (SELECT COUNT(match_id) FROM PlayerScores WHERE player_id={0}) \
-                         ORDER BY player_id ASC LIMIT 10;").format(sql.Literal(playerID))
-        effected_rows, tuples = conn.execute(query)
-        if len(tuples.rows) != 0:
-            res = [r[0] for r in tuples.rows]
-    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
-        conn.close()
-        return []
-    conn.close()
-    return res
+from typing import Dict, List, Iterable, Iterator, Tuple
+from itertools import starmap
+from operator import itemgetter
+import Utility.DBConnector as Connector
+import Utility.Cache as Cache
+import Utility.IdentityMap as IdentityMap
+import Utility.BatchLoader as BatchLoader
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Business.Dashboard import Dashboard
+
+
+# the ids an INTEGER column can hold, an id out of it would fail a whole ANY($1::INTEGER[]) read
+_INTEGER = range(-2 ** 31, 2 ** 31)
+
+
+# get*Profiles: one entity (or the bad sentinel) per id, in the order asked. ids the identity map holds are
+# served from it and the others are read in one round trip with statement, ids that are not ints of the
+# INTEGER range are bad
+def _profiles(kind: str, statement: str, ids: Iterable[int], fromResultSet, entityID, bad) -> list:
+    ids = list(ids)
+    known = {}
+    tokens = {}
+    for i in ids:
+        if type(i) is int and i in _INTEGER and i not in known:
+            hit, entity, token = IdentityMap.lookup(kind, i)
+            if hit:
+                known[i] = entity
+            else:
+                tokens[i] = token
+    if len(tokens) != 0:
+        conn = None
+        try:
+            conn = Connector.DBConnector()
+            _, result = conn.executePrepared(statement, (list(tokens),))
+            conn.commit()
+            found = {entityID(entity): entity for entity in fromResultSet(result)}
+            for i, token in tokens.items():
+                known[i] = found.get(i)
+                IdentityMap.remember(kind, i, known[i], token)
+        except Exception:
+            pass
+        finally:
+            if conn is not None:
+                conn.close()
+    return [known[i] if type(i) is int and i in _INTEGER and known.get(i) is not None else bad() for i in ids]
+
+
+# bulk conversion of query results into library objects, columns are found by name so any SELECT that
+# returns them (in any order, among other columns) can be converted
+def _objectsFromResultSet(cls, result: Connector.ResultSet, columns: tuple) -> list:
+    if result.isEmpty():
+        return []
+    positions = tuple(result.cols[col] for col in columns)
+    if positions == tuple(range(len(result.cols_header))):
+        return list(starmap(cls, result.rows))  # rows are already in constructor order
+    return list(starmap(cls, map(itemgetter(*positions), result.rows)))
+
+
+def matchesFromResultSet(result: Connector.ResultSet) -> List[Match]:
+    return _objectsFromResultSet(Match, result, ("match_id", "competition", "hometeam_id", "awayteam_id"))
+
+
+def playersFromResultSet(result: Connector.ResultSet) -> List[Player]:
+    return _objectsFromResultSet(Player, result, ("player_id", "team_id", "age", "height", "preferred_foot"))
+
+
+def stadiumsFromResultSet(result: Connector.ResultSet) -> List[Stadium]:
+    return _objectsFromResultSet(Stadium, result, ("stadium_id", "capacity", "belong_to"))
+
+
+# with Database.transaction(): ... makes every call of the block share one connection and one commit,
+# see Connector.transaction
+def transaction(savepoints: bool = False):
+    return Connector.transaction(savepoints)
+
+
+# a single write succeeded, or at least one row of a batch did
+def _succeeded(result) -> bool:
+    if isinstance(result, list):
+        return ReturnValue.OK in result
+    return result == ReturnValue.OK
+
+
+def createTables():
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.execute("CREATE TABLE Team(id INTEGER PRIMARY KEY CHECK(id >0)); \
+                      CREATE TABLE Match(match_id INTEGER PRIMARY KEY, CHECK(match_id >0), \
+                                         competition TEXT NOT NULL, \
+                                         homeTeam_id INTEGER NOT NULL, \
+                                         awayTeam_id INTEGER NOT NULL, \
+                                         FOREIGN KEY(homeTeam_id) REFERENCES Team(id), \
+                                         FOREIGN KEY(awayTeam_id) REFERENCES Team(id), \
+                                         CHECK(homeTeam_id != awayTeam_id), \
+                                         CHECK(competition='International' OR competition='Domestic')); \
+                    CREATE TABLE Player(player_id INTEGER PRIMARY KEY CHECK(player_id >0), \
+                                         team_id INTEGER NOT NULL CHECK(team_id >0), \
+                                         age INTEGER NOT NULL CHECK(age >0), \
+                                         height INTEGER NOT NULL CHECK(height >0), \
+                                         preferred_foot TEXT NOT NULL ,\
+                                         FOREIGN KEY(team_id) REFERENCES Team(id), \
+                                         CHECK(preferred_foot='Left' OR preferred_foot='Right')); \
+                    CREATE TABLE Stadium(stadium_id INTEGER PRIMARY KEY CHECK(stadium_id >0),\
+                                           belong_to INTEGER, \
+                                           capacity INTEGER NOT NULL CHECK(capacity >0), \
+                                           FOREIGN KEY(belong_to) REFERENCES Team(id), \
+                                           UNIQUE(belong_to)); \
+                    CREATE TABLE PlayerScores(player_id INTEGER , \
+                                                match_id INTEGER , \
+                                                goals INTEGER CHECK(goals >0), \
+                                                UNIQUE(player_id, match_id) INCLUDE(goals), \
+ 			                                    FOREIGN KEY(player_id) REFERENCES Player(player_id) ON DELETE CASCADE , \
+			                                    FOREIGN KEY(match_id) REFERENCES Match(match_id) ON DELETE CASCADE); \
+                    CREATE TABLE MatchInStadium(stadium_id INTEGER, \
+                                                  match_id INTEGER , \
+                                                  attendance INTEGER CHECK(attendance>0), \
+                                                  PRIMARY KEY (match_id) INCLUDE(stadium_id, attendance), \
+			                                      FOREIGN KEY(stadium_id) REFERENCES Stadium(stadium_id) ON DELETE CASCADE,\
+			                                      FOREIGN KEY(match_id) REFERENCES Match(match_id) ON DELETE CASCADE); "
+                    # per team, its players taller than 190 and its matches, kept by the Player and Match triggers
+                    "CREATE TABLE TeamActivity(team_id INTEGER PRIMARY KEY, \
+                                                tall_players INTEGER NOT NULL DEFAULT 0, \
+                                                matches INTEGER NOT NULL DEFAULT 0); \
+                    CREATE OR REPLACE FUNCTION team_activity_players() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP IN ('UPDATE', 'DELETE') THEN \
+                            UPDATE TeamActivity A SET tall_players = A.tall_players - D.n \
+                            FROM (SELECT team_id, COUNT(*) AS n FROM old_rows WHERE height > 190 GROUP BY team_id) D \
+                            WHERE A.team_id = D.team_id; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            INSERT INTO TeamActivity(team_id, tall_players) \
+                            SELECT team_id, COUNT(*) FROM new_rows WHERE height > 190 GROUP BY team_id \
+                            ON CONFLICT(team_id) DO UPDATE SET tall_players = TeamActivity.tall_players + EXCLUDED.tall_players; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE OR REPLACE FUNCTION team_activity_matches() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP IN ('UPDATE', 'DELETE') THEN \
+                            UPDATE TeamActivity A SET matches = A.matches - D.n \
+                            FROM (SELECT team_id, COUNT(*) AS n FROM (SELECT homeTeam_id AS team_id FROM old_rows \
+                                                                      UNION ALL SELECT awayTeam_id FROM old_rows) T \
+                                  GROUP BY team_id) D \
+                            WHERE A.team_id = D.team_id; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            INSERT INTO TeamActivity(team_id, matches) \
+                            SELECT team_id, COUNT(*) FROM (SELECT homeTeam_id AS team_id FROM new_rows \
+                                                           UNION ALL SELECT awayTeam_id FROM new_rows) T \
+                            GROUP BY team_id \
+                            ON CONFLICT(team_id) DO UPDATE SET matches = TeamActivity.matches + EXCLUDED.matches; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE TRIGGER Player_activity_insert AFTER INSERT ON Player REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_players(); \
+                    CREATE TRIGGER Player_activity_update AFTER UPDATE ON Player \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_players(); \
+                    CREATE TRIGGER Player_activity_delete AFTER DELETE ON Player REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_players(); \
+                    CREATE TRIGGER Match_activity_insert AFTER INSERT ON Match REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_matches(); \
+                    CREATE TRIGGER Match_activity_update AFTER UPDATE ON Match \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_matches(); \
+                    CREATE TRIGGER Match_activity_delete AFTER DELETE ON Match REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION team_activity_matches(); "
+                    # tall_players*matches >= 2, written without the product so that it can't overflow
+                    "CREATE VIEW active_tall_teams AS\
+                            SELECT team_id FROM TeamActivity\
+                            WHERE tall_players > 0 AND matches > 0 AND tall_players + matches > 2;"
+                    # per stadium, the goals scored in it and its attendance
+                    "CREATE TABLE StadiumStats(stadium_id INTEGER PRIMARY KEY, \
+                                                total_goals BIGINT NOT NULL DEFAULT 0, \
+                                                attendance_sum BIGINT NOT NULL DEFAULT 0, \
+                                                attendance_count INTEGER NOT NULL DEFAULT 0, \
+                                                FOREIGN KEY(stadium_id) REFERENCES Stadium(stadium_id) \
+                                                ON DELETE CASCADE ON UPDATE CASCADE); \
+                    CREATE OR REPLACE FUNCTION stadium_stats_stadiums() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        INSERT INTO StadiumStats(stadium_id) SELECT stadium_id FROM new_rows; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; "
+                    # goals of a match being deleted are left alone, stadium_stats_matches took them out already
+                    "CREATE OR REPLACE FUNCTION stadium_stats_appearances() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP IN ('UPDATE', 'DELETE') THEN \
+                            UPDATE StadiumStats S SET attendance_sum = S.attendance_sum - D.attendance, \
+                                                      attendance_count = S.attendance_count - D.n, \
+                                                      total_goals = S.total_goals - D.goals \
+                            FROM (SELECT O.stadium_id, SUM(O.attendance) AS attendance, COUNT(*) AS n, \
+                                         COALESCE(SUM((SELECT SUM(goals) FROM PlayerScores P WHERE P.match_id = O.match_id \
+                                                       AND EXISTS(SELECT 1 FROM Match WHERE match_id = O.match_id))), 0) AS goals \
+                                  FROM old_rows O GROUP BY O.stadium_id) D \
+                            WHERE S.stadium_id = D.stadium_id; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            UPDATE StadiumStats S SET attendance_sum = S.attendance_sum + D.attendance, \
+                                                      attendance_count = S.attendance_count + D.n, \
+                                                      total_goals = S.total_goals + D.goals \
+                            FROM (SELECT N.stadium_id, SUM(N.attendance) AS attendance, COUNT(*) AS n, \
+                                         COALESCE(SUM((SELECT SUM(goals) FROM PlayerScores P WHERE P.match_id = N.match_id)), 0) AS goals \
+                                  FROM new_rows N GROUP BY N.stadium_id) D \
+                            WHERE S.stadium_id = D.stadium_id; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE OR REPLACE FUNCTION stadium_stats_scores() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP IN ('UPDATE', 'DELETE') THEN \
+                            UPDATE StadiumStats S SET total_goals = S.total_goals - D.goals \
+                            FROM (SELECT M.stadium_id, SUM(O.goals) AS goals FROM old_rows O \
+                                  JOIN MatchInStadium M ON M.match_id = O.match_id \
+                                  WHERE EXISTS(SELECT 1 FROM Match WHERE match_id = O.match_id) GROUP BY M.stadium_id) D \
+                            WHERE S.stadium_id = D.stadium_id; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            UPDATE StadiumStats S SET total_goals = S.total_goals + D.goals \
+                            FROM (SELECT M.stadium_id, SUM(N.goals) AS goals FROM new_rows N \
+                                  JOIN MatchInStadium M ON M.match_id = N.match_id GROUP BY M.stadium_id) D \
+                            WHERE S.stadium_id = D.stadium_id; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; "
+                    # per player, from the moment it is added, its team, goal total and number of matches scored in
+                    "CREATE TABLE PlayerGoals(player_id INTEGER PRIMARY KEY, \
+                                               team_id INTEGER NOT NULL, \
+                                               goals BIGINT NOT NULL DEFAULT 0, \
+                                               matches INTEGER NOT NULL DEFAULT 0, \
+                                               FOREIGN KEY(player_id) REFERENCES Player(player_id) \
+                                               ON DELETE CASCADE ON UPDATE CASCADE); \
+                    CREATE OR REPLACE FUNCTION player_goals_players() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP = 'INSERT' THEN \
+                            INSERT INTO PlayerGoals(player_id, team_id) SELECT player_id, team_id FROM new_rows; \
+                        ELSE \
+                            UPDATE PlayerGoals G SET team_id = N.team_id FROM new_rows N \
+                            WHERE G.player_id = N.player_id AND G.team_id != N.team_id; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE OR REPLACE FUNCTION player_goals_scores() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP IN ('UPDATE', 'DELETE') THEN \
+                            UPDATE PlayerGoals G SET goals = G.goals - D.goals, matches = G.matches - D.n \
+                            FROM (SELECT player_id, SUM(goals) AS goals, COUNT(*) AS n FROM old_rows GROUP BY player_id) D \
+                            WHERE G.player_id = D.player_id; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            UPDATE PlayerGoals G SET goals = G.goals + D.goals, matches = G.matches + D.n \
+                            FROM (SELECT player_id, SUM(goals) AS goals, COUNT(*) AS n FROM new_rows GROUP BY player_id) D \
+                            WHERE G.player_id = D.player_id; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE TRIGGER Player_goals_insert AFTER INSERT ON Player REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION player_goals_players(); \
+                    CREATE TRIGGER Player_goals_update AFTER UPDATE ON Player REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION player_goals_players(); \
+                    CREATE TRIGGER PlayerScores_goals_insert AFTER INSERT ON PlayerScores REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION player_goals_scores(); \
+                    CREATE TRIGGER PlayerScores_goals_update AFTER UPDATE ON PlayerScores \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION player_goals_scores(); \
+                    CREATE TRIGGER PlayerScores_goals_delete AFTER DELETE ON PlayerScores REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION player_goals_scores(); "
+                    # takes a match's goals out of its stadium before its delete cascades
+                    "CREATE OR REPLACE FUNCTION stadium_stats_matches() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        UPDATE StadiumStats S SET total_goals = S.total_goals - \
+                                                  COALESCE((SELECT SUM(goals) FROM PlayerScores WHERE match_id = OLD.match_id), 0) \
+                        FROM MatchInStadium M WHERE M.match_id = OLD.match_id AND S.stadium_id = M.stadium_id; \
+                        RETURN OLD; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE TRIGGER Match_stats_delete BEFORE DELETE ON Match \
+                            FOR EACH ROW EXECUTE FUNCTION stadium_stats_matches(); \
+                    CREATE TRIGGER Stadium_stats_insert AFTER INSERT ON Stadium REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_stadiums(); \
+                    CREATE TRIGGER MatchInStadium_stats_insert AFTER INSERT ON MatchInStadium REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_appearances(); \
+                    CREATE TRIGGER MatchInStadium_stats_update AFTER UPDATE ON MatchInStadium \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_appearances(); \
+                    CREATE TRIGGER MatchInStadium_stats_delete AFTER DELETE ON MatchInStadium REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_appearances(); \
+                    CREATE TRIGGER PlayerScores_stats_insert AFTER INSERT ON PlayerScores REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_scores(); \
+                    CREATE TRIGGER PlayerScores_stats_update AFTER UPDATE ON PlayerScores \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_scores(); \
+                    CREATE TRIGGER PlayerScores_stats_delete AFTER DELETE ON PlayerScores REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION stadium_stats_scores(); "
+                    # both orders of every two players who scored in a common match, and in how many they did
+                    "CREATE TABLE CoScoring(player_id INTEGER, \
+                                             other_id INTEGER, \
+                                             shared INTEGER NOT NULL, \
+                                             PRIMARY KEY(player_id, other_id) INCLUDE(shared)); \
+                    CREATE OR REPLACE FUNCTION co_scoring_scores() RETURNS TRIGGER AS $$ \
+                    BEGIN \
+                        IF TG_OP = 'DELETE' THEN \
+                            WITH B AS (SELECT player_id, match_id FROM PlayerScores \
+                                       UNION ALL SELECT player_id, match_id FROM old_rows), \
+                            D AS (SELECT player_id, other_id, COUNT(*) AS n FROM ( \
+                                  SELECT O.player_id AS player_id, B.player_id AS other_id, O.match_id FROM old_rows O \
+                                  JOIN B ON B.match_id = O.match_id AND B.player_id != O.player_id \
+                                  UNION SELECT B.player_id, O.player_id, O.match_id FROM old_rows O \
+                                  JOIN B ON B.match_id = O.match_id AND B.player_id != O.player_id) T \
+                                  GROUP BY player_id, other_id), \
+                            Z AS (DELETE FROM CoScoring C USING D \
+                                  WHERE C.player_id = D.player_id AND C.other_id = D.other_id AND C.shared = D.n) \
+                            UPDATE CoScoring C SET shared = C.shared - D.n FROM D \
+                            WHERE C.player_id = D.player_id AND C.other_id = D.other_id AND C.shared > D.n; \
+                        ELSIF TG_OP = 'UPDATE' THEN \
+                            WITH B AS ((SELECT player_id, match_id FROM PlayerScores EXCEPT SELECT player_id, match_id FROM new_rows) \
+                                       UNION ALL SELECT player_id, match_id FROM old_rows), \
+                            D AS (SELECT player_id, other_id, COUNT(*) AS n FROM ( \
+                                  SELECT O.player_id AS player_id, B.player_id AS other_id, O.match_id FROM old_rows O \
+                                  JOIN B ON B.match_id = O.match_id AND B.player_id != O.player_id \
+                                  UNION SELECT B.player_id, O.player_id, O.match_id FROM old_rows O \
+                                  JOIN B ON B.match_id = O.match_id AND B.player_id != O.player_id) T \
+                                  GROUP BY player_id, other_id), \
+                            Z AS (DELETE FROM CoScoring C USING D \
+                                  WHERE C.player_id = D.player_id AND C.other_id = D.other_id AND C.shared = D.n) \
+                            UPDATE CoScoring C SET shared = C.shared - D.n FROM D \
+                            WHERE C.player_id = D.player_id AND C.other_id = D.other_id AND C.shared > D.n; \
+                        END IF; \
+                        IF TG_OP IN ('INSERT', 'UPDATE') THEN \
+                            INSERT INTO CoScoring(player_id, other_id, shared) \
+                            SELECT player_id, other_id, COUNT(*) FROM ( \
+                                  SELECT N.player_id AS player_id, B.player_id AS other_id, N.match_id FROM new_rows N \
+                                  JOIN PlayerScores B ON B.match_id = N.match_id AND B.player_id != N.player_id \
+                                  UNION SELECT B.player_id, N.player_id, N.match_id FROM new_rows N \
+                                  JOIN PlayerScores B ON B.match_id = N.match_id AND B.player_id != N.player_id) T \
+                            GROUP BY player_id, other_id \
+                            ON CONFLICT(player_id, other_id) DO UPDATE SET shared = CoScoring.shared + EXCLUDED.shared; \
+                        END IF; \
+                        RETURN NULL; \
+                    END $$ LANGUAGE plpgsql; \
+                    CREATE TRIGGER PlayerScores_pairs_insert AFTER INSERT ON PlayerScores REFERENCING NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION co_scoring_scores(); \
+                    CREATE TRIGGER PlayerScores_pairs_update AFTER UPDATE ON PlayerScores \
+                            REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION co_scoring_scores(); \
+                    CREATE TRIGGER PlayerScores_pairs_delete AFTER DELETE ON PlayerScores REFERENCING OLD TABLE AS old_rows \
+                            FOR EACH STATEMENT EXECUTE FUNCTION co_scoring_scores(); "
+                    # foreign keys and what the analytics filter, group and sum on, INCLUDE spares reading the table
+                    "CREATE INDEX Match_homeTeam ON Match(homeTeam_id) INCLUDE(match_id);\
+                    CREATE INDEX Match_awayTeam ON Match(awayTeam_id) INCLUDE(match_id);\
+                    CREATE INDEX Player_team ON Player(team_id) INCLUDE(player_id, height);\
+                    CREATE INDEX Player_tall_team ON Player(team_id) WHERE height > 190;\
+                    CREATE INDEX Stadium_capacity ON Stadium(capacity) INCLUDE(belong_to);\
+                    CREATE INDEX PlayerScores_match ON PlayerScores(match_id) INCLUDE(player_id, goals);\
+                    CREATE INDEX MatchInStadium_stadium ON MatchInStadium(stadium_id) INCLUDE(match_id, attendance);"
+                    # a team's top scorers are the first rows of its range
+                    "CREATE INDEX PlayerGoals_team ON PlayerGoals(team_id, goals DESC, player_id DESC);\
+                    CREATE INDEX StadiumStats_goals ON StadiumStats(total_goals DESC, stadium_id ASC);\
+                    CREATE INDEX TeamActivity_active ON TeamActivity(team_id) \
+                            WHERE tall_players > 0 AND matches > 0 AND tall_players + matches > 2;")
+        Connector.resetStatements()
+        Cache.invalidateAll()
+
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        print(e)
+    except DatabaseException.CHECK_VIOLATION as e:
+        print(e)
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        print(e)
+    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        conn.close()
+
+
+def clearTables():
+    conn = None
+    try:
+       conn = Connector.DBConnector()
+       conn.execute("DELETE FROM Team;\
+                     DELETE FROM Match;\
+                     DELETE FROM Player;\
+                     DELETE FROM Stadium;\
+                     DELETE FROM PlayerScores;\
+                     DELETE FROM MatchInStadium;\
+                     DELETE FROM TeamActivity;\
+                     DELETE FROM StadiumStats;\
+                     DELETE FROM PlayerGoals;\
+                     DELETE FROM CoScoring;")
+       Cache.invalidateAll()
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        print(e)
+    except DatabaseException.CHECK_VIOLATION as e:
+        print(e)
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        print(e)
+    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        conn.close()
+
+
+def dropTables():
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.execute("DROP TABLE IF EXISTS Team CASCADE ;\
+                      DROP TABLE IF EXISTS Match CASCADE ;\
+                      DROP TABLE IF EXISTS Player CASCADE ;\
+                      DROP TABLE IF EXISTS Stadium CASCADE;\
+                      DROP TABLE IF EXISTS PlayerScores;\
+                      DROP TABLE IF EXISTS MatchInStadium;\
+                      DROP VIEW IF EXISTS active_tall_teams; \
+                      DROP VIEW IF EXISTS scores_in_stadium; \
+                      DROP VIEW IF EXISTS all_players_score;\
+                      DROP TABLE IF EXISTS TeamActivity;\
+                      DROP FUNCTION IF EXISTS team_activity_players();\
+                      DROP FUNCTION IF EXISTS team_activity_matches();\
+                      DROP TABLE IF EXISTS StadiumStats;\
+                      DROP FUNCTION IF EXISTS stadium_stats_stadiums();\
+                      DROP FUNCTION IF EXISTS stadium_stats_appearances();\
+                      DROP FUNCTION IF EXISTS stadium_stats_scores();\
+                      DROP FUNCTION IF EXISTS stadium_stats_matches();\
+                      DROP TABLE IF EXISTS PlayerGoals;\
+                      DROP FUNCTION IF EXISTS player_goals_players();\
+                      DROP FUNCTION IF EXISTS player_goals_scores();\
+                      DROP TABLE IF EXISTS CoScoring;\
+                      DROP FUNCTION IF EXISTS co_scoring_scores();")
+        Connector.resetStatements()
+        Cache.invalidateAll()
+    except DatabaseException.ConnectionInvalid as e:
+        print(e)
+    except DatabaseException.NOT_NULL_VIOLATION as e:
+        print(e)
+    except DatabaseException.CHECK_VIOLATION as e:
+        print(e)
+    #except DatabaseException.UNIQUE_VIOLATION as e:
+     #   print(e)
+    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
+        print(e)
+    except Exception as e:
+        print(e)
+    finally:
+        conn.close()
+
+
+# loads rows into table with COPY inside a single transaction, chunk by chunk. a chunk that violates
+# a constraint is rolled back and replayed row by row with the single-row statement, each row
+# under its own savepoint, so the report matches what the single-row function would have returned
+def _bulkInsert(table: str, columns: tuple, statement: str, rows: list, results: dict,
+                chunkSize: int) -> List[ReturnValue]:
+    report = [ReturnValue.OK] * len(rows)
+    if len(rows) == 0:
+        return report
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.begin()
+        for start in range(0, len(rows), chunkSize):
+            chunk = rows[start:start + chunkSize]
+            conn.savepoint("bulk_chunk")
+            try:
+                conn.copyFrom(table, columns, chunk)
+                conn.releaseSavepoint("bulk_chunk")
+                continue
+            except DatabaseException.ConnectionInvalid:
+                raise
+            except Exception:
+                conn.rollbackToSavepoint("bulk_chunk")
+                conn.releaseSavepoint("bulk_chunk")
+            for offset, row in enumerate(chunk):
+                conn.savepoint("bulk_row")
+                try:
+                    conn.executePrepared(statement, row)
+                    conn.releaseSavepoint("bulk_row")
+                except DatabaseException.ConnectionInvalid:
+                    raise
+                except Exception as e:
+                    conn.rollbackToSavepoint("bulk_row")
+                    conn.releaseSavepoint("bulk_row")
+                    report[start + offset] = results.get(type(e), ReturnValue.ERROR)
+        conn.commit()
+    except Exception:
+        if conn is not None:
+            conn.rollback()
+        report = [ReturnValue.ERROR] * len(rows)
+    finally:
+        if conn is not None:
+            conn.close()
+    return report
+
+
+_insertResults = {DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+                  DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+                  DatabaseException.NOT_NULL_VIOLATION: ReturnValue.BAD_PARAMS}
+
+
+Connector.registerStatement("addTeam", "INSERT INTO Team(id) VALUES($1)")
+
+
+def addTeam(teamID: int) -> ReturnValue:
+        conn = None
+        result = ReturnValue.OK
+        try:
+            conn = Connector.DBConnector()
+            rows_effected, _ = conn.executePrepared("addTeam", (teamID,))
+        except DatabaseException.ConnectionInvalid:
+            conn.rollback()
+            result = ReturnValue.ERROR
+        except DatabaseException.UNIQUE_VIOLATION:
+            conn.rollback()
+            result = ReturnValue.ALREADY_EXISTS
+        except DatabaseException.CHECK_VIOLATION:
+            conn.rollback()
+            result = ReturnValue.BAD_PARAMS
+        except DatabaseException.NOT_NULL_VIOLATION:
+            conn.rollback()
+            result = ReturnValue.BAD_PARAMS
+        except DatabaseException.UNKNOWN_ERROR:
+            conn.rollback()
+            result = ReturnValue.ERROR
+        except Exception:
+            result = ReturnValue.ERROR
+        finally:
+            conn.close()
+            return result
+
+
+def addTeams(teamIDs: Iterable[int], chunkSize: int = 10000) -> List[ReturnValue]:
+    return _bulkInsert("Team", ("id",), "addTeam", [(teamID,) for teamID in teamIDs], _insertResults, chunkSize)
+
+
+Connector.registerStatement("addMatch", "INSERT INTO Match(match_id,competition,homeTeam_id,awayTeam_id) \
+                                        VALUES($1,$2,$3,$4);")
+
+
+@Cache.invalidates(lambda match: [("Match", match.getMatchID()), ("TeamActivity", match.getHomeTeamID()),
+                                  ("TeamActivity", match.getAwayTeamID()), ("MatchAttendance", match.getHomeTeamID())],
+                   _succeeded)
+def addMatch(match: Match) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("addMatch", (match.getMatchID(), match.getCompetition(),
+                                                             match.getHomeTeamID(), match.getAwayTeamID()))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNKNOWN_ERROR:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+@Cache.invalidates(lambda matches, chunkSize=10000: [("Match", None), ("TeamActivity", None), ("MatchAttendance", None)],
+                   _succeeded)
+def addMatches(matches: Iterable[Match], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(m.getMatchID(), m.getCompetition(), m.getHomeTeamID(), m.getAwayTeamID()) for m in matches]
+    return _bulkInsert("Match", ("match_id", "competition", "homeTeam_id", "awayTeam_id"), "addMatch", rows,
+                       _insertResults, chunkSize)
+
+
+Connector.registerStatement("getMatchProfile", "SELECT * FROM Match WHERE Match.match_id = $1")
+
+
+def getMatchProfile(matchID: int) -> Match:
+    hit, match, token = IdentityMap.lookup("Match", matchID)
+    if hit:
+        return match if match is not None else Match.badMatch()
+    coalesced, match = BatchLoader.load("getMatchProfile", matchID)
+    if coalesced:
+        return match
+    conn = None
+    match = Match()
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, result = conn.executePrepared("getMatchProfile", (matchID,))
+        conn.commit()
+        matchs = matchesFromResultSet(result)
+        IdentityMap.remember("Match", matchID, matchs[0] if len(matchs) != 0 else None, token)
+        match = matchs[0]
+    except DatabaseException.ConnectionInvalid:
+        match = Match.badMatch()
+    except DatabaseException.CHECK_VIOLATION:
+        match = Match.badMatch()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        match = Match.badMatch()
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        match = Match.badMatch()
+    except DatabaseException.UNKNOWN_ERROR:
+        match = Match.badMatch()
+    except Exception:
+        match = Match.badMatch()
+    finally:
+        conn.close()
+        return match
+
+
+Connector.registerStatement("getMatchProfiles", "SELECT * FROM Match WHERE Match.match_id = ANY($1::INTEGER[])")
+
+
+def getMatchProfiles(matchIDs: Iterable[int]) -> List[Match]:
+    return _profiles("Match", "getMatchProfiles", matchIDs, matchesFromResultSet, Match.getMatchID, Match.badMatch)
+
+
+BatchLoader.register("getMatchProfile", getMatchProfiles)
+
+
+Connector.registerStatement("deleteMatch", "DELETE FROM Match WHERE Match.match_id=$1 AND Match.homeTeam_id=$2 \
+                                           AND Match.awayTeam_id=$3 AND Match.competition=$4")
+
+
+@Cache.invalidates(lambda match: [("Match", match.getMatchID()), ("TeamActivity", match.getHomeTeamID()),
+                                  ("TeamActivity", match.getAwayTeamID()), ("MatchAttendance", None),
+                                  ("MatchScores", match.getMatchID()), ("StadiumGoals", None),
+                                  ("StadiumAttendance", None), ("PlayerGoals", None), ("CoScoring", None)], _succeeded)
+def deleteMatch(match: Match) -> ReturnValue:
+    conn = None
+    result, rows_effected = ReturnValue.OK, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("deleteMatch", (match.getMatchID(), match.getHomeTeamID(),
+                                                                match.getAwayTeamID(), match.getCompetition()))
+        if rows_effected is not None and rows_effected == 0:
+            result = ReturnValue.NOT_EXISTS
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        conn.rollback()
+        result = ReturnValue.ERROR
+
+    finally:
+        conn.close()
+        return result
+
+
+Connector.registerStatement("addPlayer", "INSERT INTO Player(player_id,team_id,age,height,preferred_foot) \
+                                         VALUES($1,$2,$3,$4,$5);")
+
+
+@Cache.invalidates(lambda player: [("Player", player.getPlayerID()), ("TeamActivity", player.getTeamID()),
+                                   ("PlayerGoals", player.getTeamID())], _succeeded)
+def addPlayer(player: Player) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("addPlayer", (player.getPlayerID(), player.getTeamID(), player.getAge(),
+                                                              player.getHeight(), player.getFoot()))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNKNOWN_ERROR:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+@Cache.invalidates(lambda players, chunkSize=10000: [("Player", None), ("TeamActivity", None), ("PlayerGoals", None)],
+                   _succeeded)
+def addPlayers(players: Iterable[Player], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(p.getPlayerID(), p.getTeamID(), p.getAge(), p.getHeight(), p.getFoot()) for p in players]
+    return _bulkInsert("Player", ("player_id", "team_id", "age", "height", "preferred_foot"), "addPlayer", rows,
+                       _insertResults, chunkSize)
+
+
+Connector.registerStatement("getPlayerProfile", "SELECT * FROM Player WHERE Player.player_id = $1")
+
+
+def getPlayerProfile(playerID: int) -> Player:
+    hit, player, token = IdentityMap.lookup("Player", playerID)
+    if hit:
+        return player if player is not None else Player.badPlayer()
+    coalesced, player = BatchLoader.load("getPlayerProfile", playerID)
+    if coalesced:
+        return player
+    conn = None
+    player = Player()
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, result = conn.executePrepared("getPlayerProfile", (playerID,))
+        conn.commit()
+        players = playersFromResultSet(result)
+        IdentityMap.remember("Player", playerID, players[0] if len(players) != 0 else None, token)
+        player = players[0]
+    except DatabaseException.ConnectionInvalid:
+        player = Player.badPlayer()
+    except DatabaseException.CHECK_VIOLATION:
+        player = Player.badPlayer()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        player = Player.badPlayer()
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        player = Player.badPlayer()
+    except DatabaseException.UNKNOWN_ERROR:
+        player = Player.badPlayer()
+    except Exception:
+        player = Player.badPlayer()
+    finally:
+        conn.close()
+        return player
+
+
+Connector.registerStatement("getPlayerProfiles", "SELECT * FROM Player WHERE Player.player_id = ANY($1::INTEGER[])")
+
+
+def getPlayerProfiles(playerIDs: Iterable[int]) -> List[Player]:
+    return _profiles("Player", "getPlayerProfiles", playerIDs, playersFromResultSet, Player.getPlayerID, Player.badPlayer)
+
+
+BatchLoader.register("getPlayerProfile", getPlayerProfiles)
+
+
+Connector.registerStatement("deletePlayer", "DELETE FROM Player WHERE Player.player_id=$1 AND Player.team_id=$2")
+
+
+@Cache.invalidates(lambda player: [("Player", player.getPlayerID()), ("TeamActivity", player.getTeamID()),
+                                   ("PlayerGoals", player.getTeamID()), ("MatchScores", None), ("StadiumGoals", None),
+                                   ("CoScoring", None)], _succeeded)
+def deletePlayer(player: Player) -> ReturnValue:
+    conn = None
+    result, rows_effected = ReturnValue.OK, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("deletePlayer", (player.getPlayerID(), player.getTeamID()))
+        if rows_effected is not None and rows_effected == 0:
+            result = ReturnValue.NOT_EXISTS
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        conn.rollback()
+        result = ReturnValue.ERROR
+
+    finally:
+        conn.close()
+        return result
+
+
+Connector.registerStatement("addStadium", "INSERT INTO Stadium(stadium_id,capacity,belong_to) VALUES($1,$2,$3);")
+
+
+@Cache.invalidates(lambda stadium: [("Stadium", stadium.getStadiumID()), ("StadiumGoals", stadium.getStadiumID())], _succeeded)
+def addStadium(stadium: Stadium) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("addStadium", (stadium.getStadiumID(), stadium.getCapacity(),
+                                                               stadium.getBelongsTo()))
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNKNOWN_ERROR:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+@Cache.invalidates(lambda stadiums, chunkSize=10000: [("Stadium", None), ("StadiumGoals", None)], _succeeded)
+def addStadiums(stadiums: Iterable[Stadium], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(s.getStadiumID(), s.getCapacity(), s.getBelongsTo()) for s in stadiums]
+    results = dict(_insertResults)
+    results[DatabaseException.FOREIGN_KEY_VIOLATION] = ReturnValue.BAD_PARAMS
+    return _bulkInsert("Stadium", ("stadium_id", "capacity", "belong_to"), "addStadium", rows, results, chunkSize)
+
+
+Connector.registerStatement("getStadiumProfile", "SELECT * FROM Stadium WHERE Stadium.stadium_id = $1")
+
+
+def getStadiumProfile(stadiumID: int) -> Stadium:
+    hit, stadium, token = IdentityMap.lookup("Stadium", stadiumID)
+    if hit:
+        return stadium if stadium is not None else Stadium.badStadium()
+    coalesced, stadium = BatchLoader.load("getStadiumProfile", stadiumID)
+    if coalesced:
+        return stadium
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, result = conn.executePrepared("getStadiumProfile", (stadiumID,))
+        conn.commit()
+        stadiums = stadiumsFromResultSet(result)
+        IdentityMap.remember("Stadium", stadiumID, stadiums[0] if len(stadiums) != 0 else None, token)
+        stadium = stadiums[0]
+    except DatabaseException.ConnectionInvalid:
+        stadium = Stadium.badStadium()
+    except DatabaseException.CHECK_VIOLATION:
+        stadium = Stadium.badStadium()
+    except DatabaseException.NOT_NULL_VIOLATION:
+        stadium = Stadium.badStadium()
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        stadium = Stadium.badStadium()
+    except DatabaseException.UNKNOWN_ERROR:
+        stadium = Stadium.badStadium()
+    except Exception:
+        stadium = Stadium.badStadium()
+    finally:
+        conn.close()
+        return stadium
+
+
+Connector.registerStatement("getStadiumProfiles", "SELECT * FROM Stadium WHERE Stadium.stadium_id = ANY($1::INTEGER[])")
+
+
+def getStadiumProfiles(stadiumIDs: Iterable[int]) -> List[Stadium]:
+    return _profiles("Stadium", "getStadiumProfiles", stadiumIDs, stadiumsFromResultSet, Stadium.getStadiumID,
+                     Stadium.badStadium)
+
+
+BatchLoader.register("getStadiumProfile", getStadiumProfiles)
+
+
+Connector.registerStatement("deleteStadium", "DELETE FROM Stadium WHERE Stadium.stadium_id=$1 AND Stadium.capacity=$2 \
+                                             AND Stadium.belong_to=$3")
+
+
+@Cache.invalidates(lambda stadium: [("Stadium", stadium.getStadiumID()), ("StadiumGoals", stadium.getStadiumID()),
+                                    ("StadiumAttendance", stadium.getStadiumID()), ("MatchAttendance", None)], _succeeded)
+def deleteStadium(stadium: Stadium) -> ReturnValue:
+    conn = None
+    result, rows_effected = ReturnValue.OK, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("deleteStadium", (stadium.getStadiumID(), stadium.getCapacity(),
+                                                                  stadium.getBelongsTo()))
+        if rows_effected is not None and rows_effected == 0:
+            result = ReturnValue.NOT_EXISTS
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except Exception:
+        conn.rollback()
+        result = ReturnValue.ERROR
+
+    finally:
+        conn.close()
+        return result
+
+
+# inserts a whole batch of (ordinal, ...) rows in one round trip and reports per row what the single-row
+# function would have returned. constraints are checked in the order postgres applies them: check
+# constraints, then unique keys (against the table and against earlier rows of the batch), then foreign keys.
+# a row with a value that is no int is ERROR, as in the single-row functions. a NULL match_id in
+# matchesInStadiums is BAD_PARAMS where matchInStadium lets its NOT_NULL_VIOLATION through to OK
+def _recordBatch(query: str, rows: list) -> List[ReturnValue]:
+    report = [ReturnValue.OK] * len(rows)
+    batch = []
+    for index, row in enumerate(rows):
+        if all(value is None or type(value) is int for value in row):
+            batch.append((index,) + row)
+        else:
+            report[index] = ReturnValue.ERROR
+    if len(batch) == 0:
+        return report
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        _, statuses = conn.executeValues(query, batch, "(%s, %s::integer, %s::integer, %s::integer)")
+        for index, status in statuses.rows:
+            report[index] = ReturnValue[status]
+    except Exception:
+        if conn is not None:
+            conn.rollback()
+        for row in batch:
+            report[row[0]] = ReturnValue.ERROR
+    finally:
+        if conn is not None:
+            conn.close()
+    return report
+
+
+_playersScoredInMatchesQuery = "WITH V(ord, match_id, player_id, goals) AS (VALUES %s), \
+                                C AS (SELECT V.*, COALESCE(V.goals <= 0, FALSE) AS bad, \
+                                             EXISTS (SELECT 1 FROM PlayerScores S \
+                                                     WHERE S.player_id=V.player_id AND S.match_id=V.match_id) AS present, \
+                                             (V.player_id IS NULL OR EXISTS (SELECT 1 FROM Player P \
+                                                                             WHERE P.player_id=V.player_id)) \
+                                             AND (V.match_id IS NULL OR EXISTS (SELECT 1 FROM Match M \
+                                                                                WHERE M.match_id=V.match_id)) AS referenced \
+                                      FROM V), \
+                                R AS (SELECT C.*, C.player_id IS NOT NULL AND C.match_id IS NOT NULL AS keyed, \
+                                             MIN(CASE WHEN NOT bad AND NOT present AND referenced THEN ord END) \
+                                                 OVER (PARTITION BY player_id, match_id) AS first_ord \
+                                      FROM C), \
+                                S AS (SELECT ord, match_id, player_id, goals, keyed, \
+                                             CASE WHEN bad THEN 'BAD_PARAMS' \
+                                                  WHEN present OR (keyed AND first_ord < ord) THEN 'ALREADY_EXISTS' \
+                                                  WHEN NOT referenced THEN 'NOT_EXISTS' \
+                                                  ELSE 'OK' END AS status \
+                                      FROM R), \
+                                I AS (INSERT INTO PlayerScores(player_id,match_id,goals) \
+                                      SELECT player_id, match_id, goals FROM S WHERE status='OK' ORDER BY ord \
+                                      ON CONFLICT DO NOTHING RETURNING player_id, match_id) \
+                                SELECT S.ord, CASE WHEN S.status='OK' AND S.keyed AND NOT EXISTS \
+                                                        (SELECT 1 FROM I WHERE I.player_id=S.player_id \
+                                                                         AND I.match_id=S.match_id) \
+                                                   THEN 'ALREADY_EXISTS' ELSE S.status END \
+                                FROM S ORDER BY S.ord"
+
+
+Connector.registerStatement("playerScoredInMatch", "INSERT INTO PlayerScores(player_id,match_id,goals) VALUES($1,$2,$3);")
+
+
+@Cache.invalidates(lambda match, player, amount: [("MatchScores", match.getMatchID()), ("StadiumGoals", None),
+                                                  ("PlayerGoals", None), ("CoScoring", None)], _succeeded)
+def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("playerScoredInMatch", (player.getPlayerID(), match.getMatchID(), amount))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION or DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.FOREIGN_KEY_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.NOT_EXISTS
+    except DatabaseException.UNIQUE_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.UNKNOWN_ERROR or Exception:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+@Cache.invalidates(lambda scores: [("MatchScores", None), ("StadiumGoals", None), ("PlayerGoals", None),
+                                   ("CoScoring", None)], _succeeded)
+def playersScoredInMatches(scores: Iterable[Tuple[Match, Player, int]]) -> List[ReturnValue]:
+    rows = [(match.getMatchID(), player.getPlayerID(), amount) for match, player, amount in scores]
+    return _recordBatch(_playersScoredInMatchesQuery, rows)
+
+
+Connector.registerStatement("playerDidntScoreInMatch", "DELETE FROM PlayerScores \
+                                                       WHERE PlayerScores.player_id = $1 AND PlayerScores.match_id=$2")
+
+
+@Cache.invalidates(lambda match, player: [("MatchScores", match.getMatchID()), ("StadiumGoals", None),
+                                          ("PlayerGoals", None), ("CoScoring", None)], _succeeded)
+def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
+    conn = None
+    result, rows_effected = ReturnValue.OK, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("playerDidntScoreInMatch", (player.getPlayerID(), match.getMatchID()))
+        conn.commit()
+        if rows_effected is not None and rows_effected == 0:
+            result = ReturnValue.NOT_EXISTS
+
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+Connector.registerStatement("matchInStadium", "INSERT INTO MatchInStadium(stadium_id,match_id,attendance) VALUES($1,$2,$3);")
+
+
+@Cache.invalidates(lambda match, stadium, attendance: [("StadiumGoals", stadium.getStadiumID()),
+                                                       ("StadiumAttendance", stadium.getStadiumID()), ("MatchAttendance", None)], _succeeded)
+def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnValue:
+    conn = None
+    result = ReturnValue.OK
+    sid = stadium.getStadiumID()
+    mid = match.getMatchID()
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("matchInStadium", (sid, mid, attendance))
+        conn.commit()
+    except DatabaseException.ConnectionInvalid as e:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION or DatabaseException.NOT_NULL_VIOLATION as e:
+        conn.rollback()
+        result = ReturnValue.BAD_PARAMS
+    except DatabaseException.UNIQUE_VIOLATION as e:
+        conn.rollback()
+        result = ReturnValue.ALREADY_EXISTS
+    except DatabaseException.FOREIGN_KEY_VIOLATION as e:
+        conn.rollback()
+        result = ReturnValue.NOT_EXISTS
+    except DatabaseException.UNKNOWN_ERROR or Exception as e:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+_matchesInStadiumsQuery = "WITH V(ord, match_id, stadium_id, attendance) AS (VALUES %s), \
+                           C AS (SELECT V.*, V.match_id IS NULL OR COALESCE(V.attendance <= 0, FALSE) AS bad, \
+                                        EXISTS (SELECT 1 FROM MatchInStadium S WHERE S.match_id=V.match_id) AS present, \
+                                        (V.stadium_id IS NULL OR EXISTS (SELECT 1 FROM Stadium S \
+                                                                         WHERE S.stadium_id=V.stadium_id)) \
+                                        AND EXISTS (SELECT 1 FROM Match M WHERE M.match_id=V.match_id) AS referenced \
+                                 FROM V), \
+                           S AS (SELECT ord, match_id, stadium_id, attendance, \
+                                        CASE WHEN bad THEN 'BAD_PARAMS' \
+                                             WHEN present OR MIN(CASE WHEN NOT bad AND NOT present AND referenced \
+                                                                      THEN ord END) \
+                                                             OVER (PARTITION BY match_id) < ord THEN 'ALREADY_EXISTS' \
+                                             WHEN NOT referenced THEN 'NOT_EXISTS' \
+                                             ELSE 'OK' END AS status \
+                                 FROM C), \
+                           I AS (INSERT INTO MatchInStadium(stadium_id,match_id,attendance) \
+                                 SELECT stadium_id, match_id, attendance FROM S WHERE status='OK' ORDER BY ord \
+                                 ON CONFLICT DO NOTHING RETURNING match_id) \
+                           SELECT S.ord, CASE WHEN S.status='OK' AND NOT EXISTS \
+                                                   (SELECT 1 FROM I WHERE I.match_id=S.match_id) \
+                                              THEN 'ALREADY_EXISTS' ELSE S.status END \
+                           FROM S ORDER BY S.ord"
+
+
+Connector.registerStatement("matchNotInStadium", "DELETE FROM MatchInStadium \
+                                                 WHERE MatchInStadium.stadium_id = $1 AND MatchInStadium.match_id=$2")
+
+
+@Cache.invalidates(lambda match, stadium: [("StadiumGoals", stadium.getStadiumID()),
+                                           ("StadiumAttendance", stadium.getStadiumID()), ("MatchAttendance", None)], _succeeded)
+def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
+    conn = None
+    result, rows_effected = ReturnValue.OK, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, _ = conn.executePrepared("matchNotInStadium", (stadium.getStadiumID(), match.getMatchID()))
+        conn.commit()
+        if rows_effected is not None and rows_effected == 0:
+            result = ReturnValue.NOT_EXISTS
+    except DatabaseException.ConnectionInvalid:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.NOT_NULL_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    except DatabaseException.CHECK_VIOLATION:
+        conn.rollback()
+        result = ReturnValue.ERROR
+    finally:
+        conn.close()
+        return result
+
+
+Connector.registerStatement("averageAttendanceInStadium", "SELECT (SELECT attendance_sum::NUMERIC / NULLIF(attendance_count,0) \
+                                                          FROM StadiumStats WHERE stadium_id=$1)")
+
+
+@Cache.invalidates(lambda appearances: [("StadiumGoals", None), ("StadiumAttendance", None), ("MatchAttendance", None)], _succeeded)
+def matchesInStadiums(appearances: Iterable[Tuple[Match, Stadium, int]]) -> List[ReturnValue]:
+    rows = [(match.getMatchID(), stadium.getStadiumID(), attendance) for match, stadium, attendance in appearances]
+    return _recordBatch(_matchesInStadiumsQuery, rows)
+
+
+@Cache.cached(lambda stadiumID: [("StadiumAttendance", stadiumID)], unless=-1)
+def averageAttendanceInStadium(stadiumID: int) -> float:
+    coalesced, result = BatchLoader.load("averageAttendanceInStadium", stadiumID)
+    if coalesced:
+        return result
+    conn = None
+    result, rows_effected =0, None
+    try:
+        conn = Connector.DBConnector()
+        rows_effected, tuples = conn.executePrepared("averageAttendanceInStadium", (stadiumID,))
+        conn.commit()
+        if tuples.rows[0][0] is None or len(tuples.rows) == 0:
+            result = 0
+        else:
+            result = tuples.rows[0][0]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        result = -1
+    finally:
+        conn.close()
+        return result
+
+
+Connector.registerStatement("stadiumTotalGoals", "SELECT COALESCE((SELECT total_goals FROM StadiumStats WHERE stadium_id=$1),0)")
+
+
+@Cache.cached(lambda stadiumID: [("StadiumGoals", stadiumID)], unless=-1)
+def stadiumTotalGoals(stadiumID: int) -> int:
+    coalesced, result = BatchLoader.load("stadiumTotalGoals", stadiumID)
+    if coalesced:
+        return result
+    conn = None
+    result = 0
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("stadiumTotalGoals", (stadiumID,))
+        if len(tuples.rows) != 0:
+            result = tuples.rows[0][0]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        result = -1
+    finally:
+        if conn is not None:
+            conn.close()
+    return result
+
+
+Connector.registerStatement("stadiumsStats", "SELECT stadium_id, attendance_sum::NUMERIC / NULLIF(attendance_count,0), total_goals \
+                                             FROM StadiumStats WHERE stadium_id = ANY($1::INTEGER[])")
+
+
+# the StadiumStats rows of many stadiums in one query, for coalesced averageAttendanceInStadium and
+# stadiumTotalGoals calls. column is 1 for the average attendance, 2 for the total goals, a stadium
+# without a row gets 0 and every stadium gets -1 on an error
+def _stadiumsStats(stadiumIDs: List[int], column: int) -> list:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("stadiumsStats", (stadiumIDs,))
+        conn.commit()
+        found = {row[0]: row[column] for row in tuples}
+        res = [found.get(stadiumID) if found.get(stadiumID) is not None else 0 for stadiumID in stadiumIDs]
+    except Exception:
+        res = [-1] * len(stadiumIDs)
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+BatchLoader.register("averageAttendanceInStadium", lambda stadiumIDs: _stadiumsStats(stadiumIDs, 1))
+BatchLoader.register("stadiumTotalGoals", lambda stadiumIDs: _stadiumsStats(stadiumIDs, 2))
+
+
+Connector.registerStatement("playerIsWinner", "SELECT player_id \
+                                              FROM PlayerScores \
+                                              WHERE (player_id=$1) AND (match_id=$2) \
+                                              GROUP BY player_id \
+                                              HAVING (2*COALESCE(SUM(goals),0)>=(SELECT COALESCE(SUM(goals),0) \
+                                                                                FROM PlayerScores WHERE match_id=$2)) \
+                                              AND (COALESCE(SUM(goals),0)!=0);")
+
+
+@Cache.cached(lambda playerID, matchID: [("MatchScores", matchID)])
+def playerIsWinner(playerID: int, matchID: int) -> bool:
+    conn = None
+    result = False
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("playerIsWinner", (playerID, matchID))
+        if len(tuples.rows) != 0:
+            result = True
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        result = False
+    finally:
+        if conn is not None:
+            conn.close()
+    return result
+
+
+Connector.registerStatement("getActiveTallTeams", "SELECT team_id FROM active_tall_teams ORDER BY team_id DESC LIMIT 5")
+
+
+@Cache.cached(lambda: [("TeamActivity", None)])
+def getActiveTallTeams() -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("getActiveTallTeams")
+        if len(tuples.rows) != 0:
+             res = [r[0] for r in tuples.rows]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("getActiveTallRichTeams", "SELECT team_id FROM active_tall_teams \
+                                                      WHERE team_id IN (SELECT belong_to FROM Stadium WHERE capacity>55000) \
+                                                      ORDER BY team_id ASC LIMIT 5")
+
+
+@Cache.cached(lambda: [("TeamActivity", None), ("Stadium", None)])
+def getActiveTallRichTeams() -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("getActiveTallRichTeams")
+        if len(tuples.rows) != 0:
+            res = [r[0] for r in tuples.rows]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("popularTeams", "SELECT T.homeTeam_id FROM  \
+                                               (SELECT Match.homeTeam_id, MatchInStadium.attendance FROM \
+                                               Match LEFT OUTER JOIN MatchInStadium ON(Match.match_id=MatchInStadium.match_id)) T\
+                                            GROUP BY T.homeTeam_id \
+                                            HAVING MIN(COALESCE(T.attendance,0)) > 40000 \
+                                            ORDER BY T.homeTeam_id DESC LIMIT 10;")
+
+
+@Cache.cached(lambda: [("MatchAttendance", None)])
+def popularTeams() -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("popularTeams")
+        if len(tuples.rows) != 0:
+            res = [r[0] for r in tuples.rows]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("getMostAttractiveStadiums", "SELECT stadium_id FROM StadiumStats \
+                                                         ORDER BY total_goals DESC, stadium_id ASC;")
+
+
+# every stadium is returned, so the rows are streamed from a server-side cursor instead of fetched at once
+@Cache.cached(lambda: [("StadiumGoals", None)])
+def getMostAttractiveStadiums() -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        res = [r[0] for r in conn.stream("getMostAttractiveStadiums")]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+# same order as getMostAttractiveStadiums, produced lazily fetchSize stadiums at a time so memory stays
+# flat however many stadiums there are, the connection is held until the iterator is exhausted or closed
+def iterMostAttractiveStadiums(fetchSize: int = 1000) -> Iterator[int]:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        for r in conn.stream("getMostAttractiveStadiums", fetchSize=fetchSize):
+            yield r[0]
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+Connector.registerStatement("checkStadiumStats", "SELECT S.stadium_id FROM Stadium S \
+                                                 LEFT OUTER JOIN StadiumStats T ON(T.stadium_id=S.stadium_id) \
+                                                 LEFT OUTER JOIN (SELECT stadium_id, SUM(attendance) AS attendance, COUNT(*) AS n \
+                                                                  FROM MatchInStadium GROUP BY stadium_id) A \
+                                                                 ON(A.stadium_id=S.stadium_id) \
+                                                 LEFT OUTER JOIN (SELECT MatchInStadium.stadium_id, SUM(goals) AS goals \
+                                                                  FROM PlayerScores JOIN MatchInStadium \
+                                                                  ON(PlayerScores.match_id=MatchInStadium.match_id) \
+                                                                  GROUP BY MatchInStadium.stadium_id) G \
+                                                                 ON(G.stadium_id=S.stadium_id) \
+                                                 WHERE T.stadium_id IS NULL \
+                                                 OR T.total_goals != COALESCE(G.goals,0) \
+                                                 OR T.attendance_sum != COALESCE(A.attendance,0) \
+                                                 OR T.attendance_count != COALESCE(A.n,0) \
+                                                 ORDER BY S.stadium_id ASC")
+
+
+# recomputes every stadium's goals and attendance from PlayerScores and MatchInStadium and returns the
+# stadiums whose StadiumStats row is missing or disagrees, an empty list means the summary is consistent.
+# a check that could not run raises its DatabaseException rather than report a consistent summary
+def checkStadiumStats() -> List[int]:
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("checkStadiumStats")
+        return [r[0] for r in tuples.rows]
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+Connector.registerStatement("mostGoalsForTeam", "SELECT player_id FROM PlayerGoals \
+                                                WHERE team_id=$1 \
+                                                ORDER BY goals DESC, player_id DESC LIMIT 5;")
+
+
+@Cache.cached(lambda teamID: [("PlayerGoals", teamID)])
+def mostGoalsForTeam(teamID: int) -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("mostGoalsForTeam", (teamID,))
+        if len(tuples.rows) != 0:
+            res = [r[0] for r in tuples.rows]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("mostGoalsForTeams", "SELECT T.team_id, G.player_id \
+                                                 FROM unnest($1::INTEGER[]) WITH ORDINALITY AS T(team_id, position) \
+                                                 CROSS JOIN LATERAL (SELECT player_id, goals FROM PlayerGoals \
+                                                                     WHERE PlayerGoals.team_id=T.team_id \
+                                                                     ORDER BY goals DESC, player_id DESC LIMIT $2) G \
+                                                 ORDER BY T.position, G.goals DESC, G.player_id DESC")
+
+
+# mostGoalsForTeam for many teams in one query, the k top scorers of every team keyed by team id.
+# a team without players maps to [], and the result is {} on an error (a negative k, a team id out of range)
+def mostGoalsForTeams(teamIDs: Iterable[int], k: int = 5) -> Dict[int, List[int]]:
+    conn = None
+    teamIDs = list(dict.fromkeys(teamIDs))
+    res = {teamID: [] for teamID in teamIDs}
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("mostGoalsForTeams", (teamIDs, k))
+        for teamID, playerID in tuples:
+            res[teamID].append(playerID)
+    except Exception:
+        return {}
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("getClosePlayers", "SELECT C.other_id FROM CoScoring C \
+                                               JOIN PlayerGoals G ON(G.player_id=C.player_id) \
+                                               WHERE C.player_id=$1 AND 2*C.shared >= G.matches \
+                                               ORDER BY C.other_id ASC LIMIT 10;")
+
+
+@Cache.cached(lambda playerID: [("CoScoring", playerID)])
+def getClosePlayers(playerID: int) -> List[int]:
+    conn = None
+    res = []
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("getClosePlayers", (playerID,))
+        if len(tuples.rows) != 0:
+            res = [r[0] for r in tuples.rows]
+    except DatabaseException.ConnectionInvalid or DatabaseException.UNKNOWN_ERROR or Exception:
+        return []
+    finally:
+        if conn is not None:
+            conn.close()
+    return res
+
+
+Connector.registerStatement("getDashboard", "SELECT ARRAY(SELECT team_id FROM active_tall_teams ORDER BY team_id DESC LIMIT 5), \
+                                                    ARRAY(SELECT team_id FROM active_tall_teams \
+                                                          WHERE team_id IN (SELECT belong_to FROM Stadium WHERE capacity>55000) \
+                                                          ORDER BY team_id ASC LIMIT 5), \
+                                                    ARRAY(SELECT T.homeTeam_id FROM \
+                                                              (SELECT Match.homeTeam_id, MatchInStadium.attendance FROM \
+                                                              Match LEFT OUTER JOIN MatchInStadium \
+                                                              ON(Match.match_id=MatchInStadium.match_id)) T \
+                                                          GROUP BY T.homeTeam_id \
+                                                          HAVING MIN(COALESCE(T.attendance,0)) > 40000 \
+                                                          ORDER BY T.homeTeam_id DESC LIMIT 10), \
+                                                    ARRAY(SELECT stadium_id FROM StadiumStats \
+                                                          ORDER BY total_goals DESC, stadium_id ASC), \
+                                                    ARRAY(SELECT COALESCE(S.attendance_sum::NUMERIC / NULLIF(S.attendance_count,0), 0) \
+                                                          FROM unnest($1::INTEGER[]) WITH ORDINALITY AS T(stadium_id, position) \
+                                                          LEFT OUTER JOIN StadiumStats S ON(S.stadium_id=T.stadium_id) \
+                                                          ORDER BY T.position), \
+                                                    ARRAY(SELECT COALESCE(S.total_goals, 0) \
+                                                          FROM unnest($1::INTEGER[]) WITH ORDINALITY AS T(stadium_id, position) \
+                                                          LEFT OUTER JOIN StadiumStats S ON(S.stadium_id=T.stadium_id) \
+                                                          ORDER BY T.position)")
+
+
+# the stats page in one statement: getActiveTallTeams, getActiveTallRichTeams, popularTeams and
+# getMostAttractiveStadiums, with averageAttendanceInStadium and stadiumTotalGoals for every one of
+# stadiumIDs. a single statement reads one snapshot, so the numbers agree with each other even while
+# other connections write. badDashboard() on an error
+def getDashboard(stadiumIDs: Iterable[int] = ()) -> Dashboard:
+    conn = None
+    stadiumIDs = list(dict.fromkeys(stadiumIDs))
+    dashboard = Dashboard.badDashboard()
+    try:
+        conn = Connector.DBConnector()
+        effected_rows, tuples = conn.executePrepared("getDashboard", (stadiumIDs,))
+        tallTeams, tallRichTeams, popular, attractive, attendance, goals = tuples.rows[0]
+        dashboard = Dashboard(tallTeams, tallRichTeams, popular, attractive, dict(zip(stadiumIDs, attendance)),
+                              dict(zip(stadiumIDs, goals)))
+    except Exception:
+        dashboard = Dashboard.badDashboard()
+    finally:
+        if conn is not None:
+            conn.close()
+    return dashboard
@@ -0,0 +1,970 @@
+# in-process variant of the Database.py API: the same functions with the same ReturnValue, bad object and
+# error value results, served from indexed dicts of this process instead of Postgres, for tests and tools
+# that should not need a server. the tables with their constraints and cascades, and the summary tables
+# the triggers keep (TeamActivity, StadiumStats, PlayerGoals, CoScoring), are mirrored row for row, down to
+# what the statements do with NULLs, so that a call gives what it gives on Postgres, which
+# benchmark/conformance.py checks. parameters are what the signatures of Database.py take (ints, strs and
+# None), and a failing statement raises the DatabaseException Utility.DBConnector would. the data lives as
+# long as the process and starts without tables, like an empty database. the read cache, the identity map
+# and coalescing only spare round trips to Postgres and are not used here. select a backend at runtime
+# with Utility.Backend
+import heapq
+import threading
+from contextlib import contextmanager
+from decimal import Decimal
+from typing import Dict, List, Iterable, Iterator, Tuple, Union
+from Utility.ReturnValue import ReturnValue
+from Utility.Exceptions import DatabaseException
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Business.Dashboard import Dashboard
+
+
+_INTEGER = (-2 ** 31, 2 ** 31 - 1)
+_BIGINT = (-2 ** 63, 2 ** 63 - 1)
+
+
+# a parameter bound to an INTEGER (or BIGINT) placeholder: an int that fits, or None for NULL, the
+# parameter types of Database.py. anything else fails the statement with UNKNOWN_ERROR, as an int out of
+# range does on Postgres
+def _integer(value, bounds: tuple = _INTEGER) -> Union[int, None]:
+    if value is None:
+        return None
+    if type(value) is not int:
+        raise DatabaseException.UNKNOWN_ERROR("expected an int, got a " + type(value).__name__)
+    if not bounds[0] <= value <= bounds[1]:
+        raise DatabaseException.UNKNOWN_ERROR("integer out of range")
+    return value
+
+
+# a list bound to an INTEGER[] placeholder
+def _integers(values: list) -> list:
+    return [_integer(value) for value in values]
+
+
+# a parameter bound to a TEXT placeholder: a str, or None for NULL
+def _text(value) -> Union[str, None]:
+    if value is None or isinstance(value, str):
+        return value
+    raise DatabaseException.UNKNOWN_ERROR("expected a str, got a " + type(value).__name__)
+
+
+# SQL's SUM: None when there is no value that is not NULL
+def _sum(values) -> Union[int, None]:
+    values = [value for value in values if value is not None]
+    return sum(values) if len(values) != 0 else None
+
+
+def _weight(number: int) -> tuple:
+    number = abs(number)
+    if number == 0:
+        return 0, 0
+    weight = (len(str(number)) - 1) // 4
+    return weight, number // 10000 ** weight
+
+
+# dividend::NUMERIC / divisor the way Postgres divides numerics (select_div_scale): to at least 16
+# significant digits, with as many decimals as that takes, rounded half away from zero
+def _numericDivide(dividend: int, divisor: int) -> Decimal:
+    weight1, first1 = _weight(dividend)
+    weight2, first2 = _weight(divisor)
+    scale = min(max(16 - 4 * (weight1 - weight2 - (1 if first1 <= first2 else 0)), 0), 1000)
+    quotient, remainder = divmod(abs(dividend) * 10 ** scale, abs(divisor))
+    if 2 * remainder >= abs(divisor):
+        quotient += 1
+    return Decimal((1 if (dividend < 0) != (divisor < 0) and quotient != 0 else 0,
+                    tuple(int(digit) for digit in str(quotient)), -scale))
+
+
+_MISSING = object()
+# (dict, key, value before) of every change of the running call or unit of work, undone last first
+_undo = []
+
+
+def _put(table: dict, key, value):
+    _undo.append((table, key, table.get(key, _MISSING)))
+    table[key] = value
+
+
+def _pop(table: dict, key):
+    _undo.append((table, key, table.pop(key)))
+
+
+def _rollback(undo: list, mark: int):
+    while len(undo) > mark:
+        table, key, value = undo.pop()
+        if value is _MISSING:
+            del table[key]
+        else:
+            table[key] = value
+
+
+# the rows of every table, keyed and indexed the way the statements look them up, and the summary tables
+# maintained as the triggers maintain them. sets are dicts of None so that the undo log covers them
+class _Tables:
+    def __init__(self):
+        self.teams = {}  # id: None
+        self.matches = {}  # match_id: (match_id, competition, homeTeam_id, awayTeam_id)
+        self.players = {}  # player_id: (player_id, team_id, age, height, preferred_foot)
+        self.stadiums = {}  # stadium_id: (stadium_id, capacity, belong_to)
+        self.owners = {}  # belong_to: stadium_id, for UNIQUE(belong_to)
+        self.scores = {}  # row number: (player_id, match_id, goals), NULLs included
+        self.scoreKeys = {}  # (player_id, match_id): row number, for UNIQUE(player_id, match_id)
+        self.matchScores = {}  # match_id: {row number: None}
+        self.playerScores = {}  # player_id: {row number: None}
+        self.appearances = {}  # match_id: (stadium_id, attendance)
+        self.stadiumMatches = {}  # stadium_id: {match_id: None}
+        self.teamActivity = {}  # team_id: (tall_players, matches)
+        self.active = {}  # team_id: None, the rows of active_tall_teams
+        self.homeMatches = {}  # team_id: (home matches, those played before more than 40000)
+        self.popular = {}  # team_id: None, the teams all of whose home matches had more than 40000
+        self.stadiumStats = {}  # stadium_id: (total_goals, attendance_sum, attendance_count)
+        self.playerGoals = {}  # player_id: (team_id, goals, matches)
+        self.teamPlayers = {}  # team_id: {player_id: None}, PlayerGoals_team
+        self.coScoring = {}  # player_id: {other_id: shared}
+        self.rowCount = 0
+
+    # TeamActivity and active_tall_teams
+    def activity(self, teamID: int, tallPlayers: int, matches: int):
+        before = self.teamActivity.get(teamID, (0, 0))
+        tall, played = before[0] + tallPlayers, before[1] + matches
+        _put(self.teamActivity, teamID, (tall, played))
+        if tall > 0 and played > 0 and tall + played > 2:
+            if teamID not in self.active:
+                _put(self.active, teamID, None)
+        elif teamID in self.active:
+            _pop(self.active, teamID)
+
+    # popularTeams: a team's home matches and how many of them are in a stadium with more than 40000
+    def homeMatch(self, teamID: int, matches: int, popular: int):
+        before = self.homeMatches.get(teamID, (0, 0))
+        played, full = before[0] + matches, before[1] + popular
+        _put(self.homeMatches, teamID, (played, full))
+        if played > 0 and played == full:
+            if teamID not in self.popular:
+                _put(self.popular, teamID, None)
+        elif teamID in self.popular:
+            _pop(self.popular, teamID)
+
+    def stadiumChange(self, stadiumID: int, goals: int, attendance: int, count: int):
+        before = self.stadiumStats[stadiumID]
+        _put(self.stadiumStats, stadiumID, (before[0] + goals, before[1] + attendance, before[2] + count))
+
+    # SUM(goals) over the match's scores, 0 for none
+    def goalsOf(self, matchID: int) -> int:
+        scores = self.scores
+        return sum(goals for goals in (scores[row][2] for row in self.matchScores.get(matchID, ())) if goals is not None)
+
+    # the CoScoring pairs of the given scores with the scores of others in the same match: (player, other)
+    # for both orders of every two players, once per match they share
+    def pairs(self, rows: list, others) -> dict:
+        shared = set()
+        for playerID, matchID, _ in rows:
+            if playerID is None or matchID is None:
+                continue
+            for otherID in others(matchID):
+                if otherID is not None and otherID != playerID:
+                    shared.add((playerID, otherID, matchID))
+                    shared.add((otherID, playerID, matchID))
+        counts = {}
+        for playerID, otherID, _ in shared:
+            counts[(playerID, otherID)] = counts.get((playerID, otherID), 0) + 1
+        return counts
+
+    def scorersOf(self, matchID: int) -> list:
+        return [self.scores[row][0] for row in self.matchScores.get(matchID, ())]
+
+    def insertScores(self, rows: list):
+        for playerID, matchID, goals in rows:
+            self.rowCount += 1
+            _put(self.scores, self.rowCount, (playerID, matchID, goals))
+            if playerID is not None and matchID is not None:
+                _put(self.scoreKeys, (playerID, matchID), self.rowCount)
+            if matchID is not None:
+                _put(self.matchScores.setdefault(matchID, {}), self.rowCount, None)
+            if playerID is not None:
+                _put(self.playerScores.setdefault(playerID, {}), self.rowCount, None)
+        # the statement triggers of PlayerScores, a NULL total of a row that exists fails the statement
+        for playerID, goals in self.byPlayer(rows).items():
+            before = self.playerGoals[playerID]
+            total = _sum(goals)
+            if total is None:
+                raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "playergoals"')
+            _put(self.playerGoals, playerID, (before[0], before[1] + total, before[2] + len(goals)))
+        for stadiumID, goals in self.byStadium(rows).items():
+            total = _sum(goals)
+            if total is None:
+                raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "stadiumstats"')
+            self.stadiumChange(stadiumID, total, 0, 0)
+        for (playerID, otherID), n in self.pairs(rows, self.scorersOf).items():
+            shared = self.coScoring.setdefault(playerID, {})
+            _put(shared, otherID, shared.get(otherID, 0) + n)
+
+    def deleteScores(self, numbers: list):
+        rows = [self.scores[number] for number in numbers]
+        for number, (playerID, matchID, goals) in zip(numbers, rows):
+            _pop(self.scores, number)
+            if playerID is not None and matchID is not None:
+                _pop(self.scoreKeys, (playerID, matchID))
+            if matchID is not None:
+                _pop(self.matchScores[matchID], number)
+            if playerID is not None:
+                _pop(self.playerScores[playerID], number)
+        for playerID, goals in self.byPlayer(rows).items():
+            before = self.playerGoals[playerID]
+            total = _sum(goals)
+            if total is None:
+                raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "playergoals"')
+            _put(self.playerGoals, playerID, (before[0], before[1] - total, before[2] - len(goals)))
+        # goals of a match that is being deleted were taken out before it went
+        for stadiumID, goals in self.byStadium([row for row in rows if row[1] in self.matches]).items():
+            total = _sum(goals)
+            if total is None:
+                raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "stadiumstats"')
+            self.stadiumChange(stadiumID, -total, 0, 0)
+        removed = {}
+        for playerID, matchID, _ in rows:
+            if matchID is not None:
+                removed.setdefault(matchID, []).append(playerID)
+        for (playerID, otherID), n in self.pairs(rows, lambda m: self.scorersOf(m) + removed[m]).items():
+            shared = self.coScoring[playerID]
+            if shared.get(otherID) == n:
+                _pop(shared, otherID)
+            elif shared.get(otherID, 0) > n:
+                _put(shared, otherID, shared[otherID] - n)
+
+    # goals of scores by player, for the players' PlayerGoals rows
+    def byPlayer(self, rows: list) -> dict:
+        grouped = {}
+        for playerID, _, goals in rows:
+            if playerID in self.playerGoals:
+                grouped.setdefault(playerID, []).append(goals)
+        return grouped
+
+    # goals of scores by the stadium their match was played in
+    def byStadium(self, rows: list) -> dict:
+        grouped = {}
+        for _, matchID, goals in rows:
+            appearance = self.appearances.get(matchID)
+            if appearance is not None and appearance[0] in self.stadiumStats:
+                grouped.setdefault(appearance[0], []).append(goals)
+        return grouped
+
+    def insertAppearances(self, rows: list):
+        for stadiumID, matchID, attendance in rows:
+            _put(self.appearances, matchID, (stadiumID, attendance))
+            if stadiumID is not None:
+                _put(self.stadiumMatches.setdefault(stadiumID, {}), matchID, None)
+            if attendance is not None and attendance > 40000:
+                self.homeMatch(self.matches[matchID][2], 0, 1)
+        for stadiumID, appearances in self.appearancesByStadium(rows).items():
+            attendance = _sum(attendance for _, attendance in appearances)
+            if attendance is None:
+                raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "stadiumstats"')
+            self.stadiumChange(stadiumID, sum(self.goalsOf(matchID) for matchID, _ in appearances), attendance,
+                               len(appearances))
+
+    # homeTeamID is the team of the match, which may be deleted already
+    def deleteAppearance(self, matchID: int, homeTeamID: int):
+        stadiumID, attendance = self.appearances[matchID]
+        _pop(self.appearances, matchID)
+        if stadiumID is not None:
+            _pop(self.stadiumMatches[stadiumID], matchID)
+        if attendance is not None and attendance > 40000:
+            self.homeMatch(homeTeamID, 0, -1)
+        for stadiumID, appearances in self.appearancesByStadium([(stadiumID, matchID, attendance)]).items():
+            self.stadiumChange(stadiumID, -sum(self.goalsOf(m) for m, _ in appearances if m in self.matches),
+                               -_sum(attendance for _, attendance in appearances), -len(appearances))
+
+    def appearancesByStadium(self, rows: list) -> dict:
+        grouped = {}
+        for stadiumID, matchID, attendance in rows:
+            if stadiumID in self.stadiumStats:
+                grouped.setdefault(stadiumID, []).append((matchID, attendance))
+        return grouped
+
+    def addTeam(self, teamID):
+        teamID = _integer(teamID)
+        if teamID is None:
+            raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "team"')
+        if teamID <= 0:
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "team"')
+        if teamID in self.teams:
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "team"')
+        _put(self.teams, teamID, None)
+
+    def addMatch(self, matchID, competition, homeTeamID, awayTeamID):
+        matchID, competition = _integer(matchID), _text(competition)
+        homeTeamID, awayTeamID = _integer(homeTeamID), _integer(awayTeamID)
+        if None in (matchID, competition, homeTeamID, awayTeamID):
+            raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "match"')
+        if matchID <= 0 or homeTeamID == awayTeamID or competition not in ("International", "Domestic"):
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "match"')
+        if matchID in self.matches:
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "match"')
+        if homeTeamID not in self.teams or awayTeamID not in self.teams:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('insert violates a foreign key constraint of "match"')
+        _put(self.matches, matchID, (matchID, competition, homeTeamID, awayTeamID))
+        self.activity(homeTeamID, 0, 1)
+        self.activity(awayTeamID, 0, 1)
+        self.homeMatch(homeTeamID, 1, 0)
+
+    def deleteMatch(self, matchID, homeTeamID, awayTeamID, competition) -> int:
+        matchID, homeTeamID, awayTeamID = _integer(matchID), _integer(homeTeamID), _integer(awayTeamID)
+        competition = _text(competition)
+        match = self.matches.get(matchID)
+        if match is None or match[1] != competition or match[2] != homeTeamID or match[3] != awayTeamID:
+            return 0
+        # Match_stats_delete, before the match goes
+        appearance = self.appearances.get(matchID)
+        if appearance is not None and appearance[0] is not None:
+            self.stadiumChange(appearance[0], -self.goalsOf(matchID), 0, 0)
+        _pop(self.matches, matchID)
+        self.activity(homeTeamID, 0, -1)
+        self.activity(awayTeamID, 0, -1)
+        self.deleteScores(list(self.matchScores.get(matchID, ())))
+        if appearance is not None:
+            self.deleteAppearance(matchID, homeTeamID)
+        self.homeMatch(homeTeamID, -1, 0)
+        return 1
+
+    def addPlayer(self, playerID, teamID, age, height, foot):
+        playerID, teamID, age, height, foot = _integer(playerID), _integer(teamID), _integer(age), _integer(height), \
+                                              _text(foot)
+        if None in (playerID, teamID, age, height, foot):
+            raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "player"')
+        if playerID <= 0 or teamID <= 0 or age <= 0 or height <= 0 or foot not in ("Left", "Right"):
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "player"')
+        if playerID in self.players:
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "player"')
+        if teamID not in self.teams:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('insert violates a foreign key constraint of "player"')
+        _put(self.players, playerID, (playerID, teamID, age, height, foot))
+        self.activity(teamID, 1 if height > 190 else 0, 0)
+        _put(self.playerGoals, playerID, (teamID, 0, 0))
+        _put(self.teamPlayers.setdefault(teamID, {}), playerID, None)
+
+    def deletePlayer(self, playerID, teamID) -> int:
+        playerID, teamID = _integer(playerID), _integer(teamID)
+        player = self.players.get(playerID)
+        if player is None or player[1] != teamID:
+            return 0
+        _pop(self.players, playerID)
+        self.activity(teamID, -1 if player[3] > 190 else 0, 0)
+        # the scores cascade before PlayerGoals, their trigger still finds the player's row
+        self.deleteScores(list(self.playerScores.get(playerID, ())))
+        _pop(self.playerGoals, playerID)
+        _pop(self.teamPlayers[teamID], playerID)
+        return 1
+
+    def addStadium(self, stadiumID, capacity, belongTo):
+        stadiumID, capacity, belongTo = _integer(stadiumID), _integer(capacity), _integer(belongTo)
+        if stadiumID is None or capacity is None:
+            raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "stadium"')
+        if stadiumID <= 0 or capacity <= 0:
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "stadium"')
+        if stadiumID in self.stadiums or (belongTo is not None and belongTo in self.owners):
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "stadium"')
+        if belongTo is not None and belongTo not in self.teams:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('insert violates a foreign key constraint of "stadium"')
+        _put(self.stadiums, stadiumID, (stadiumID, capacity, belongTo))
+        if belongTo is not None:
+            _put(self.owners, belongTo, stadiumID)
+        _put(self.stadiumStats, stadiumID, (0, 0, 0))
+
+    def deleteStadium(self, stadiumID, capacity, belongTo) -> int:
+        stadiumID, capacity, belongTo = _integer(stadiumID), _integer(capacity), _integer(belongTo)
+        stadium = self.stadiums.get(stadiumID)
+        if stadium is None or belongTo is None or stadium[1] != capacity or stadium[2] != belongTo:
+            return 0
+        _pop(self.stadiums, stadiumID)
+        _pop(self.owners, belongTo)
+        for matchID in list(self.stadiumMatches.get(stadiumID, ())):
+            self.deleteAppearance(matchID, self.matches[matchID][2])
+        _pop(self.stadiumStats, stadiumID)
+        return 1
+
+    def addScore(self, playerID, matchID, goals):
+        playerID, matchID, goals = _integer(playerID), _integer(matchID), _integer(goals)
+        if goals is not None and goals <= 0:
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "playerscores"')
+        if (playerID, matchID) in self.scoreKeys:
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "playerscores"')
+        if (playerID is not None and playerID not in self.players) or (matchID is not None and matchID not in self.matches):
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('insert violates a foreign key constraint of "playerscores"')
+        self.insertScores([(playerID, matchID, goals)])
+
+    def deleteScore(self, playerID, matchID) -> int:
+        number = self.scoreKeys.get((_integer(playerID), _integer(matchID)))
+        if number is None:
+            return 0
+        self.deleteScores([number])
+        return 1
+
+    # Database._playersScoredInMatchesQuery on (ord, match_id, player_id, goals) rows, [(ord, ReturnValue)]
+    def recordScores(self, rows: list) -> list:
+        rows = [(order, _integer(matchID), _integer(playerID), _integer(goals)) for order, matchID, playerID, goals in rows]
+        first = {}
+        flagged = []
+        for order, matchID, playerID, goals in rows:
+            bad = goals is not None and goals <= 0
+            present = (playerID, matchID) in self.scoreKeys
+            referenced = (playerID is None or playerID in self.players) and (matchID is None or matchID in self.matches)
+            if not bad and not present and referenced:
+                first.setdefault((playerID, matchID), order)
+            flagged.append((order, matchID, playerID, goals, bad, present, referenced))
+        statuses, inserted = [], []
+        for order, matchID, playerID, goals, bad, present, referenced in flagged:
+            keyed = playerID is not None and matchID is not None
+            if bad:
+                status = ReturnValue.BAD_PARAMS
+            elif present or (keyed and first.get((playerID, matchID), order) < order):
+                status = ReturnValue.ALREADY_EXISTS
+            elif not referenced:
+                status = ReturnValue.NOT_EXISTS
+            else:
+                status = ReturnValue.OK
+                inserted.append((playerID, matchID, goals))
+            statuses.append((order, status))
+        self.insertScores(inserted)
+        return statuses
+
+    def addAppearance(self, stadiumID, matchID, attendance):
+        stadiumID, matchID, attendance = _integer(stadiumID), _integer(matchID), _integer(attendance)
+        if matchID is None:
+            raise DatabaseException.NOT_NULL_VIOLATION('null value violates a not-null constraint of "matchinstadium"')
+        if attendance is not None and attendance <= 0:
+            raise DatabaseException.CHECK_VIOLATION('new row violates a check constraint of "matchinstadium"')
+        if matchID in self.appearances:
+            raise DatabaseException.UNIQUE_VIOLATION('duplicate key value violates a unique constraint of "matchinstadium"')
+        if (stadiumID is not None and stadiumID not in self.stadiums) or matchID not in self.matches:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('insert violates a foreign key constraint of "matchinstadium"')
+        self.insertAppearances([(stadiumID, matchID, attendance)])
+
+    def deleteAppearanceOf(self, stadiumID, matchID) -> int:
+        stadiumID, matchID = _integer(stadiumID), _integer(matchID)
+        appearance = self.appearances.get(matchID)
+        if appearance is None or stadiumID is None or appearance[0] != stadiumID:
+            return 0
+        self.deleteAppearance(matchID, self.matches[matchID][2])
+        return 1
+
+    # Database._matchesInStadiumsQuery on (ord, match_id, stadium_id, attendance) rows, [(ord, ReturnValue)]
+    def recordAppearances(self, rows: list) -> list:
+        rows = [(order, _integer(matchID), _integer(stadiumID), _integer(attendance))
+                for order, matchID, stadiumID, attendance in rows]
+        first = {}
+        flagged = []
+        for order, matchID, stadiumID, attendance in rows:
+            bad = matchID is None or (attendance is not None and attendance <= 0)
+            present = matchID in self.appearances
+            referenced = (stadiumID is None or stadiumID in self.stadiums) and matchID in self.matches
+            if not bad and not present and referenced:
+                first.setdefault(matchID, order)
+            flagged.append((order, matchID, stadiumID, attendance, bad, present, referenced))
+        statuses, inserted = [], []
+        for order, matchID, stadiumID, attendance, bad, present, referenced in flagged:
+            if bad:
+                status = ReturnValue.BAD_PARAMS
+            elif present or first.get(matchID, order) < order:
+                status = ReturnValue.ALREADY_EXISTS
+            elif not referenced:
+                status = ReturnValue.NOT_EXISTS
+            else:
+                status = ReturnValue.OK
+                inserted.append((stadiumID, matchID, attendance))
+            statuses.append((order, status))
+        self.insertAppearances(inserted)
+        return statuses
+
+    # table is "matches", "players" or "stadiums"
+    def row(self, table: str, entityID) -> Union[tuple, None]:
+        return getattr(self, table).get(_integer(entityID))
+
+    def rows(self, table: str, entityIDs: list) -> dict:
+        rows = getattr(self, table)
+        return {entityID: rows[entityID] for entityID in map(_integer, entityIDs) if entityID in rows}
+
+    def averageAttendance(self, stadiumID) -> Union[Decimal, None]:
+        stats = self.stadiumStats.get(_integer(stadiumID))
+        if stats is None or stats[2] == 0:
+            return None
+        return _numericDivide(stats[1], stats[2])
+
+    def totalGoals(self, stadiumID) -> int:
+        stats = self.stadiumStats.get(_integer(stadiumID))
+        return stats[0] if stats is not None else 0
+
+    def isWinner(self, playerID, matchID) -> bool:
+        playerID, matchID = _integer(playerID), _integer(matchID)
+        number = self.scoreKeys.get((playerID, matchID))
+        if number is None:
+            return False
+        goals = self.scores[number][2] or 0
+        return 2 * goals >= self.goalsOf(matchID) and goals != 0
+
+    def activeTallTeams(self) -> list:
+        return heapq.nlargest(5, self.active)
+
+    def activeTallRichTeams(self) -> list:
+        return heapq.nsmallest(5, (belongTo for _, capacity, belongTo in self.stadiums.values()
+                                   if capacity > 55000 and belongTo in self.active))
+
+    def popularTeams(self) -> list:
+        return heapq.nlargest(10, self.popular)
+
+    def attractiveStadiums(self) -> list:
+        stats = self.stadiumStats
+        return sorted(stats, key=lambda stadiumID: (-stats[stadiumID][0], stadiumID))
+
+    # the checkStadiumStats statement: StadiumStats recomputed from the tables
+    def inconsistentStadiums(self) -> list:
+        found = []
+        for stadiumID in sorted(self.stadiums):
+            stats = self.stadiumStats.get(stadiumID)
+            matches = list(self.stadiumMatches.get(stadiumID, ()))
+            attendance = _sum(self.appearances[matchID][1] for matchID in matches) or 0
+            goals = _sum(self.scores[number][2] for matchID in matches for number in self.matchScores.get(matchID, ()))
+            if stats is None or stats != (goals or 0, attendance, len(matches)):
+                found.append(stadiumID)
+        return found
+
+    # the players of a team with the most goals, the latest added first among equals
+    def topScorers(self, teamID: int, k: Union[int, None]) -> list:
+        goals = self.playerGoals
+        players = self.teamPlayers.get(teamID, ())
+        if k is None:
+            return sorted(players, key=lambda playerID: (goals[playerID][1], playerID), reverse=True)
+        return heapq.nlargest(k, players, key=lambda playerID: (goals[playerID][1], playerID))
+
+    def mostGoals(self, teamID) -> list:
+        return self.topScorers(_integer(teamID), 5)
+
+    # (team, player) rows of the mostGoalsForTeams statement
+    def mostGoalsOf(self, teamIDs: list, k) -> list:
+        teamIDs, k = _integers(teamIDs), _integer(k, _BIGINT)
+        if k is not None and k < 0 and len(teamIDs) != 0:
+            raise DatabaseException.UNKNOWN_ERROR("LIMIT must not be negative")
+        return [(teamID, playerID) for teamID in teamIDs for playerID in self.topScorers(teamID, k)]
+
+    def closePlayers(self, playerID) -> list:
+        playerID = _integer(playerID)
+        goals = self.playerGoals.get(playerID)
+        if goals is None:
+            return []
+        shared = self.coScoring.get(playerID, {})
+        return heapq.nsmallest(10, (otherID for otherID, n in shared.items() if 2 * n >= goals[2]))
+
+    def dashboard(self, stadiumIDs: list) -> tuple:
+        stadiumIDs = _integers(stadiumIDs)
+        stats = [self.stadiumStats.get(stadiumID) for stadiumID in stadiumIDs]
+        return (self.activeTallTeams(), self.activeTallRichTeams(), self.popularTeams(), self.attractiveStadiums(),
+                [_numericDivide(s[1], s[2]) if s is not None and s[2] != 0 else Decimal(0) for s in stats],
+                [s[0] if s is not None else 0 for s in stats])
+
+
+# {"tables": _Tables, None once dropped}, changed through _put so that units of work undo it too
+_schema = {"tables": None}
+_lock = threading.RLock()
+_local = threading.local()
+
+
+# a unit of work, like Utility.DBConnector.Transaction: the calls of the block on the owning thread share
+# it and their changes are kept in its undo log until the block ends. without savepoints the first failed
+# call undoes the whole unit and the calls after it fail as on an aborted connection, with savepoints a
+# failed call only undoes itself. other threads wait for the unit to end
+class Transaction:
+    def __init__(self, savepoints: bool):
+        self.savepoints = savepoints
+        self.failed = False
+        self.committed = False
+        # called once the unit has ended, committed or not
+        self.onEnd = []
+        self.undo = []
+
+    def end(self, commit: bool):
+        try:
+            if commit and not self.failed:
+                self.committed = True
+            else:
+                _rollback(self.undo, 0)
+            self.undo = []
+        finally:
+            for callback in self.onEnd:
+                callback()
+
+
+def currentTransaction() -> Union[Transaction, None]:
+    return getattr(_local, "transaction", None)
+
+
+# with MemoryDatabase.transaction() as unit: ..., as Database.transaction
+@contextmanager
+def transaction(savepoints: bool = False):
+    current = currentTransaction()
+    if current is not None:
+        yield current
+        return
+    unit = Transaction(savepoints)
+    with _lock:
+        _local.transaction = unit
+        try:
+            yield unit
+        except BaseException:
+            _local.transaction = None
+            unit.end(commit=False)
+            raise
+        _local.transaction = None
+        unit.end(commit=True)
+
+
+def _tables() -> _Tables:
+    tables = _schema["tables"]
+    if tables is None:
+        raise DatabaseException.UNKNOWN_ERROR('relation "team" does not exist')
+    return tables
+
+
+# runs fn() as one statement: its changes are undone if it raises, and so is the whole unit of work it
+# is part of when that runs without savepoints. inside a failed unit it raises ConnectionInvalid instead
+def _execute(fn):
+    global _undo
+    unit = currentTransaction()
+    with _lock:
+        if unit is not None and unit.failed:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        _undo = unit.undo if unit is not None else []
+        mark = len(_undo)
+        try:
+            return fn()
+        except Exception:
+            _rollback(_undo, mark)
+            if unit is not None and not unit.savepoints:
+                unit.failed = True
+                _rollback(_undo, 0)
+            raise
+
+
+def _run(operation, *params):
+    return _execute(lambda: operation(_tables(), *params))
+
+
+def createTables():
+    def create():
+        if _schema["tables"] is not None:
+            raise DatabaseException.UNKNOWN_ERROR('relation "team" already exists')
+        _put(_schema, "tables", _Tables())
+    try:
+        _execute(create)
+    except Exception as e:
+        print(e)
+
+
+# the DELETE statements of Database.clearTables run Team first, so they fail while a match, player or
+# stadium still refers to a team
+def clearTables():
+    def clear():
+        tables = _tables()
+        if tables.matches or tables.players or tables.owners:
+            raise DatabaseException.FOREIGN_KEY_VIOLATION('update or delete on table "team" violates a foreign key '
+                                                          'constraint')
+        _put(_schema, "tables", _Tables())
+    try:
+        _execute(clear)
+    except Exception as e:
+        print(e)
+
+
+def dropTables():
+    try:
+        _execute(lambda: _put(_schema, "tables", None))
+    except Exception as e:
+        print(e)
+
+
+_insertResults = {DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+                  DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+                  DatabaseException.NOT_NULL_VIOLATION: ReturnValue.BAD_PARAMS}
+_addStadiumResults = dict(_insertResults)
+_addStadiumResults[DatabaseException.FOREIGN_KEY_VIOLATION] = ReturnValue.BAD_PARAMS
+# playerScoredInMatch and matchInStadium, whose except clauses let errors that are no DatabaseException
+# through to OK
+_recordResults = {DatabaseException.CHECK_VIOLATION: ReturnValue.BAD_PARAMS,
+                  DatabaseException.FOREIGN_KEY_VIOLATION: ReturnValue.NOT_EXISTS,
+                  DatabaseException.UNIQUE_VIOLATION: ReturnValue.ALREADY_EXISTS,
+                  DatabaseException.UNKNOWN_ERROR: ReturnValue.ERROR}
+# playerDidntScoreInMatch and matchNotInStadium, the same for their deletes
+_unrecordResults = {DatabaseException.NOT_NULL_VIOLATION: ReturnValue.ERROR,
+                    DatabaseException.CHECK_VIOLATION: ReturnValue.ERROR}
+
+
+# one write reported like the Database.py function: params() gives the statement's parameters (evaluated
+# where Database.py evaluates them, inside its try), results maps the DatabaseExceptions the function tells
+# apart, any other error gives otherwise, and with missing set a statement that changed no row gives missing
+def _modify(operation, params, results: dict, otherwise=ReturnValue.ERROR, missing=None) -> ReturnValue:
+    try:
+        rows = _run(operation, *params())
+    except DatabaseException.ConnectionInvalid:
+        return ReturnValue.ERROR
+    except Exception as e:
+        return results.get(type(e), otherwise)
+    if missing is not None and rows == 0:
+        return missing
+    return ReturnValue.OK
+
+
+# the bulk adds: every row as the single-row function would report it, a failing row only undoes itself,
+# as under the savepoints of Database._bulkInsert
+def _bulkInsert(operation, rows: list, results: dict) -> List[ReturnValue]:
+    global _undo
+    report = [ReturnValue.OK] * len(rows)
+    if len(rows) == 0:
+        return report
+    unit = currentTransaction()
+    with _lock:
+        if unit is not None and unit.failed:
+            return [ReturnValue.ERROR] * len(rows)
+        _undo = unit.undo if unit is not None else []
+        for index, row in enumerate(rows):
+            mark = len(_undo)
+            try:
+                operation(_tables(), *row)
+            except Exception as e:
+                _rollback(_undo, mark)
+                report[index] = results.get(type(e), ReturnValue.ERROR)
+    return report
+
+
+# the batch writes, like Database._recordBatch: rows of anything but ints and None are ERROR, the rest
+# go in one statement that reports every row, or fails as a whole
+def _recordBatch(operation, rows: list) -> List[ReturnValue]:
+    report = [ReturnValue.OK] * len(rows)
+    batch = []
+    for index, row in enumerate(rows):
+        if all(value is None or type(value) is int for value in row):
+            batch.append((index,) + row)
+        else:
+            report[index] = ReturnValue.ERROR
+    if len(batch) == 0:
+        return report
+    try:
+        for index, status in _run(operation, batch):
+            report[index] = status
+    except Exception:
+        for row in batch:
+            report[row[0]] = ReturnValue.ERROR
+    return report
+
+
+# a read of the analytics functions: a failed unit of work gives the function's error value, any other
+# error reaches the caller, as the except clauses of Database.py only catch ConnectionInvalid
+def _query(invalid, operation, *params):
+    try:
+        return _run(operation, *params)
+    except DatabaseException.ConnectionInvalid:
+        return invalid
+
+
+def _profile(table: str, entityID, cls, bad):
+    try:
+        row = _run(_Tables.row, table, entityID)
+    except Exception:
+        return bad()
+    return cls(*row) if row is not None else bad()
+
+
+# get*Profiles: one entity (or the bad sentinel) per id, in the order asked, ids that are not ints of the
+# INTEGER range are bad and so is every id when the lookup fails
+def _profiles(table: str, entityIDs: Iterable[int], cls, bad) -> list:
+    entityIDs = list(entityIDs)
+    wanted = list(dict.fromkeys(i for i in entityIDs if type(i) is int and _INTEGER[0] <= i <= _INTEGER[1]))
+    found = {}
+    if len(wanted) != 0:
+        try:
+            found = _run(_Tables.rows, table, wanted)
+        except Exception:
+            pass
+    return [cls(*found[i]) if type(i) is int and i in found else bad() for i in entityIDs]
+
+
+def addTeam(teamID: int) -> ReturnValue:
+    return _modify(_Tables.addTeam, lambda: (teamID,), _insertResults)
+
+
+def addTeams(teamIDs: Iterable[int], chunkSize: int = 10000) -> List[ReturnValue]:
+    return _bulkInsert(_Tables.addTeam, [(teamID,) for teamID in teamIDs], _insertResults)
+
+
+def addMatch(match: Match) -> ReturnValue:
+    return _modify(_Tables.addMatch, lambda: (match.getMatchID(), match.getCompetition(), match.getHomeTeamID(),
+                                              match.getAwayTeamID()), _insertResults)
+
+
+def addMatches(matches: Iterable[Match], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(m.getMatchID(), m.getCompetition(), m.getHomeTeamID(), m.getAwayTeamID()) for m in matches]
+    return _bulkInsert(_Tables.addMatch, rows, _insertResults)
+
+
+def getMatchProfile(matchID: int) -> Match:
+    return _profile("matches", matchID, Match, Match.badMatch)
+
+
+def getMatchProfiles(matchIDs: Iterable[int]) -> List[Match]:
+    return _profiles("matches", matchIDs, Match, Match.badMatch)
+
+
+def deleteMatch(match: Match) -> ReturnValue:
+    return _modify(_Tables.deleteMatch, lambda: (match.getMatchID(), match.getHomeTeamID(), match.getAwayTeamID(),
+                                                 match.getCompetition()), {}, missing=ReturnValue.NOT_EXISTS)
+
+
+def addPlayer(player: Player) -> ReturnValue:
+    return _modify(_Tables.addPlayer, lambda: (player.getPlayerID(), player.getTeamID(), player.getAge(),
+                                               player.getHeight(), player.getFoot()), _insertResults)
+
+
+def addPlayers(players: Iterable[Player], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(p.getPlayerID(), p.getTeamID(), p.getAge(), p.getHeight(), p.getFoot()) for p in players]
+    return _bulkInsert(_Tables.addPlayer, rows, _insertResults)
+
+
+def getPlayerProfile(playerID: int) -> Player:
+    return _profile("players", playerID, Player, Player.badPlayer)
+
+
+def getPlayerProfiles(playerIDs: Iterable[int]) -> List[Player]:
+    return _profiles("players", playerIDs, Player, Player.badPlayer)
+
+
+def deletePlayer(player: Player) -> ReturnValue:
+    return _modify(_Tables.deletePlayer, lambda: (player.getPlayerID(), player.getTeamID()), {},
+                   missing=ReturnValue.NOT_EXISTS)
+
+
+def addStadium(stadium: Stadium) -> ReturnValue:
+    return _modify(_Tables.addStadium, lambda: (stadium.getStadiumID(), stadium.getCapacity(), stadium.getBelongsTo()),
+                   _addStadiumResults)
+
+
+def addStadiums(stadiums: Iterable[Stadium], chunkSize: int = 10000) -> List[ReturnValue]:
+    rows = [(s.getStadiumID(), s.getCapacity(), s.getBelongsTo()) for s in stadiums]
+    return _bulkInsert(_Tables.addStadium, rows, _addStadiumResults)
+
+
+def getStadiumProfile(stadiumID: int) -> Stadium:
+    return _profile("stadiums", stadiumID, Stadium, Stadium.badStadium)
+
+
+def getStadiumProfiles(stadiumIDs: Iterable[int]) -> List[Stadium]:
+    return _profiles("stadiums", stadiumIDs, Stadium, Stadium.badStadium)
+
+
+def deleteStadium(stadium: Stadium) -> ReturnValue:
+    return _modify(_Tables.deleteStadium, lambda: (stadium.getStadiumID(), stadium.getCapacity(),
+                                                   stadium.getBelongsTo()), {}, missing=ReturnValue.NOT_EXISTS)
+
+
+def playerScoredInMatch(match: Match, player: Player, amount: int) -> ReturnValue:
+    return _modify(_Tables.addScore, lambda: (player.getPlayerID(), match.getMatchID(), amount), _recordResults,
+                   otherwise=ReturnValue.OK)
+
+
+def playersScoredInMatches(scores: Iterable[Tuple[Match, Player, int]]) -> List[ReturnValue]:
+    rows = [(match.getMatchID(), player.getPlayerID(), amount) for match, player, amount in scores]
+    return _recordBatch(_Tables.recordScores, rows)
+
+
+def playerDidntScoreInMatch(match: Match, player: Player) -> ReturnValue:
+    return _modify(_Tables.deleteScore, lambda: (player.getPlayerID(), match.getMatchID()), _unrecordResults,
+                   otherwise=ReturnValue.OK, missing=ReturnValue.NOT_EXISTS)
+
+
+def matchInStadium(match: Match, stadium: Stadium, attendance: int) -> ReturnValue:
+    sid = stadium.getStadiumID()
+    mid = match.getMatchID()
+    return _modify(_Tables.addAppearance, lambda: (sid, mid, attendance), _recordResults, otherwise=ReturnValue.OK)
+
+
+def matchesInStadiums(appearances: Iterable[Tuple[Match, Stadium, int]]) -> List[ReturnValue]:
+    rows = [(match.getMatchID(), stadium.getStadiumID(), attendance) for match, stadium, attendance in appearances]
+    return _recordBatch(_Tables.recordAppearances, rows)
+
+
+def matchNotInStadium(match: Match, stadium: Stadium) -> ReturnValue:
+    return _modify(_Tables.deleteAppearanceOf, lambda: (stadium.getStadiumID(), match.getMatchID()), _unrecordResults,
+                   otherwise=ReturnValue.OK, missing=ReturnValue.NOT_EXISTS)
+
+
+# a Decimal as Postgres divides the numerics, 0 for a stadium without matches, -1 in a failed unit of
+# work and, as in Database.py, 0 on any other error
+def averageAttendanceInStadium(stadiumID: int) -> float:
+    try:
+        result = _run(_Tables.averageAttendance, stadiumID)
+    except DatabaseException.ConnectionInvalid:
+        return -1
+    except Exception:
+        return 0
+    return result if result is not None else 0
+
+
+def stadiumTotalGoals(stadiumID: int) -> int:
+    return _query(-1, _Tables.totalGoals, stadiumID)
+
+
+def playerIsWinner(playerID: int, matchID: int) -> bool:
+    return _query(False, _Tables.isWinner, playerID, matchID)
+
+
+def getActiveTallTeams() -> List[int]:
+    return _query([], _Tables.activeTallTeams)
+
+
+def getActiveTallRichTeams() -> List[int]:
+    return _query([], _Tables.activeTallRichTeams)
+
+
+def popularTeams() -> List[int]:
+    return _query([], _Tables.popularTeams)
+
+
+def getMostAttractiveStadiums() -> List[int]:
+    return _query([], _Tables.attractiveStadiums)
+
+
+def iterMostAttractiveStadiums(fetchSize: int = 1000) -> Iterator[int]:
+    yield from _run(_Tables.attractiveStadiums)
+
+
+def checkStadiumStats() -> List[int]:
+    return _run(_Tables.inconsistentStadiums)
+
+
+def mostGoalsForTeam(teamID: int) -> List[int]:
+    return _query([], _Tables.mostGoals, teamID)
+
+
+def mostGoalsForTeams(teamIDs: Iterable[int], k: int = 5) -> Dict[int, List[int]]:
+    teamIDs = list(dict.fromkeys(teamIDs))
+    res = {teamID: [] for teamID in teamIDs}
+    try:
+        rows = _run(_Tables.mostGoalsOf, teamIDs, k)
+    except Exception:
+        return {}
+    for teamID, playerID in rows:
+        res[teamID].append(playerID)
+    return res
+
+
+def getClosePlayers(playerID: int) -> List[int]:
+    return _query([], _Tables.closePlayers, playerID)
+
+
+def getDashboard(stadiumIDs: Iterable[int] = ()) -> Dashboard:
+    stadiumIDs = list(dict.fromkeys(stadiumIDs))
+    try:
+        tallTeams, tallRichTeams, popular, attractive, attendance, goals = _run(_Tables.dashboard, stadiumIDs)
+    except Exception:
+        return Dashboard.badDashboard()
+    return Dashboard(tallTeams, tallRichTeams, popular, attractive, dict(zip(stadiumIDs, attendance)),
+                     dict(zip(stadiumIDs, goals)))
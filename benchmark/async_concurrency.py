@@ -0,0 +1,81 @@
+# many concurrent requests (profile reads, attendance reads and goal writes) served by Database.py on a
+# pool of threads against AsyncDatabase.py on one event loop, both over the same number of connections.
+# every request's latency counts from the moment all of them were submitted, so queueing is included.
+# run from the project root: python -m benchmark.async_concurrency [requests] [connections] [threads]
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import random
+import sys
+import time
+import AsyncDatabase
+import Database
+import Utility.AsyncDBConnector as AsyncConnector
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from benchmark.league import League, SEED
+from benchmark.timing import summarize, formatSummary
+
+# 2000 players and 200 stadiums, every match played in one of them
+LEAGUE = League(1, SEED, playersPerTeam=100, matches=1000, stadiums=200, playedInStadium=1.0)
+
+
+# the same mix for both runs: mostly profile and attendance reads, one request in ten records a goal
+def workload(requests: int, seed: int) -> list:
+    rng = random.Random(seed)
+    calls = []
+    for r in range(requests):
+        kind = rng.random()
+        if kind < 0.6:
+            calls.append(("getPlayerProfile", (rng.randint(1, LEAGUE.players),)))
+        elif kind < 0.9:
+            calls.append(("averageAttendanceInStadium", (rng.randint(1, LEAGUE.stadiums),)))
+        else:
+            calls.append(("playerScoredInMatch", (Match(rng.randint(1, LEAGUE.matches)), Player(rng.randint(1, LEAGUE.players)), 1)))
+    return calls
+
+
+def runThreads(calls: list, threads: int) -> (list, float):
+    def timed(call, submitted):
+        name, args = call
+        getattr(Database, name)(*args)
+        return time.perf_counter() - submitted
+
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        start = time.perf_counter()
+        futures = [executor.submit(timed, call, start) for call in calls]
+        samples = [future.result() for future in futures]
+    return samples, len(calls) / (time.perf_counter() - start)
+
+
+async def runAsync(calls: list) -> (list, float):
+    async def timed(call, submitted):
+        name, args = call
+        await getattr(AsyncDatabase, name)(*args)
+        return time.perf_counter() - submitted
+
+    start = time.perf_counter()
+    samples = await asyncio.gather(*[timed(call, start) for call in calls])
+    return samples, len(calls) / (time.perf_counter() - start)
+
+
+def main(requests: int, connections: int, threads: int):
+    Database.dropTables()
+    Database.createTables()
+    LEAGUE.load()
+    Connector.configurePool(maxSize=connections)
+    AsyncConnector.configureAsyncPool(maxSize=connections)
+    samples, throughput = runThreads(workload(requests, 1), threads)
+    print(formatSummary("sync, {} threads".format(threads), summarize(samples)))
+    print("{:<32} {:.0f} requests/s, pool {}".format("sync throughput", throughput, Connector.poolStats()))
+    samples, throughput = asyncio.run(runAsync(workload(requests, 2)))
+    print(formatSummary("async, one event loop", summarize(samples)))
+    print("{:<32} {:.0f} requests/s, pool {}".format("async throughput", throughput, AsyncConnector.asyncPoolStats()))
+    AsyncConnector.closeAsyncPool()
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 64)
@@ -0,0 +1,69 @@
+# getClosePlayers on a dense league, where every player scores in many matches next to many others,
+# read from the CoScoring pairs against the grouping query it replaced, and what keeping the pairs
+# costs playerScoredInMatch.
+# run from the project root: python -m benchmark.close_players [matches] [scorersPerMatch] [iterations]
+import sys
+import time
+import Database
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from benchmark.league import League, SEED
+from benchmark.timing import measure, summarize, formatSummary
+
+Connector.registerStatement("legacyClosePlayers", "SELECT AP.player_id \
+                                                  FROM (SELECT Player.player_id, PlayerScores.match_id FROM Player \
+                                                        LEFT OUTER JOIN PlayerScores \
+                                                        ON(Player.player_id=PlayerScores.player_id)) AP \
+                                                  WHERE AP.player_id!=$1 \
+                                                  AND AP.match_id IN(SELECT match_id FROM PlayerScores WHERE player_id=$1) \
+                                                  GROUP BY AP.player_id \
+                                                  HAVING 2*COUNT(AP.match_id) >= (SELECT COUNT(match_id) FROM PlayerScores \
+                                                                                  WHERE player_id=$1) \
+                                                  ORDER BY player_id ASC LIMIT 10;")
+
+# every table but PlayerScores, copied before the scores are timed
+BEFORE_SCORES = ("Team", "Player", "Stadium", "Match", "MatchInStadium")
+
+
+def load(matches: int, scorersPerMatch: int) -> (League, float):
+    league = League(1, SEED, matches=matches, scorersPerMatch=scorersPerMatch)
+    league.load(BEFORE_SCORES)
+    start = time.perf_counter()
+    rows = league.load(["PlayerScores"])["PlayerScores"]
+    elapsed = time.perf_counter() - start
+    print("matches={} scorers/match={} PlayerScores={} COPY with pair upkeep and ANALYZE={:.2f}s".format(
+        matches, league.scorersPerMatch, rows, elapsed))
+    return league, elapsed
+
+
+def runStatement(name: str, params: tuple):
+    conn = Connector.DBConnector()
+    try:
+        conn.executePrepared(name, params)
+    finally:
+        conn.close()
+
+
+def main(matches: int, scorersPerMatch: int, iterations: int):
+    Database.dropTables()
+    Database.createTables()
+    league, _ = load(matches, scorersPerMatch)
+    players = league.players
+    before = summarize(measure(lambda i: runStatement("legacyClosePlayers", (i * 7 % players + 1,)), iterations))
+    after = summarize(measure(lambda i: Database.getClosePlayers(i * 7 % players + 1), iterations))
+    print(formatSummary("getClosePlayers grouping", before))
+    print(formatSummary("getClosePlayers pairs", after))
+    print("{:<32} {:.2f}x".format("speedup (p50)", before["p50_us"] / max(after["p50_us"], 1e-9)))
+    # recording a score in one of the loaded matches pairs the player with the scorersPerMatch already there
+    writes = summarize(measure(lambda i: (Database.playerDidntScoreInMatch(Match(i % matches + 1), Player(i % players + 1)),
+                                         Database.playerScoredInMatch(Match(i % matches + 1), Player(i % players + 1), 1)),
+                              iterations))
+    print(formatSummary("remove+record a score", writes))
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 20,
+         int(sys.argv[3]) if len(sys.argv) > 3 else 1000)
@@ -0,0 +1,70 @@
+# many threads reading single player profiles and stadium averages at once, each call a round trip of its
+# own against the same calls coalesced into batched queries, with the batch sizes that were reached.
+# run from the project root: python -m benchmark.coalescing [threads] [callsPerThread] [windowMs] [maxBatchSize]
+import random
+import sys
+import threading
+import time
+import Database
+import Utility.BatchLoader as BatchLoader
+import Utility.DBConnector as Connector
+from benchmark.league import League, SEED
+from benchmark.timing import summarize, formatSummary
+
+# 2000 players and 200 stadiums, every match played in one of them
+LEAGUE = League(1, SEED, playersPerTeam=100, matches=1000, stadiums=200, playedInStadium=1.0)
+
+
+# every thread alternates profile and attendance reads, returns each call's latency and the calls per second
+def run(threads: int, calls: int) -> (list, float):
+    samples = []
+    samplesLock = threading.Lock()
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        mine = []
+        barrier.wait()
+        for c in range(calls):
+            start = time.perf_counter()
+            if c % 2 == 0:
+                Database.getPlayerProfile(rng.randint(1, LEAGUE.players))
+            else:
+                Database.averageAttendanceInStadium(rng.randint(1, LEAGUE.stadiums))
+            mine.append(time.perf_counter() - start)
+        with samplesLock:
+            samples.extend(mine)
+
+    workers = [threading.Thread(target=worker, args=(t,)) for t in range(threads)]
+    for w in workers:
+        w.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for w in workers:
+        w.join()
+    return samples, threads * calls / (time.perf_counter() - start)
+
+
+def main(threads: int, calls: int, window: float, maxBatchSize: int):
+    Database.dropTables()
+    Database.createTables()
+    LEAGUE.load()
+    Connector.configurePool(maxSize=threads)
+    for coalescing in (False, True):
+        BatchLoader.configureCoalescing(window, maxBatchSize, enabled=coalescing)
+        samples, throughput = run(threads, calls)
+        name = "coalesced" if coalescing else "one query per call"
+        print(formatSummary(name, summarize(samples)))
+        print("{:<32} {:.0f} calls/s, pool {}".format(name + " throughput", throughput, Connector.poolStats()))
+    for function, stats in BatchLoader.coalescingStats().items():
+        print("{:<32} batches={} requests={} mean={:.1f} largest={} histogram={}".format(
+            function, stats["batches"], stats["requests"], stats["mean"], stats["largest"], stats["histogram"]))
+    BatchLoader.configureCoalescing(enabled=False)
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 32,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 500,
+         float(sys.argv[3]) / 1000 if len(sys.argv) > 3 else 0.002,
+         int(sys.argv[4]) if len(sys.argv) > 4 else 100)
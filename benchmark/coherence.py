@@ -0,0 +1,88 @@
+# several worker processes cache stadiumTotalGoals against one database while the main process records
+# goals. with notifications every worker sees each new total, and the time it took is reported; without
+# them the workers keep serving the total they cached first.
+# run from the project root: python -m benchmark.coherence [workers] [rounds] [--without-notifications]
+import multiprocessing
+import sys
+import time
+import Database
+import Utility.Cache as Cache
+import Utility.Notify as Notify
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from benchmark.timing import summarize, formatSummary
+
+
+def worker(commands, results, notifications: bool, timeout: float):
+    Cache.configureCache(ttl=3600)
+    if notifications:
+        Notify.configureNotifications()
+        Notify.waitListening(10)
+    while True:
+        command = commands.get()
+        if command is None:
+            break
+        expected = command
+        Database.stadiumTotalGoals(1)
+        results.put(("ready", None))
+        deadline = time.time() + timeout
+        seen = Database.stadiumTotalGoals(1)
+        while seen != expected and time.time() < deadline:
+            time.sleep(0.0005)
+            seen = Database.stadiumTotalGoals(1)
+        results.put(("seen", time.time() if seen == expected else None))
+    results.put(("stats", (Cache.cacheStats(), Notify.notificationStats())))
+
+
+def main(workers: int, rounds: int, notifications: bool, timeout: float = 2.0):
+    Database.dropTables()
+    Database.createTables()
+    Database.addTeams([1, 2])
+    Database.addStadium(Stadium(1, 50000, 1))
+    Database.addPlayer(Player(1, 1, 25, 180, "Left"))
+    if notifications:
+        Notify.configureNotifications(listen=False)
+    context = multiprocessing.get_context("spawn")
+    commands = [context.Queue() for _ in range(workers)]
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(commands[w], results, notifications, timeout))
+                 for w in range(workers)]
+    for process in processes:
+        process.start()
+    delays = []
+    stale = 0
+    for r in range(1, rounds + 1):
+        Database.addMatch(Match(r, "Domestic", 1, 2))
+        Database.matchInStadium(Match(r), Stadium(1), 40000)
+        for queue in commands:
+            queue.put(r)
+        for _ in range(workers):
+            results.get()
+        written = time.time()
+        Database.playerScoredInMatch(Match(r), Player(1), 1)
+        for _ in range(workers):
+            kind, seen = results.get()
+            if seen is None:
+                stale += 1
+            else:
+                delays.append(max(seen - written, 0.0))
+    for queue in commands:
+        queue.put(None)
+    for _ in range(workers):
+        kind, (cacheStats, notifyStats) = results.get()
+        print("worker cache", cacheStats, "notifications", notifyStats)
+    for process in processes:
+        process.join()
+    print("workers={} rounds={} notifications={} stale after {:.1f}s: {}".format(
+        workers, rounds, "on" if notifications else "off", timeout, stale))
+    if len(delays) > 0:
+        print(formatSummary("write to worker invalidation", summarize(delays)))
+    Notify.disableNotifications()
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    arguments = [a for a in sys.argv[1:] if not a.startswith("--")]
+    main(int(arguments[0]) if len(arguments) > 0 else 4, int(arguments[1]) if len(arguments) > 1 else 50,
+         "--without-notifications" not in sys.argv)
@@ -0,0 +1,376 @@
+# conformance of the in-memory engine (MemoryDatabase.py) to Database.py on Postgres: every step is run on
+# both, one after the other, and what they return has to be the same, ReturnValues, entities, numbers and
+# lists alike, as have the exceptions they raise and whether they print. the parameters are the types of
+# the Database.py signatures, ints (out of range among them), strs and None. the steps are
+#   - a script of edge cases: NULLs, ids out of range, duplicates within one batch, cascades, units of
+#     work with and without savepoints, a block that raises, calls without tables,
+#   - a seeded random sequence of writes and reads over a few ids, with odd values among them, and every
+#     --every steps a snapshot of what every read function gives for every id,
+#   - a synthetic league loaded through the bulk functions, and a snapshot of it,
+# after which the reads are timed on both to compare them.
+# exits with status 1 when the backends disagreed anywhere, printing where.
+# run from the project root:
+#   python -m benchmark.conformance [--operations 2000] [--every 100] [--seed 1] [--scale 1] [--iterations 200]
+import argparse
+import contextlib
+import io
+import random
+import sys
+import time
+from decimal import Decimal
+import Database
+import MemoryDatabase
+from Business.Dashboard import Dashboard
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Utility.ReturnValue import ReturnValue
+from benchmark.league import League
+from benchmark.timing import measure, summarize, formatSummary
+
+BACKENDS = (Database, MemoryDatabase)
+# ids of the random sequence, few so that the calls keep running into each other's rows
+TEAMS, MATCHES, PLAYERS, STADIUMS = 6, 12, 15, 6
+# what an id or a number is now and then instead of one in range
+ODD = [None, 0, -1, 2 ** 31, -2 ** 31 - 1]
+
+
+# plain data to compare the results of the two backends by
+def normalize(result):
+    if isinstance(result, ReturnValue):
+        return result.name
+    if isinstance(result, Match):
+        return "Match", result.getMatchID(), result.getCompetition(), result.getHomeTeamID(), result.getAwayTeamID()
+    if isinstance(result, Player):
+        return ("Player", result.getPlayerID(), result.getTeamID(), result.getAge(), result.getHeight(),
+                result.getFoot())
+    if isinstance(result, Stadium):
+        return "Stadium", result.getStadiumID(), result.getCapacity(), result.getBelongsTo()
+    if isinstance(result, Dashboard):
+        return ("Dashboard", normalize(result.getActiveTallTeams()), normalize(result.getActiveTallRichTeams()),
+                normalize(result.getPopularTeams()), normalize(result.getMostAttractiveStadiums()),
+                normalize(result.getStadiumAttendance()), normalize(result.getStadiumGoals()))
+    if isinstance(result, Decimal):
+        return "Decimal", str(result)
+    if isinstance(result, (list, tuple)):
+        return [normalize(item) for item in result]
+    if isinstance(result, dict):
+        return sorted(((repr(key), normalize(value)) for key, value in result.items()))
+    if result is None or isinstance(result, (bool, int, float, str)):
+        return type(result).__name__, result
+    raise TypeError("cannot compare a {}".format(type(result).__name__))
+
+
+# fn(db) on one backend as (what it returned or raised, whether it printed)
+def outcome(fn, db) -> tuple:
+    printed = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(printed):
+            result = normalize(fn(db))
+    except Exception as e:
+        result = "raised " + type(e).__name__
+    return result, printed.getvalue() != ""
+
+
+class Checker:
+    def __init__(self):
+        self.steps = 0
+        self.mismatches = []
+
+    # runs fn on both backends, the name and arguments are what a mismatch is reported as
+    def check(self, name: str, fn, *args):
+        self.steps += 1
+        expected, actual = (outcome(lambda db: fn(db, *args), db) for db in BACKENDS)
+        if expected != actual:
+            self.mismatches.append((self.steps, name, args, expected, actual))
+            print("step {} {}{}\n  postgres: {}\n  memory:   {}".format(self.steps, name, args, expected, actual))
+
+
+def call(name: str):
+    return lambda db, *args: getattr(db, name)(*args)
+
+
+# the calls of steps in one unit of work, raising at the end of the block when raises is set
+def unitOfWork(db, savepoints: bool, steps: list, raises: bool) -> list:
+    results = []
+    try:
+        with db.transaction(savepoints) as unit:
+            for fn, args in steps:
+                results.append(outcome(lambda backend: fn(backend, *args), db))
+            if raises:
+                raise KeyError("raised in the block")
+    except KeyError:
+        results.append("block raised")
+    results.append(("failed", unit.failed, "committed", unit.committed))
+    return results
+
+
+# what every read gives for the given ids, compared as one step each
+def snapshot(checker: Checker, teams: list, matches: list, players: list, stadiums: list, pairs: list):
+    checker.check("getMatchProfiles", call("getMatchProfiles"), matches)
+    checker.check("getPlayerProfiles", call("getPlayerProfiles"), players)
+    checker.check("getStadiumProfiles", call("getStadiumProfiles"), stadiums)
+    checker.check("stadiums", lambda db: [(db.stadiumTotalGoals(s), db.averageAttendanceInStadium(s)) for s in stadiums])
+    checker.check("mostGoalsForTeams", call("mostGoalsForTeams"), teams, None)
+    checker.check("getClosePlayers", lambda db: [db.getClosePlayers(p) for p in players])
+    checker.check("playerIsWinner", lambda db: [db.playerIsWinner(p, m) for p, m in pairs])
+    for name in ("getActiveTallTeams", "getActiveTallRichTeams", "popularTeams", "getMostAttractiveStadiums",
+                 "checkStadiumStats"):
+        checker.check(name, call(name))
+    checker.check("iterMostAttractiveStadiums", lambda db: list(db.iterMostAttractiveStadiums()))
+    checker.check("getDashboard", call("getDashboard"), stadiums)
+
+
+def smallSnapshot(checker: Checker):
+    snapshot(checker, list(range(1, TEAMS + 1)), list(range(1, MATCHES + 1)), list(range(1, PLAYERS + 1)),
+             list(range(1, STADIUMS + 1)), [(p, m) for p in range(1, PLAYERS + 1) for m in range(1, MATCHES + 1)])
+
+
+def reset(checker: Checker):
+    checker.check("dropTables", call("dropTables"))
+    checker.check("createTables", call("createTables"))
+
+
+def script(checker: Checker):
+    check = checker.check
+    # without tables
+    check("dropTables", call("dropTables"))
+    check("clearTables", call("clearTables"))
+    check("addTeam", call("addTeam"), 1)
+    check("addTeams", call("addTeams"), [1, 2])
+    check("deleteMatch", lambda db: db.deleteMatch(Match(1, "Domestic", 1, 2)))
+    check("playersScoredInMatches", lambda db: db.playersScoredInMatches([(Match(1), Player(1), 1)]))
+    check("playerDidntScoreInMatch", lambda db: db.playerDidntScoreInMatch(Match(1), Player(1)))
+    check("averageAttendanceInStadium", call("averageAttendanceInStadium"), 1)
+    check("stadiumTotalGoals", call("stadiumTotalGoals"), 1)
+    check("getActiveTallTeams", call("getActiveTallTeams"))
+    check("getMostAttractiveStadiums", call("getMostAttractiveStadiums"))
+    check("getPlayerProfile", call("getPlayerProfile"), 1)
+    check("getDashboard", call("getDashboard"), [1])
+    check("createTables", call("createTables"))
+    check("createTables", call("createTables"))
+    # bad values
+    for value in ODD + [2 ** 31 - 1, 3000000000]:
+        check("addTeam", call("addTeam"), value)
+    check("addTeams", call("addTeams"), [20, 21, 20, None, 22, -3, 2 ** 31])
+    for match in [Match(1, "Domestic", 1, 2), Match(1, "Domestic", 1, 2), Match(2, "Other", 1, 2),
+                  Match(3, "International", 1, 1), Match(4, "Domestic", 1, 99), Match(5, None, 1, 2),
+                  Match(6, "International", 2, 2 ** 31), Match(7, "", 1, 2)]:
+        check("addMatch", call("addMatch"), match)
+    check("addMatch", call("addMatch"), None)
+    for player in [Player(1, 1, 25, 195, "Left"), Player(2, 1, 25, 191, "Right"), Player(3, 2, 25, 180, "Both"),
+                   Player(4, 99, 25, 180, "Left"), Player(5, 2, None, 180, "Left"), Player(6, 2, 20, 0, "Left"),
+                   Player(7, 2, 30, 200, "Right"), Player(1, 2, 30, 200, "Right")]:
+        check("addPlayer", call("addPlayer"), player)
+    for stadium in [Stadium(1, 60000, 1), Stadium(2, 30000, None), Stadium(3, 30000, 1), Stadium(4, 30000, 99),
+                    Stadium(5, 0, None), Stadium(6, None, 2), Stadium(7, 56000, 2)]:
+        check("addStadium", call("addStadium"), stadium)
+    check("addMatches", call("addMatches"), [Match(8, "Domestic", 2, 1), Match(8, "Domestic", 2, 1),
+                                              Match(9, "International", 1, 2)])
+    check("addPlayers", call("addPlayers"), [Player(8, 1, 20, 170, "Left"), Player(9, 1, 20, 199, "Right")])
+    check("addStadiums", call("addStadiums"), [Stadium(8, 1000, None), Stadium(9, 70000, 99)])
+    check("addTeams", call("addTeams"), [])
+    # scores and appearances, NULLs and duplicates within a batch among them
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(1), 2))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(1), 2))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(2), 0))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(99), 1))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(None), None))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(1), Player(2), 2 ** 31))
+    check("playerScoredInMatch", lambda db: db.playerScoredInMatch(Match(-1), Player(2), 1))
+    check("playersScoredInMatches", lambda db: db.playersScoredInMatches(
+        [(Match(8), Player(1), 1), (Match(8), Player(1), 2), (Match(8), Player(2), -1), (Match(8), Player(99), 1),
+         (Match(None), Player(7), 1), (Match(8), Player(7), None), (Match(8), Player(2 ** 31), 1), (Match(9), Player(9), 3)]))
+    check("playersScoredInMatches", lambda db: db.playersScoredInMatches([(Match(9), Player(2), 2 ** 31)]))
+    check("playersScoredInMatches", lambda db: db.playersScoredInMatches([]))
+    check("matchInStadium", lambda db: db.matchInStadium(Match(1), Stadium(1), 45000))
+    check("matchInStadium", lambda db: db.matchInStadium(Match(1), Stadium(2), 45000))
+    check("matchInStadium", lambda db: db.matchInStadium(Match(2), Stadium(1), 45000))
+    check("matchInStadium", lambda db: db.matchInStadium(Match(9), Stadium(1), 0))
+    check("matchInStadium", lambda db: db.matchInStadium(Match(9), Stadium(None), None))
+    check("matchesInStadiums", lambda db: db.matchesInStadiums(
+        [(Match(8), Stadium(1), 45001), (Match(8), Stadium(7), 45001), (Match(None), Stadium(1), 1),
+         (Match(9), Stadium(1), 2), (Match(99), Stadium(1), 2)]))
+    smallSnapshot(checker)
+    check("averageAttendanceInStadium", call("averageAttendanceInStadium"), 2 ** 31)
+    check("stadiumTotalGoals", call("stadiumTotalGoals"), -1)
+    check("playerIsWinner", call("playerIsWinner"), 2 ** 31, 1)
+    check("mostGoalsForTeam", call("mostGoalsForTeam"), 2 ** 31)
+    check("getClosePlayers", call("getClosePlayers"), 2 ** 31)
+    for teams, k in [([1, 2 ** 31], 5), ([-1], 5), ([None], 5), ([1, None], None), ([1, 1, 2], 1), ([1], -1),
+                     ([], -1), ([1], 2 ** 63), ([1], 2 ** 31)]:
+        check("mostGoalsForTeams", call("mostGoalsForTeams"), teams, k)
+    for stadiums in [[2 ** 31], [None], [-1], [1, 1, None], []]:
+        check("getDashboard", call("getDashboard"), stadiums)
+    check("getPlayerProfiles", call("getPlayerProfiles"), [1, None, 2 ** 31, 2, 2])
+    check("getPlayerProfile", call("getPlayerProfile"), 2 ** 31)
+    check("getMatchProfile", call("getMatchProfile"), None)
+    # units of work: a failing call undoes the unit without savepoints, only itself with them
+    for savepoints in (False, True):
+        for raises in (False, True):
+            check("transaction", unitOfWork, savepoints, [
+                (call("addTeam"), (30,)), (call("addTeam"), (30,)), (call("addTeam"), (31,)),
+                (call("addTeams"), ([32, 32],)), (call("getActiveTallTeams"), ()),
+                (lambda db: db.playersScoredInMatches([(Match(1), Player(7), 1), (Match(1), Player(None), None)]), ()),
+                (call("stadiumTotalGoals"), (1,)), (call("averageAttendanceInStadium"), (1,))], raises)
+            check("teams", lambda db: [db.addTeam(t) for t in (30, 31, 32)])
+            check("clearTables", call("clearTables"))
+            check("addTeams", call("addTeams"), [1, 2])
+    # cascades, and the trigger that fails on a player's NULL goals
+    check("addMatches", call("addMatches"), [Match(1, "Domestic", 1, 2), Match(2, "International", 2, 1)])
+    check("addPlayers", call("addPlayers"), [Player(1, 1, 25, 195, "Left"), Player(2, 2, 25, 195, "Left"),
+                                              Player(3, 1, 25, 170, "Left")])
+    check("addStadiums", call("addStadiums"), [Stadium(1, 60000, 1), Stadium(2, 60000, 2)])
+    check("playersScoredInMatches", lambda db: db.playersScoredInMatches(
+        [(Match(1), Player(1), 2), (Match(1), Player(2), 1), (Match(2), Player(1), 1), (Match(2), Player(2), 3),
+         (Match(1), Player(3), None), (Match(None), Player(3), None)]))
+    check("matchesInStadiums", lambda db: db.matchesInStadiums([(Match(1), Stadium(1), 50000),
+                                                                (Match(2), Stadium(2), 41000)]))
+    smallSnapshot(checker)
+    check("deletePlayer", lambda db: db.deletePlayer(Player(3, 1)))
+    check("deletePlayer", lambda db: db.deletePlayer(Player(3, 2)))
+    check("deleteMatch", lambda db: db.deleteMatch(db.getMatchProfile(1)))
+    smallSnapshot(checker)
+    check("deleteStadium", lambda db: db.deleteStadium(Stadium(2, 60000, 2)))
+    check("deleteStadium", lambda db: db.deleteStadium(Stadium(1, 60000, None)))
+    check("deletePlayer", lambda db: db.deletePlayer(Player(1, 1)))
+    check("matchNotInStadium", lambda db: db.matchNotInStadium(Match(2), Stadium(2)))
+    check("playerDidntScoreInMatch", lambda db: db.playerDidntScoreInMatch(Match(2), Player(2)))
+    check("playerDidntScoreInMatch", lambda db: db.playerDidntScoreInMatch(Match(2), Player(None)))
+    check("matchNotInStadium", lambda db: db.matchNotInStadium(Match(2 ** 31), Stadium(2)))
+    smallSnapshot(checker)
+
+
+# an id in 1..highest, or now and then an odd value
+def anId(rng: random.Random, highest: int):
+    return rng.choice(ODD) if rng.random() < 0.05 else rng.randint(1, highest)
+
+
+# (name, fn, arguments) of a random call, units of work only at the top level
+def randomStep(rng: random.Random, top: bool = True) -> tuple:
+    team, match, player, stadium = (lambda: anId(rng, TEAMS)), (lambda: anId(rng, MATCHES)), \
+                                   (lambda: anId(rng, PLAYERS)), (lambda: anId(rng, STADIUMS))
+    goals = lambda: rng.choice([None, 0, 1, 2, 3, 3]) if rng.random() < 0.2 else rng.randint(1, 3)
+    attendance = lambda: rng.choice([None, 0, 40000, 40001]) if rng.random() < 0.2 else rng.randint(30000, 60000)
+    newMatch = lambda: Match(match(), rng.choice(["Domestic", "International", "International", "Cup", None]),
+                             team(), team())
+    newPlayer = lambda: Player(player(), team(), rng.randint(17, 40), rng.choice([170, 185, 191, 200]),
+                               rng.choice(["Left", "Right", "Right", None]))
+    newStadium = lambda: Stadium(stadium(), rng.choice([30000, 55000, 56000, 70000, 0]),
+                                 rng.choice([None, team(), team()]))
+    steps = [
+        (8, lambda: ("addTeam", call("addTeam"), team())),
+        (2, lambda: ("addTeams", call("addTeams"), [team() for _ in range(rng.randint(0, 3))])),
+        (8, lambda: ("addMatch", call("addMatch"), newMatch())),
+        (2, lambda: ("addMatches", call("addMatches"), [newMatch() for _ in range(rng.randint(1, 3))])),
+        (8, lambda: ("addPlayer", call("addPlayer"), newPlayer())),
+        (2, lambda: ("addPlayers", call("addPlayers"), [newPlayer() for _ in range(rng.randint(1, 3))])),
+        (5, lambda: ("addStadium", call("addStadium"), newStadium())),
+        (1, lambda: ("addStadiums", call("addStadiums"), [newStadium() for _ in range(rng.randint(1, 3))])),
+        (14, lambda: ("playerScoredInMatch", call("playerScoredInMatch"), Match(match()), Player(player()), goals())),
+        (4, lambda: ("playersScoredInMatches", call("playersScoredInMatches"),
+                     [(Match(match()), Player(player()), goals()) for _ in range(rng.randint(1, 5))])),
+        (8, lambda: ("matchInStadium", call("matchInStadium"), Match(match()), Stadium(stadium()), attendance())),
+        (3, lambda: ("matchesInStadiums", call("matchesInStadiums"),
+                     [(Match(match()), Stadium(stadium()), attendance()) for _ in range(rng.randint(1, 4))])),
+        (3, lambda: ("deleteMatch", lambda db, m: db.deleteMatch(db.getMatchProfile(m)), match())),
+        (3, lambda: ("deletePlayer", lambda db, p: db.deletePlayer(db.getPlayerProfile(p)), player())),
+        (2, lambda: ("deleteStadium", lambda db, s: db.deleteStadium(db.getStadiumProfile(s)), stadium())),
+        (4, lambda: ("playerDidntScoreInMatch", call("playerDidntScoreInMatch"), Match(match()), Player(player()))),
+        (3, lambda: ("matchNotInStadium", call("matchNotInStadium"), Match(match()), Stadium(stadium()))),
+        (2, lambda: ("getPlayerProfile", call("getPlayerProfile"), player())),
+        (2, lambda: ("averageAttendanceInStadium", call("averageAttendanceInStadium"), stadium())),
+        (2, lambda: ("playerIsWinner", call("playerIsWinner"), player(), match())),
+        (2, lambda: ("mostGoalsForTeam", call("mostGoalsForTeam"), team())),
+        (2, lambda: ("mostGoalsForTeams", call("mostGoalsForTeams"), [team() for _ in range(3)], rng.choice([1, 5, None]))),
+        (2, lambda: ("getClosePlayers", call("getClosePlayers"), player())),
+        (2, lambda: ("getDashboard", call("getDashboard"), [stadium() for _ in range(3)])),
+        (3 if top else 0, lambda: ("transaction", unitOfWork, rng.random() < 0.5,
+                                   [randomStep(rng, False)[1:] for _ in range(rng.randint(1, 4))], rng.random() < 0.2)),
+        (1, lambda: ("clearTables", call("clearTables")))]
+    name, fn, *args = rng.choices([make for _, make in steps], [weight for weight, _ in steps])[0]()
+    return name, fn, tuple(args)
+
+
+def randomSequence(checker: Checker, operations: int, every: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(operations):
+        name, fn, args = randomStep(rng)
+        checker.check(name, fn, *args)
+        if (i + 1) % every == 0:
+            smallSnapshot(checker)
+
+
+# the league's rows through the bulk functions, timed
+def loadLeague(db, league: League) -> float:
+    rows = league.rows()
+    start = time.perf_counter()
+    db.addTeams([t for t, in rows["Team"][1]])
+    db.addPlayers([Player(*row) for row in rows["Player"][1]])
+    db.addStadiums([Stadium(s, capacity, belongTo) for s, belongTo, capacity in rows["Stadium"][1]])
+    db.addMatches([Match(*row) for row in rows["Match"][1]])
+    db.matchesInStadiums([(Match(m), Stadium(s), attendance) for s, m, attendance in rows["MatchInStadium"][1]])
+    db.playersScoredInMatches([(Match(m), Player(p), goals) for p, m, goals in rows["PlayerScores"][1]])
+    return time.perf_counter() - start
+
+
+def timings(league: League, iterations: int, seed: int) -> list:
+    rng = random.Random(seed)
+    scores = league.rows()["PlayerScores"][1]
+    player = lambda i: rng.randint(1, league.players)
+    stadium = lambda i: rng.randint(1, league.stadiums)
+    calls = [("getPlayerProfile", lambda db: lambda i: db.getPlayerProfile(player(i))),
+             ("getPlayerProfiles", lambda db: lambda i: db.getPlayerProfiles([player(i) for _ in range(20)])),
+             ("averageAttendanceInStadium", lambda db: lambda i: db.averageAttendanceInStadium(stadium(i))),
+             ("playerIsWinner", lambda db: lambda i: db.playerIsWinner(*rng.choice(scores)[:2])),
+             ("mostGoalsForTeam", lambda db: lambda i: db.mostGoalsForTeam(rng.randint(1, league.teams))),
+             ("getClosePlayers", lambda db: lambda i: db.getClosePlayers(player(i))),
+             ("popularTeams", lambda db: lambda i: db.popularTeams()),
+             ("getMostAttractiveStadiums", lambda db: lambda i: db.getMostAttractiveStadiums()),
+             ("getDashboard", lambda db: lambda i: db.getDashboard([stadium(i) for _ in range(10)])),
+             ("playerScoredInMatch", lambda db: lambda i: db.playerScoredInMatch(
+                 Match(rng.randint(1, league.matches)), Player(player(i)), 1))]
+    results = []
+    for name, make in calls:
+        summaries = [summarize(measure(make(db), iterations)) for db in BACKENDS]
+        results.append((name, summaries))
+    return results
+
+
+def main(arguments) -> int:
+    checker = Checker()
+    script(checker)
+    reset(checker)
+    randomSequence(checker, arguments.operations, arguments.every, arguments.seed)
+    print("{} steps compared, {} mismatches".format(checker.steps, len(checker.mismatches)))
+    league = League(arguments.scale)
+    loads = []
+    for db in BACKENDS:
+        db.dropTables()
+        db.createTables()
+        loads.append(loadLeague(db, league))
+    print("league of scale {} loaded through the bulk functions in {:.3f}s on postgres, {:.3f}s in memory".format(
+        arguments.scale, *loads))
+    rows = league.rows()
+    scores = rows["PlayerScores"][1]
+    snapshot(checker, list(range(1, league.teams + 1)), list(range(1, league.matches + 1)),
+             list(range(1, league.players + 1)), list(range(1, league.stadiums + 1)),
+             [(p, m) for p, m, _ in scores[::10]] + [(p, m + 1) for p, m, _ in scores[::50]])
+    for name, (postgres, memory) in timings(league, arguments.iterations, arguments.seed):
+        print(formatSummary(name + " postgres", postgres))
+        print(formatSummary(name + " memory", memory))
+        print("  {:.0f} times faster".format(postgres["mean_us"] / memory["mean_us"] if memory["mean_us"] > 0 else 0))
+    for db in BACKENDS:
+        db.dropTables()
+    print("{} steps compared in all, {} mismatches".format(checker.steps, len(checker.mismatches)))
+    return 1 if len(checker.mismatches) > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmark.conformance")
+    parser.add_argument("--operations", type=int, default=2000, help="steps of the random sequence")
+    parser.add_argument("--every", type=int, default=100, help="random steps between snapshots")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--scale", type=float, default=1, help="scale factor of the league timed")
+    parser.add_argument("--iterations", type=int, default=200, help="timed calls per function and backend")
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,73 @@
+# the stats page built from the separate functions, one round trip each, against getDashboard's single
+# statement, with the read cache off. while a writer keeps recording and removing goals, a page is counted
+# inconsistent when the stadiums' goal totals disagree with the order getMostAttractiveStadiums gave them.
+# run from the project root: python -m benchmark.dashboard [stadiumsOnPage] [iterations]
+import random
+import sys
+import threading
+import Database
+from Business.Match import Match
+from Business.Player import Player
+from benchmark.league import League, SEED
+from benchmark.timing import measure, summarize, formatSummary
+
+# 400 players, 100 stadiums and 2000 matches with 3 scorers each, every match played in a stadium
+LEAGUE = League(1, SEED, playersPerTeam=20, matches=2000, stadiums=100, scorersPerMatch=3, playedInStadium=1.0)
+
+
+def separate(stadiumIDs: list) -> tuple:
+    tallTeams = Database.getActiveTallTeams()
+    tallRichTeams = Database.getActiveTallRichTeams()
+    popular = Database.popularTeams()
+    attractive = Database.getMostAttractiveStadiums()
+    attendance = {s: Database.averageAttendanceInStadium(s) for s in stadiumIDs}
+    goals = {s: Database.stadiumTotalGoals(s) for s in stadiumIDs}
+    return tallTeams, tallRichTeams, popular, attractive, attendance, goals
+
+
+def combined(stadiumIDs: list) -> tuple:
+    dashboard = Database.getDashboard(stadiumIDs)
+    return dashboard.getActiveTallTeams(), dashboard.getActiveTallRichTeams(), dashboard.getPopularTeams(), \
+        dashboard.getMostAttractiveStadiums(), dashboard.getStadiumAttendance(), dashboard.getStadiumGoals()
+
+
+# the stadiums on the page, in getMostAttractiveStadiums order, must have non-increasing goal totals
+def consistent(page: tuple) -> bool:
+    attractive, goals = page[3], page[5]
+    totals = [goals[s] for s in attractive if s in goals]
+    return all(a >= b for a, b in zip(totals, totals[1:]))
+
+
+def main(stadiumsOnPage: int, iterations: int):
+    Database.dropTables()
+    Database.createTables()
+    LEAGUE.load()
+    stadiumIDs = list(range(1, stadiumsOnPage + 1))
+    if separate(stadiumIDs) != combined(stadiumIDs):
+        print("getDashboard disagrees with the separate functions")
+    print(formatSummary("separate functions", summarize(measure(lambda i: separate(stadiumIDs), iterations))))
+    print(formatSummary("getDashboard", summarize(measure(lambda i: combined(stadiumIDs), iterations))))
+    stop = threading.Event()
+
+    def writer():
+        rng = random.Random(7)
+        while not stop.is_set():
+            match, player = Match(rng.randint(1, LEAGUE.matches)), Player(rng.randint(1, LEAGUE.players))
+            if Database.playerScoredInMatch(match, player, rng.randint(5, 20)) == Database.ReturnValue.OK:
+                Database.playerDidntScoreInMatch(match, player)
+
+    thread = threading.Thread(target=writer)
+    thread.start()
+    try:
+        for name, page in (("separate functions", separate), ("getDashboard", combined)):
+            inconsistent = sum(not consistent(page(stadiumIDs)) for _ in range(iterations))
+            print("{:<32} {} of {} pages inconsistent under writes".format(name, inconsistent, iterations))
+    finally:
+        stop.set()
+        thread.join()
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 20,
+         int(sys.argv[2]) if len(sys.argv) > 2 else 200)
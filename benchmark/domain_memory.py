@@ -0,0 +1,85 @@
+# memory and build time of 1M Player/Match/Stadium objects: the slotted library classes against the
+# dict-backed classes they replaced, and bulk *FromResultSet conversion against building each object
+# by positional indexing into result.rows. needs no database.
+# run from the project root: python -m benchmark.domain_memory [objects]
+import sys
+import time
+import tracemalloc
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Utility.DBConnector import ResultSet
+import Database
+
+
+class DictPlayer:
+    def __init__(self, playerID=None, teamID=None, age=None, height=None, foot=None):
+        self.__playerID = playerID
+        self.__teamID = teamID
+        self.__age = age
+        self.__height = height
+        self.__foot = foot
+
+
+class DictMatch:
+    def __init__(self, matchID=None, competition=None, homeTeamID=None, awayTeamID=None):
+        self.__matchID = matchID
+        self.__competition = competition
+        self.__homeTeamID = homeTeamID
+        self.__awayTeamID = awayTeamID
+
+
+class DictStadium:
+    def __init__(self, stadiumID=None, capacity=None, belongsTo=None):
+        self.__stadiumID = stadiumID
+        self.__capacity = capacity
+        self.__belongsTo = belongsTo
+
+
+class Column:
+    def __init__(self, name):
+        self.name = name
+
+
+def resultSet(columns: list, rows: list) -> ResultSet:
+    return ResultSet([Column(c) for c in columns], rows)
+
+
+# bytes allocated by the objects (and the list holding them), the rows they are built from are allocated
+# beforehand. timed separately since tracing slows every allocation down
+def build(fn, rows: list):
+    start = time.perf_counter()
+    objects = fn(rows)
+    elapsed = time.perf_counter() - start
+    del objects
+    tracemalloc.start()
+    objects = fn(rows)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return len(objects), size, elapsed
+
+
+def main(count: int):
+    players = resultSet(["player_id", "team_id", "age", "height", "preferred_foot"],
+                        [(i, i % 500, 18 + i % 20, 165 + i % 40, "Left" if i % 3 else "Right") for i in range(count)])
+    matches = resultSet(["match_id", "competition", "hometeam_id", "awayteam_id"],
+                        [(i, "Domestic" if i % 2 else "International", i % 500, (i + 1) % 500) for i in range(count)])
+    stadiums = resultSet(["stadium_id", "belong_to", "capacity"],
+                         [(i, i % 500, 20000 + i % 60000) for i in range(count)])
+    cases = [("Player dict per row", lambda rs: [DictPlayer(r[0], r[1], r[2], r[3], r[4]) for r in rs.rows], players),
+             ("Player slots per row", lambda rs: [Player(r[0], r[1], r[2], r[3], r[4]) for r in rs.rows], players),
+             ("Player slots bulk", Database.playersFromResultSet, players),
+             ("Match dict per row", lambda rs: [DictMatch(r[0], r[1], r[2], r[3]) for r in rs.rows], matches),
+             ("Match slots per row", lambda rs: [Match(r[0], r[1], r[2], r[3]) for r in rs.rows], matches),
+             ("Match slots bulk", Database.matchesFromResultSet, matches),
+             ("Stadium dict per row", lambda rs: [DictStadium(r[0], r[2], r[1]) for r in rs.rows], stadiums),
+             ("Stadium slots per row", lambda rs: [Stadium(r[0], r[2], r[1]) for r in rs.rows], stadiums),
+             ("Stadium slots bulk", Database.stadiumsFromResultSet, stadiums)]
+    for name, fn, rs in cases:
+        built, size, elapsed = build(fn, rs)
+        print("{:<24} objects={:<8} memory={:>8.1f}MB ({:>5.1f} bytes/object) time={:>8.1f}ms".format(
+            name, built, size / 2 ** 20, size / built, elapsed * 1e3))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
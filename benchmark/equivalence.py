@@ -0,0 +1,243 @@
+# checks the tables the triggers keep (TeamActivity, StadiumStats, PlayerGoals and CoScoring) against the
+# same numbers recomputed from the base tables, and the analytics functions that read them against the
+# queries they replaced, after every round of random writes on a small league: single and batch calls,
+# units of work rolled back, deletes with their cascades, and UPDATEs of scores, appearances, players and
+# matches that Database.py never makes itself. prints the differences of the first round that has any and
+# exits with status 1.
+# run from the project root: python -m benchmark.equivalence [rounds] [--seed N]
+import argparse
+import random
+import sys
+import Database
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Utility.ReturnValue import ReturnValue
+from benchmark.league import League
+
+# every trigger-kept table as (its rows, the rows recomputed from the base tables). a team whose counts
+# went back to zero may keep its TeamActivity row or not, so rows of zeros are left out of both
+SUMMARIES = {
+    "TeamActivity": ("SELECT team_id, tall_players, matches FROM TeamActivity \
+                      WHERE tall_players != 0 OR matches != 0",
+                     "SELECT * FROM (SELECT T.id, \
+                                            (SELECT COUNT(*) FROM Player P WHERE P.team_id = T.id AND P.height > 190) AS t, \
+                                            (SELECT COUNT(*) FROM Match M WHERE T.id IN (M.homeTeam_id, M.awayTeam_id)) AS m \
+                                     FROM Team T) R \
+                      WHERE t != 0 OR m != 0"),
+    "StadiumStats": ("SELECT stadium_id, total_goals, attendance_sum, attendance_count FROM StadiumStats",
+                     "SELECT S.stadium_id, \
+                             COALESCE((SELECT SUM(P.goals) FROM PlayerScores P JOIN MatchInStadium M USING(match_id) \
+                                       WHERE M.stadium_id = S.stadium_id), 0), \
+                             COALESCE((SELECT SUM(attendance) FROM MatchInStadium M WHERE M.stadium_id = S.stadium_id), 0), \
+                             (SELECT COUNT(*) FROM MatchInStadium M WHERE M.stadium_id = S.stadium_id) \
+                      FROM Stadium S"),
+    "PlayerGoals": ("SELECT player_id, team_id, goals, matches FROM PlayerGoals",
+                    "SELECT P.player_id, P.team_id, COALESCE(SUM(S.goals), 0), COUNT(S.player_id) \
+                     FROM Player P LEFT OUTER JOIN PlayerScores S USING(player_id) \
+                     GROUP BY P.player_id, P.team_id"),
+    "CoScoring": ("SELECT player_id, other_id, shared FROM CoScoring",
+                  "SELECT A.player_id, B.player_id, COUNT(*) FROM PlayerScores A \
+                   JOIN PlayerScores B ON(A.match_id = B.match_id AND A.player_id != B.player_id) \
+                   GROUP BY A.player_id, B.player_id")}
+
+# the functions answered from those tables as (the table, the query they used to run with {0} for the
+# argument, the arguments to try). getMostAttractiveStadiums leaves out the None entry the old view made
+REPLACED = {
+    "getActiveTallTeams": ("TeamActivity",
+                           "SELECT team_id FROM Player P, Match M \
+                            WHERE (team_id = M.homeTeam_id OR team_id = M.awayTeam_id) AND P.height > 190 \
+                            GROUP BY team_id HAVING COUNT(height) >= 2 \
+                            ORDER BY team_id DESC LIMIT 5", None),
+    "getActiveTallRichTeams": ("TeamActivity",
+                               "SELECT team_id FROM Player P, Match M \
+                                WHERE (team_id = M.homeTeam_id OR team_id = M.awayTeam_id) AND P.height > 190 \
+                                AND team_id IN (SELECT belong_to FROM Stadium WHERE capacity > 55000) \
+                                GROUP BY team_id HAVING COUNT(height) >= 2 \
+                                ORDER BY team_id ASC LIMIT 5", None),
+    "stadiumTotalGoals": ("StadiumStats",
+                          "SELECT COALESCE(SUM(goals), 0) FROM PlayerScores \
+                           WHERE match_id IN (SELECT match_id FROM MatchInStadium WHERE stadium_id = {0})",
+                          "SELECT stadium_id FROM Stadium UNION ALL SELECT 0"),
+    "averageAttendanceInStadium": ("StadiumStats",
+                                   "SELECT COALESCE(AVG(attendance), 0) FROM MatchInStadium WHERE stadium_id = {0}",
+                                   "SELECT stadium_id FROM Stadium UNION ALL SELECT 0"),
+    "getMostAttractiveStadiums": ("StadiumStats",
+                                  "SELECT Stadium.stadium_id FROM Stadium \
+                                   LEFT OUTER JOIN MatchInStadium ON(Stadium.stadium_id = MatchInStadium.stadium_id) \
+                                   LEFT OUTER JOIN PlayerScores ON(PlayerScores.match_id = MatchInStadium.match_id) \
+                                   GROUP BY Stadium.stadium_id \
+                                   ORDER BY COALESCE(SUM(goals), 0) DESC, Stadium.stadium_id ASC", None),
+    "mostGoalsForTeam": ("PlayerGoals",
+                         "SELECT Player.player_id FROM Player \
+                          LEFT OUTER JOIN PlayerScores ON(Player.player_id = PlayerScores.player_id) \
+                          WHERE team_id = {0} GROUP BY Player.player_id \
+                          ORDER BY COALESCE(SUM(goals), 0) DESC, Player.player_id DESC LIMIT 5",
+                         "SELECT id FROM Team UNION ALL SELECT 0"),
+    "getClosePlayers": ("CoScoring",
+                        "SELECT AP.player_id FROM Player AP \
+                         LEFT OUTER JOIN PlayerScores S ON(AP.player_id = S.player_id) \
+                         WHERE AP.player_id != {0} \
+                         AND S.match_id IN (SELECT match_id FROM PlayerScores WHERE player_id = {0}) \
+                         GROUP BY AP.player_id \
+                         HAVING 2 * COUNT(S.match_id) >= (SELECT COUNT(match_id) FROM PlayerScores WHERE player_id = {0}) \
+                         ORDER BY AP.player_id ASC LIMIT 10",
+                        "SELECT player_id FROM Player UNION ALL SELECT 0")}
+
+
+def _rows(conn, query: str) -> list:
+    _, result = conn.execute(query)
+    return result.rows
+
+
+# (rows recomputed but not kept, rows kept but not recomputed) of one of SUMMARIES
+def tableDifferences(table: str) -> (list, list):
+    kept, recomputed = SUMMARIES[table]
+    conn = Connector.DBConnector()
+    try:
+        kept, recomputed = set(_rows(conn, kept)), set(_rows(conn, recomputed))
+    finally:
+        conn.close()
+    return sorted(recomputed - kept), sorted(kept - recomputed)
+
+
+# (argument, what the function returned, what the replaced query returns) for every argument they disagree on
+def functionDifferences(name: str) -> list:
+    _, query, arguments = REPLACED[name]
+    conn = Connector.DBConnector()
+    try:
+        calls = [((), query)] if arguments is None else \
+            [((row[0],), query.format(row[0])) for row in _rows(conn, arguments)]
+        expected = [(args, [row[0] for row in _rows(conn, call)]) for args, call in calls]
+    finally:
+        conn.close()
+    found = []
+    for args, rows in expected:
+        got = getattr(Database, name)(*args)
+        if name in ("stadiumTotalGoals", "averageAttendanceInStadium"):
+            rows = rows[0]
+        if got != rows:
+            found.append((args, got, rows))
+    return found
+
+
+# every difference of the tables and of the functions reading them, as lines to print
+def differences(tables=None) -> list:
+    lines = []
+    for table in tables or SUMMARIES:
+        missing, extra = tableDifferences(table)
+        if missing or extra:
+            lines.append("{}: missing {}, extra {}".format(table, missing, extra))
+        for name in [name for name, replaced in REPLACED.items() if replaced[0] == table]:
+            for args, got, expected in functionDifferences(name):
+                lines.append("{}{}: {} instead of {}".format(name, args, got, expected))
+    return lines
+
+
+# a small league loaded with COPY, then rounds of writes chosen by seed
+class Workload:
+    def __init__(self, seed: int = 1):
+        self.rng = random.Random(seed)
+        self.league = League(1, seed, teams=12, playersPerTeam=10, matches=80, stadiums=12, scorersPerMatch=4)
+        self.matches = list(range(1, self.league.matches + 1))
+        self.players = list(range(1, self.league.players + 1))
+        self.stadiums = list(range(1, self.league.stadiums + 1))
+        self.nextMatch, self.nextPlayer = self.league.matches + 1, self.league.players + 1
+
+    def load(self):
+        Database.dropTables()
+        Database.createTables()
+        self.league.load()
+
+    def round(self, number: int):
+        rng = self.rng
+        match = lambda: Match(rng.choice(self.matches))
+        player = lambda: Player(rng.choice(self.players))
+        stadium = lambda: Stadium(rng.choice(self.stadiums))
+        Database.playersScoredInMatches([(match(), player(), rng.randint(1, 3)) for _ in range(20)])
+        Database.matchesInStadiums([(match(), stadium(), rng.randint(1000, 60000)) for _ in range(6)])
+        for _ in range(4):
+            Database.playerScoredInMatch(match(), player(), rng.randint(1, 3))
+            Database.playerDidntScoreInMatch(match(), player())
+            Database.matchInStadium(match(), stadium(), rng.randint(1000, 60000))
+            Database.matchNotInStadium(match(), stadium())
+        self.add()
+        matches, players = list(self.matches), list(self.players)
+        try:
+            with Database.transaction():
+                Database.playerScoredInMatch(match(), player(), 3)
+                Database.matchInStadium(match(), stadium(), 3000)
+                self.add()
+                raise RuntimeError("rolled back")
+        except RuntimeError:
+            self.matches, self.players = matches, players
+        if number % 4 == 0:
+            self.delete()
+        if number % 3 == 0:
+            self.update(number)
+
+    # a new match and a new player, tall or not
+    def add(self):
+        rng = self.rng
+        home, away = rng.sample(range(1, self.league.teams + 1), 2)
+        if Database.addMatch(Match(self.nextMatch, "Domestic", home, away)) == ReturnValue.OK:
+            self.matches.append(self.nextMatch)
+        if Database.addPlayer(Player(self.nextPlayer, home, 25, rng.choice([180, 195]), "Left")) == ReturnValue.OK:
+            self.players.append(self.nextPlayer)
+        self.nextMatch, self.nextPlayer = self.nextMatch + 1, self.nextPlayer + 1
+
+    # a match, a player and a stadium go with everything cascading from them, the stadium comes back empty.
+    # the delete functions match every column, so they get the rows as they are now
+    def delete(self):
+        rng = self.rng
+        Database.deleteMatch(Database.getMatchProfile(self.matches.pop(rng.randrange(len(self.matches)))))
+        Database.deletePlayer(Database.getPlayerProfile(self.players.pop(rng.randrange(len(self.players)))))
+        stadium = Database.getStadiumProfile(rng.choice(self.stadiums))
+        if Database.deleteStadium(stadium) == ReturnValue.OK:
+            Database.addStadium(stadium)
+
+    # key and value updates straight on the tables, which go through the UPDATE triggers
+    def update(self, number: int):
+        rng = self.rng
+        k = number % 5
+        conn = Connector.DBConnector()
+        try:
+            conn.execute("UPDATE PlayerScores SET goals = goals + 1 WHERE player_id % 5 = {}".format(k))
+            conn.execute("UPDATE PlayerScores S SET match_id = {0} \
+                          WHERE (S.player_id, S.match_id) IN (SELECT player_id, MIN(match_id) FROM PlayerScores \
+                                                              WHERE player_id % 7 = {1} GROUP BY player_id) \
+                          AND NOT EXISTS(SELECT 1 FROM PlayerScores T WHERE T.player_id = S.player_id \
+                                         AND T.match_id = {0})".format(rng.choice(self.matches), k))
+            conn.execute("UPDATE MatchInStadium SET stadium_id = {} WHERE match_id % 6 = {}".format(
+                rng.choice(self.stadiums), k))
+            conn.execute("UPDATE Player SET height = 375 - height, team_id = {} WHERE player_id % 9 = {}".format(
+                rng.randint(1, self.league.teams), k))
+            conn.execute("UPDATE Match SET homeTeam_id = awayTeam_id, awayTeam_id = homeTeam_id \
+                          WHERE match_id % 4 = {}".format(k % 4))
+        finally:
+            conn.close()
+
+
+def main(rounds: int, seed: int) -> int:
+    workload = Workload(seed)
+    workload.load()
+    for number in range(1, rounds + 1):
+        workload.round(number)
+        found = differences()
+        if found:
+            print("round {}:".format(number))
+            for line in found:
+                print("  " + line)
+            return 1
+    print("{} rounds, the tables and the functions reading them agree with the base tables".format(rounds))
+    Database.dropTables()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("rounds", nargs="?", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=1)
+    options = parser.parse_args()
+    sys.exit(main(options.rounds, options.seed))
@@ -0,0 +1,52 @@
+# loads a league with millions of PlayerScores rows and times the analytics functions on it.
+# --without-indexes drops the secondary indexes createTables builds, to compare against.
+# run from the project root: python -m benchmark.index_scale [scores] [--without-indexes]
+import sys
+import Database
+import Utility.DBConnector as Connector
+from benchmark.league import League, SEED
+from benchmark.timing import measure, summarize, formatSummary
+
+SECONDARY_INDEXES = ["Match_homeTeam", "Match_awayTeam", "Player_team", "Player_tall_team", "Stadium_capacity",
+                     "PlayerScores_match", "MatchInStadium_stadium"]
+
+
+# about scores PlayerScores rows, 20 per match, every match played in the home team's stadium
+def league(scores: int) -> League:
+    teams = max(20, scores // 2000)
+    matches = max(teams, scores // 20)
+    return League(1, SEED, teams=teams, matches=matches, stadiums=teams, scorersPerMatch=scores // matches,
+                  playedInStadium=1.0, playedAtHome=1.0)
+
+
+def main(scores: int, withIndexes: bool, iterations: int = 200):
+    Database.dropTables()
+    Database.createTables()
+    if not withIndexes:
+        conn = Connector.DBConnector()
+        try:
+            conn.execute("; ".join("DROP INDEX " + index for index in SECONDARY_INDEXES))
+        finally:
+            conn.close()
+    loaded = league(scores)
+    counts = loaded.load()
+    teams, players, matches, stadiums = loaded.teams, loaded.players, loaded.matches, loaded.stadiums
+    print("teams={} players={} matches={} stadiums={} PlayerScores={} indexes={}".format(
+        teams, players, matches, stadiums, counts["PlayerScores"], "on" if withIndexes else "off"))
+    cases = [("stadiumTotalGoals", lambda i: Database.stadiumTotalGoals(i % stadiums + 1)),
+             ("averageAttendanceInStadium", lambda i: Database.averageAttendanceInStadium(i % stadiums + 1)),
+             ("playerIsWinner", lambda i: Database.playerIsWinner(i * 7 % players + 1, i % matches + 1)),
+             ("mostGoalsForTeam", lambda i: Database.mostGoalsForTeam(i % teams + 1)),
+             ("mostGoalsForTeams", lambda i: Database.mostGoalsForTeams(range(1, teams + 1))),
+             ("getClosePlayers", lambda i: Database.getClosePlayers(i * 13 % players + 1)),
+             ("getActiveTallTeams", lambda i: Database.getActiveTallTeams()),
+             ("getActiveTallRichTeams", lambda i: Database.getActiveTallRichTeams()),
+             ("popularTeams", lambda i: Database.popularTeams()),
+             ("getMostAttractiveStadiums", lambda i: Database.getMostAttractiveStadiums())]
+    for name, fn in cases:
+        print(formatSummary(name, summarize(measure(fn, iterations, warmup=3))))
+
+
+if __name__ == "__main__":
+    arguments = [a for a in sys.argv[1:] if not a.startswith("--")]
+    main(int(arguments[0]) if len(arguments) > 0 else 2000000, "--without-indexes" not in sys.argv)
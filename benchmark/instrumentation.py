@@ -0,0 +1,37 @@
+# what measuring every statement costs, the per-call latency of a few Database.py functions with no
+# instrument and with Utility.Metrics' QueryMetrics, and where the time of each went by phase.
+# run from the project root: python -m benchmark.instrumentation [iterations]
+import sys
+import Database
+import Utility.Metrics as Metrics
+from benchmark.league import League
+from benchmark.timing import measure, summarize, formatSummary
+
+
+def calls(league: League) -> list:
+    return [("getPlayerProfile", lambda i: Database.getPlayerProfile(i % league.players + 1)),
+            ("mostGoalsForTeam", lambda i: Database.mostGoalsForTeam(i % league.teams + 1)),
+            ("popularTeams", lambda i: Database.popularTeams()),
+            ("getDashboard", lambda i: Database.getDashboard([i % league.stadiums + 1]))]
+
+
+def main(iterations: int):
+    league = League()
+    Database.dropTables()
+    Database.createTables()
+    league.load()
+    for name, fn in calls(league):
+        print(formatSummary(name + " plain", summarize(measure(fn, iterations))))
+    Metrics.enableQueryMetrics(slowThreshold=None)
+    for name, fn in calls(league):
+        print(formatSummary(name + " measured", summarize(measure(fn, iterations))))
+    for function, statements in Metrics.queryMetrics().stats().items():
+        for statement, entry in statements.items():
+            print("{} ({}): {}".format(function, statement, " ".join(
+                "{}={:.1f}us".format(phase, summary["p50_us"]) for phase, summary in entry["phases"].items())))
+    Metrics.disableQueryMetrics()
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
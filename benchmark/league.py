@@ -0,0 +1,95 @@
+# deterministic synthetic leagues for the benchmarks. at scale factor 1 a league has 20 teams of 25 players,
+# 1000 matches of which 9 in 10 are played in one of 30 stadiums, and 4 scorers per match; teams, matches
+# and stadiums grow linearly with the scale factor (players with the teams) and the same scale and seed
+# always give the same rows. ids are 1..n in every table, so new ids for writes start right after them.
+# playedAtHome skews the stadiums: that share of the matches played in a stadium go to the home team's own.
+# run from the project root to load one into an empty schema: python -m benchmark.league [scale] [seed]
+import random
+import sys
+import time
+from typing import Iterable
+import Database
+import Utility.DBConnector as Connector
+
+SEED = 236363
+BASE = {"teams": 20, "playersPerTeam": 25, "matches": 1000, "stadiums": 30, "scorersPerMatch": 4,
+        "playedInStadium": 0.9, "playedAtHome": 0.0}
+
+
+class League:
+    # every size in BASE can be overridden, e.g. League(4, scorersPerMatch=10)
+    def __init__(self, scale: float = 1.0, seed: int = SEED, **overrides):
+        sizes = dict(BASE, **overrides)
+        self.scale = scale
+        self.seed = seed
+        self.teams = max(2, int(round(sizes["teams"] * scale)))
+        self.playersPerTeam = sizes["playersPerTeam"]
+        self.players = self.teams * self.playersPerTeam
+        self.matches = max(1, int(round(sizes["matches"] * scale)))
+        self.stadiums = max(1, int(round(sizes["stadiums"] * scale)))
+        self.scorersPerMatch = min(sizes["scorersPerMatch"], 2 * self.playersPerTeam)
+        self.playedInStadium = sizes["playedInStadium"]
+        self.playedAtHome = sizes["playedAtHome"]
+
+    # the rows of every table as {table: (columns, rows)}, in the order they can be loaded in
+    def rows(self) -> dict:
+        rng = random.Random(self.seed)
+        teams = [(t,) for t in range(1, self.teams + 1)]
+        players = [(p, (p - 1) // self.playersPerTeam + 1, rng.randint(18, 38), rng.randint(165, 205),
+                    rng.choice(["Left", "Right"])) for p in range(1, self.players + 1)]
+        # the first stadiums belong to a team each, the rest to none
+        stadiums = [(s, s if s <= self.teams else None, rng.randint(10000, 90000)) for s in range(1, self.stadiums + 1)]
+        fixtures = []
+        for m in range(1, self.matches + 1):
+            home = rng.randint(1, self.teams)
+            away = rng.randint(1, self.teams - 1)
+            fixtures.append((m, rng.choice(["Domestic", "International"]), home, away if away < home else away + 1))
+        appearances = [(self.venue(rng, home), m, rng.randint(1000, 90000)) for m, _, home, _ in fixtures
+                       if rng.random() < self.playedInStadium]
+        scores = []
+        for m, _, home, away in fixtures:
+            squads = [(team - 1) * self.playersPerTeam + k for team in (home, away) for k in range(1, self.playersPerTeam + 1)]
+            scores.extend((p, m, rng.randint(1, 3)) for p in rng.sample(squads, self.scorersPerMatch))
+        return {"Team": (("id",), teams),
+                "Player": (("player_id", "team_id", "age", "height", "preferred_foot"), players),
+                "Stadium": (("stadium_id", "belong_to", "capacity"), stadiums),
+                "Match": (("match_id", "competition", "homeTeam_id", "awayTeam_id"), fixtures),
+                "MatchInStadium": (("stadium_id", "match_id", "attendance"), appearances),
+                "PlayerScores": (("player_id", "match_id", "goals"), scores)}
+
+    # the stadium of a match played in one, the home team's own (when it has one) for playedAtHome of them
+    def venue(self, rng: random.Random, home: int) -> int:
+        if self.playedAtHome > 0 and home <= self.stadiums and rng.random() < self.playedAtHome:
+            return home
+        return rng.randint(1, self.stadiums)
+
+    # copies the league (or only the given tables of it) into the empty tables in one transaction, the
+    # triggers fill the summary tables, and returns the number of rows of every table copied
+    def load(self, tables: Iterable[str] = None) -> dict:
+        counts = {}
+        conn = Connector.DBConnector()
+        try:
+            conn.begin()
+            for table, (columns, rows) in self.rows().items():
+                if tables is None or table in tables:
+                    counts[table] = conn.copyFrom(table, columns, rows)
+            conn.commit()
+            conn.execute("ANALYZE")
+        finally:
+            conn.close()
+        return counts
+
+    def describe(self) -> dict:
+        return {"scale": self.scale, "seed": self.seed, "teams": self.teams, "players": self.players,
+                "matches": self.matches, "stadiums": self.stadiums, "scorersPerMatch": self.scorersPerMatch,
+                "playedInStadium": self.playedInStadium, "playedAtHome": self.playedAtHome}
+
+
+if __name__ == "__main__":
+    league = League(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0, int(sys.argv[2]) if len(sys.argv) > 2 else SEED)
+    Database.dropTables()
+    Database.createTables()
+    start = time.perf_counter()
+    counts = league.load()
+    print(league.describe())
+    print(counts, "loaded in {:.2f}s".format(time.perf_counter() - start))
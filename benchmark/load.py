@@ -0,0 +1,257 @@
+# concurrent load on a synthetic league: worker processes, each with worker threads, replay a weighted mix of
+# Database.py writes and reads at a target rate for a while, and the per-function latency percentiles,
+# throughput and outcomes (ReturnValues, bad objects, error values, exceptions) are reported overall and
+# for every interval of the run. calls are scheduled open loop, every thread at fixed times whatever the
+# previous call took, and a call's latency counts from when it was due, so a backlog shows up as latency
+# instead of as a lower rate.
+# run from the project root:
+#   python -m benchmark.load [--processes 2] [--threads 8] [--rate 500] [--duration 10] [--interval 1]
+#                            [--scale 1] [--mix getPlayerProfile=30,popularTeams=5,...] [--pool-size 10]
+#                            [--output results.json]
+import argparse
+import json
+import multiprocessing
+import random
+import threading
+import time
+import Database
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from Utility.Metrics import Histogram
+from Utility.ReturnValue import ReturnValue
+from benchmark.league import League
+
+DEFAULT_MIX = {"playerScoredInMatch": 8, "matchInStadium": 4, "addPlayer": 4, "deleteMatch": 1,
+               "getPlayerProfile": 25, "getMatchProfile": 10, "getStadiumProfile": 5, "popularTeams": 5,
+               "mostGoalsForTeam": 10, "averageAttendanceInStadium": 10, "stadiumTotalGoals": 5,
+               "getClosePlayers": 8, "getActiveTallTeams": 3, "getDashboard": 2}
+
+# ids given to the players a worker thread adds, far apart for every thread so they never collide
+ID_SPACE = 10 ** 6
+
+
+# fn(rng, league, fresh) for every function of the mix, fresh() is a new id for this thread
+def operations() -> dict:
+    def player(rng, league):
+        return rng.randint(1, league.players)
+
+    def match(rng, league):
+        return rng.randint(1, league.matches)
+
+    def stadium(rng, league):
+        return rng.randint(1, league.stadiums)
+
+    def team(rng, league):
+        return rng.randint(1, league.teams)
+
+    return {"playerScoredInMatch": lambda rng, league, fresh: Database.playerScoredInMatch(
+                Match(match(rng, league)), Player(player(rng, league)), rng.randint(1, 3)),
+            "matchInStadium": lambda rng, league, fresh: Database.matchInStadium(
+                Match(match(rng, league)), Stadium(stadium(rng, league)), rng.randint(1000, 90000)),
+            "addPlayer": lambda rng, league, fresh: Database.addPlayer(
+                Player(fresh(), team(rng, league), rng.randint(18, 38), rng.randint(165, 205), "Left")),
+            # a league match, so later calls find more and more of them gone
+            "deleteMatch": lambda rng, league, fresh: Database.deleteMatch(Database.getMatchProfile(match(rng, league))),
+            "getPlayerProfile": lambda rng, league, fresh: Database.getPlayerProfile(player(rng, league)),
+            "getMatchProfile": lambda rng, league, fresh: Database.getMatchProfile(match(rng, league)),
+            "getStadiumProfile": lambda rng, league, fresh: Database.getStadiumProfile(stadium(rng, league)),
+            "popularTeams": lambda rng, league, fresh: Database.popularTeams(),
+            "mostGoalsForTeam": lambda rng, league, fresh: Database.mostGoalsForTeam(team(rng, league)),
+            "averageAttendanceInStadium": lambda rng, league, fresh: Database.averageAttendanceInStadium(stadium(rng, league)),
+            "stadiumTotalGoals": lambda rng, league, fresh: Database.stadiumTotalGoals(stadium(rng, league)),
+            "playerIsWinner": lambda rng, league, fresh: Database.playerIsWinner(player(rng, league), match(rng, league)),
+            "getClosePlayers": lambda rng, league, fresh: Database.getClosePlayers(player(rng, league)),
+            "getActiveTallTeams": lambda rng, league, fresh: Database.getActiveTallTeams(),
+            "getActiveTallRichTeams": lambda rng, league, fresh: Database.getActiveTallRichTeams(),
+            "getMostAttractiveStadiums": lambda rng, league, fresh: Database.getMostAttractiveStadiums(),
+            "getDashboard": lambda rng, league, fresh: Database.getDashboard([stadium(rng, league) for _ in range(10)])}
+
+
+# what a call came back with: the ReturnValue's name for writes, for reads OK, BAD_OBJECT for a bad
+# profile or dashboard, and ERROR for the -1 the single-value reads give on errors
+def outcome(result) -> str:
+    if isinstance(result, ReturnValue):
+        return result.name
+    if isinstance(result, (Match, Player, Stadium)):
+        return "OK" if (result.getMatchID() if isinstance(result, Match) else
+                        result.getPlayerID() if isinstance(result, Player) else result.getStadiumID()) is not None \
+            else "BAD_OBJECT"
+    if hasattr(result, "getPopularTeams"):
+        return "OK" if result.getPopularTeams() is not None else "BAD_OBJECT"
+    if type(result) is not bool and isinstance(result, (int, float)) and result == -1:
+        return "ERROR"
+    return "OK"
+
+
+def parseMix(text: str) -> dict:
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight) if weight != "" else 1.0
+    unknown = set(mix) - set(operations())
+    if len(unknown) > 0:
+        raise ValueError("unknown functions in the mix: " + ", ".join(sorted(unknown)))
+    return mix
+
+
+# counts and latencies of one process, overall and per interval of the run
+class Recorder:
+    def __init__(self, start: float, interval: float):
+        self.start = start
+        self.interval = interval
+        self.histograms = {}
+        self.outcomes = {}
+        self.intervals = {}
+        self.late = 0
+        self.__lock = threading.Lock()
+
+    def record(self, name: str, due: float, latency: float, result: str, late: bool):
+        slot = int((due - self.start) / self.interval)
+        with self.__lock:
+            if late:
+                self.late += 1
+            if name not in self.histograms:
+                self.histograms[name] = Histogram()
+            outcomes = self.outcomes.setdefault(name, {})
+            outcomes[result] = outcomes.get(result, 0) + 1
+            period = self.intervals.setdefault(slot, {"histogram": Histogram(), "calls": 0, "failures": 0})
+            period["calls"] += 1
+            if result not in ("OK", "ALREADY_EXISTS", "NOT_EXISTS"):
+                period["failures"] += 1
+        self.histograms[name].record(latency)
+        period["histogram"].record(latency)
+
+    def toDict(self) -> dict:
+        with self.__lock:
+            return {"histograms": {name: h.toDict() for name, h in self.histograms.items()},
+                    "outcomes": self.outcomes, "late": self.late,
+                    "intervals": {str(slot): {"histogram": p["histogram"].toDict(), "calls": p["calls"],
+                                              "failures": p["failures"]} for slot, p in self.intervals.items()}}
+
+
+def workerThread(index: int, recorder: Recorder, league: League, mix: dict, rate: float, stop: float, seed: int):
+    rng = random.Random(seed * 1009 + index)
+    table = operations()
+    names = list(mix)
+    weights = [mix[name] for name in names]
+    counter = [0]
+
+    def fresh():
+        counter[0] += 1
+        return league.players + (index + 1) * ID_SPACE + counter[0]
+
+    period = 1.0 / rate
+    # threads start spread over one period so their calls interleave
+    due = recorder.start + period * rng.random()
+    while due < stop:
+        now = time.time()
+        if now < due:
+            time.sleep(due - now)
+        name = rng.choices(names, weights)[0]
+        try:
+            result = outcome(table[name](rng, league, fresh))
+        except Exception as e:
+            result = type(e).__name__
+        finished = time.time()
+        # the thread's next call is due already, it starts late
+        recorder.record(name, due, finished - due, result, finished > due + period)
+        due += period
+
+
+def workerProcess(process: int, threads: int, league: League, mix: dict, rate: float, start: float,
+                  duration: float, interval: float, poolSize: int, seed: int, results):
+    Connector.configurePool(maxSize=poolSize)
+    recorder = Recorder(start, interval)
+    workers = [threading.Thread(target=workerThread,
+                                args=(process * threads + t, recorder, league, mix, rate, start + duration, seed))
+               for t in range(threads)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    results.put(recorder.toDict())
+
+
+def merge(parts: list, interval: float) -> dict:
+    histograms, outcomes, intervals, late = {}, {}, {}, 0
+    for part in parts:
+        late += part["late"]
+        for name, state in part["histograms"].items():
+            histograms.setdefault(name, Histogram()).mergeDict(state)
+        for name, counts in part["outcomes"].items():
+            for result, count in counts.items():
+                outcomes.setdefault(name, {})[result] = outcomes.setdefault(name, {}).get(result, 0) + count
+        for slot, period in part["intervals"].items():
+            merged = intervals.setdefault(int(slot), {"histogram": Histogram(), "calls": 0, "failures": 0})
+            merged["histogram"].mergeDict(period["histogram"])
+            merged["calls"] += period["calls"]
+            merged["failures"] += period["failures"]
+    return {"late": late,
+            "functions": {name: dict(histograms[name].summary(), outcomes=outcomes[name]) for name in sorted(histograms)},
+            "intervals": [dict(intervals[slot]["histogram"].summary(), start_s=slot * interval,
+                               calls_per_s=intervals[slot]["calls"] / interval, failures=intervals[slot]["failures"])
+                          for slot in sorted(intervals)]}
+
+
+def main(arguments) -> dict:
+    mix = parseMix(arguments.mix) if arguments.mix is not None else DEFAULT_MIX
+    league = League(arguments.scale)
+    Database.dropTables()
+    Database.createTables()
+    league.load()
+    workers = arguments.processes * arguments.threads
+    context = multiprocessing.get_context("spawn")
+    results = context.Queue()
+    # the workers start together a moment from now, once every process is up
+    start = time.time() + 2.0
+    processes = [context.Process(target=workerProcess,
+                                 args=(p, arguments.threads, league, mix, arguments.rate / workers, start,
+                                       arguments.duration, arguments.interval, arguments.pool_size, arguments.seed,
+                                       results))
+                 for p in range(arguments.processes)]
+    for process in processes:
+        process.start()
+    parts = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    report = merge(parts, arguments.interval)
+    report["settings"] = {"processes": arguments.processes, "threads": arguments.threads, "rate": arguments.rate,
+                          "duration": arguments.duration, "pool_size": arguments.pool_size, "mix": mix,
+                          "league": league.describe()}
+    Database.dropTables()
+    return report
+
+
+def show(report: dict):
+    settings = report["settings"]
+    print("{} processes x {} threads, target {:.0f} calls/s for {:.0f}s, {} calls started late".format(
+        settings["processes"], settings["threads"], settings["rate"], settings["duration"], report["late"]))
+    for name, summary in report["functions"].items():
+        print("  {:<28} n={:<7} {:>7.1f}/s p50={:>9.1f}us p95={:>9.1f}us p99={:>9.1f}us {}".format(
+            name, summary["count"], summary["count"] / settings["duration"], summary["p50_us"], summary["p95_us"],
+            summary["p99_us"], " ".join("{}={}".format(k, v) for k, v in sorted(summary["outcomes"].items()))))
+    for period in report["intervals"]:
+        print("  t={:>6.1f}s {:>8.1f} calls/s p50={:>9.1f}us p99={:>9.1f}us failures={}".format(
+            period["start_s"], period["calls_per_s"], period["p50_us"], period["p99_us"], period["failures"]))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmark.load")
+    parser.add_argument("--processes", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--rate", type=float, default=500, help="target calls per second over all workers")
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--interval", type=float, default=1, help="seconds per reported interval")
+    parser.add_argument("--scale", type=float, default=1)
+    parser.add_argument("--mix", help="name=weight,... of Database.py functions, the default mix when not given")
+    parser.add_argument("--pool-size", type=int, default=10, help="connections per process")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="file for the JSON report")
+    arguments = parser.parse_args()
+    report = main(arguments)
+    show(report)
+    if arguments.output is not None:
+        with open(arguments.output, "w") as output:
+            output.write(json.dumps(report, indent=2) + "\n")
@@ -0,0 +1,180 @@
+# plan-regression checks for the analytics queries: loads a synthetic league, runs each function's registered
+# statement a few times over one connection (so the plan cache settles the way it does in production) and
+# then captures EXPLAIN (ANALYZE, BUFFERS) of it. a plan fails when
+#   - a sequential scan reads more than SEQ_SCAN_ROWS rows of a relation the function is not meant to read
+#     in full,
+#   - a nested loop joins its two sides with no condition at all (a cartesian product), or
+#   - the shared buffers it touches (hit + read) exceed the function's budget for the league's size,
+# and with --compare also when, against an earlier --save of the same scale, a relation is now scanned
+# sequentially that was not before or the buffers grew by more than --threshold times.
+# exits with status 1 when any plan fails, printing the plan of those.
+# run from the project root:
+#   python -m benchmark.plans [--scale 10] [--save plans.json] [--compare plans.json] [--threshold 1.5] [--verbose]
+import argparse
+import datetime
+import json
+import sys
+from psycopg2 import sql
+import Database
+import Utility.DBConnector as Connector
+from benchmark.league import League, SEED
+
+SEQ_SCAN_ROWS = 1000
+# executions before the one explained, past the five after which Postgres may switch to a generic plan
+WARMUP = 6
+
+
+# (function, statement, params, budget) of every plan checked, budget holding the most shared buffers the
+# plan may touch and the relations it may scan in full (lower case, as Postgres reports them)
+def checks(league: League) -> list:
+    scores = league.rows()["PlayerScores"][1]
+    player, match, _ = scores[len(scores) // 2]
+    team = league.teams // 2 + 1
+    stadium = league.stadiums // 2 + 1
+    stadiums = list(range(1, min(20, league.stadiums) + 1))
+    teams = list(range(1, min(50, league.teams) + 1))
+    # pages of the tables an aggregate over every match reads, with room for the tables to be a bit bloated
+    matchPages = league.matches // 25 + 20
+    return [("getClosePlayers", "getClosePlayers", (player,), {"buffers": 40}),
+            ("popularTeams", "popularTeams", (), {"buffers": matchPages, "seqScans": {"match", "matchinstadium"}}),
+            ("getActiveTallTeams", "getActiveTallTeams", (), {"buffers": 20}),
+            ("getActiveTallRichTeams", "getActiveTallRichTeams", (), {"buffers": 40}),
+            ("getMostAttractiveStadiums", "getMostAttractiveStadiums", (),
+             {"buffers": league.stadiums // 20 + 20, "seqScans": {"stadiumstats"}}),
+            ("mostGoalsForTeam", "mostGoalsForTeam", (team,), {"buffers": 20}),
+            ("mostGoalsForTeams", "mostGoalsForTeams", (teams, 5), {"buffers": 5 * len(teams) + 20}),
+            ("playerIsWinner", "playerIsWinner", (player, match), {"buffers": 20}),
+            ("averageAttendanceInStadium", "averageAttendanceInStadium", (stadium,), {"buffers": 20}),
+            ("stadiumTotalGoals", "stadiumTotalGoals", (stadium,), {"buffers": 20}),
+            # the coalesced averageAttendanceInStadium and stadiumTotalGoals
+            ("stadiumsStats", "stadiumsStats", (stadiums,), {"buffers": 8 * len(stadiums) + 20}),
+            ("checkStadiumStats", "checkStadiumStats", (),
+             {"buffers": 3 * matchPages, "seqScans": {"stadium", "stadiumstats", "matchinstadium", "playerscores"}}),
+            ("getDashboard", "getDashboard", (stadiums,),
+             {"buffers": matchPages + 8 * len(stadiums) + 60, "seqScans": {"match", "matchinstadium", "stadiumstats"}}),
+            ("getPlayerProfiles", "getPlayerProfiles", (list(range(1, 101)),), {"buffers": 400}),
+            ("getMatchProfiles", "getMatchProfiles", (list(range(1, 101)),), {"buffers": 400})]
+
+
+def explain(conn: Connector.DBConnector, statement: str, params: tuple) -> dict:
+    for _ in range(WARMUP):
+        conn.executePrepared(statement, params)
+    query = sql.SQL("EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) EXECUTE {}").format(sql.Identifier(statement))
+    if len(params) > 0:
+        query += sql.SQL("({})").format(sql.SQL(", ").join(map(sql.Literal, params)))
+    _, result = conn.execute(query)
+    return result.rows[0][0][0]
+
+
+def nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from nodes(child)
+
+
+# a join condition somewhere below: the inner side is looked up by the outer row, or filtered against it
+def conditioned(plan: dict) -> bool:
+    return any(key in node for node in nodes(plan)
+               for key in ("Index Cond", "Recheck Cond", "Cache Key", "Join Filter", "Hash Cond", "Merge Cond"))
+
+
+def summarize(plan: dict) -> dict:
+    root = plan["Plan"]
+    return {"execution_ms": plan["Execution Time"],
+            "buffers": root.get("Shared Hit Blocks", 0) + root.get("Shared Read Blocks", 0),
+            # rows read by every sequential scan, the ones filtered out included
+            "seq_scans": {node["Relation Name"]:
+                          node["Actual Loops"] * (node["Actual Rows"] + node.get("Rows Removed by Filter", 0))
+                          for node in nodes(root) if node["Node Type"] == "Seq Scan"},
+            "nodes": sorted({node["Node Type"] for node in nodes(root)})}
+
+
+# what is wrong with the plan, an empty list when nothing is
+def violations(plan: dict, summary: dict, budget: dict) -> list:
+    found = []
+    for relation, rows in sorted(summary["seq_scans"].items()):
+        if rows > SEQ_SCAN_ROWS and relation not in budget.get("seqScans", ()):
+            found.append("sequential scan of {} reads {} rows".format(relation, rows))
+    for node in nodes(plan["Plan"]):
+        if node["Node Type"] != "Nested Loop" or "Join Filter" in node:
+            continue
+        outer, inner = node["Plans"][0], node["Plans"][1]
+        if outer["Actual Rows"] > 1 and inner["Actual Rows"] > 1 and not conditioned(inner):
+            found.append("nested loop without a join condition, {} x {} rows".format(outer["Actual Rows"],
+                                                                                     inner["Actual Rows"]))
+    if summary["buffers"] > budget["buffers"]:
+        found.append("{} shared buffers, budget {}".format(summary["buffers"], budget["buffers"]))
+    return found
+
+
+# regressions against the summary of the same plan in an earlier run
+def regressions(before: dict, summary: dict, threshold: float) -> list:
+    found = []
+    for relation in sorted(set(summary["seq_scans"]) - set(before["seq_scans"])):
+        if summary["seq_scans"][relation] > SEQ_SCAN_ROWS:
+            found.append("new sequential scan of " + relation)
+    if summary["buffers"] > max(before["buffers"] * threshold, before["buffers"] + 10):
+        found.append("shared buffers grew from {} to {}".format(before["buffers"], summary["buffers"]))
+    return found
+
+
+def formatPlan(plan: dict, depth: int = 2) -> list:
+    lines = ["{}{}{}{} rows={} loops={} buffers={}".format(
+        " " * depth, plan["Node Type"], " on " + plan["Relation Name"] if "Relation Name" in plan else "",
+        " using " + plan["Index Name"] if "Index Name" in plan else "", plan.get("Actual Rows"), plan.get("Actual Loops"),
+        plan.get("Shared Hit Blocks", 0) + plan.get("Shared Read Blocks", 0))]
+    for child in plan.get("Plans", []):
+        lines.extend(formatPlan(child, depth + 2))
+    return lines
+
+
+def main(arguments) -> int:
+    league = League(arguments.scale, arguments.seed)
+    Database.dropTables()
+    Database.createTables()
+    league.load()
+    baseline = None
+    if arguments.compare is not None:
+        with open(arguments.compare) as previous:
+            baseline = json.load(previous)
+        if baseline["league"] != league.describe():
+            print("--compare was run on another league, {}".format(baseline["league"]), file=sys.stderr)
+            baseline = None
+    results = {"created": datetime.datetime.now(datetime.timezone.utc).isoformat(), "league": league.describe(),
+               "plans": {}}
+    failed = 0
+    conn = Connector.DBConnector()
+    try:
+        for name, statement, params, budget in checks(league):
+            plan = explain(conn, statement, params)
+            summary = summarize(plan)
+            found = violations(plan, summary, budget)
+            if baseline is not None and name in baseline["plans"]:
+                found += regressions(baseline["plans"][name]["summary"], summary, arguments.threshold)
+            results["plans"][name] = {"summary": summary, "plan": plan}
+            print("{:<28} {:<4} {:>9.3f}ms {:>6} buffers (budget {})".format(
+                name, "FAIL" if len(found) > 0 else "ok", summary["execution_ms"], summary["buffers"], budget["buffers"]))
+            for problem in found:
+                print("  " + problem)
+            if len(found) > 0 or arguments.verbose:
+                print("\n".join(formatPlan(plan["Plan"])))
+            failed += len(found) > 0
+    finally:
+        conn.close()
+    Database.dropTables()
+    if arguments.save is not None:
+        with open(arguments.save, "w") as output:
+            output.write(json.dumps(results, indent=2) + "\n")
+    print("{} of {} plans failed".format(failed, len(results["plans"])))
+    return 1 if failed > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmark.plans")
+    parser.add_argument("--scale", type=float, default=10, help="league scale factor")
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--save", help="file to write the plans to, for a later --compare")
+    parser.add_argument("--compare", help="plans saved by an earlier run to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    parser.add_argument("--verbose", action="store_true", help="print every plan, not only the failing ones")
+    sys.exit(main(parser.parse_args()))
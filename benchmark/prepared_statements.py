@@ -0,0 +1,71 @@
+# per-call latency of the Database.py statements, composed client-side with sql.Literal (how every
+# function used to run them) against the same statements PREPAREd once per connection and EXECUTEd.
+# run from the project root: python -m benchmark.prepared_statements [iterations]
+import re
+import sys
+from psycopg2 import sql
+import Database
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from benchmark.timing import measure, summarize, formatSummary
+
+
+def literalQuery(name: str, params: tuple) -> sql.Composed:
+    query = re.sub(r"\$(\d+)", lambda m: "{" + str(int(m.group(1)) - 1) + "}", Connector._statements[name].query)
+    return sql.SQL(query).format(*[sql.Literal(p) for p in params])
+
+
+def runLiteral(name: str, params: tuple):
+    conn = Connector.DBConnector()
+    try:
+        conn.execute(literalQuery(name, params))
+    finally:
+        conn.close()
+
+
+def runPrepared(name: str, params: tuple):
+    conn = Connector.DBConnector()
+    try:
+        conn.executePrepared(name, params)
+    finally:
+        conn.close()
+
+
+def populate(teams=20, playersPerTeam=25, matches=200):
+    Database.dropTables()
+    Database.createTables()
+    for t in range(1, teams + 1):
+        Database.addTeam(t)
+    for p in range(1, teams * playersPerTeam + 1):
+        Database.addPlayer(Player(p, (p - 1) // playersPerTeam + 1, 20 + p % 15, 175 + p % 25,
+                                  "Left" if p % 3 == 0 else "Right"))
+    for m in range(1, matches + 1):
+        home = m % teams + 1
+        away = (m + 7) % teams + 1
+        Database.addMatch(Match(m, "Domestic", home, away))
+        for k in range(5):
+            Database.playerScoredInMatch(Match(m), Player((home - 1) * playersPerTeam + (m + k) % playersPerTeam + 1),
+                                         1 + k % 2)
+
+
+def main(iterations: int):
+    populate()
+    players = 500
+    cases = [("getPlayerProfile", lambda i: (i % players + 1,)),
+             ("getMatchProfile", lambda i: (i % 200 + 1,)),
+             ("playerIsWinner", lambda i: (i % players + 1, i % 200 + 1)),
+             ("mostGoalsForTeam", lambda i: (i % 20 + 1,)),
+             ("getClosePlayers", lambda i: (i % players + 1,)),
+             ("popularTeams", lambda i: ())]
+    for name, params in cases:
+        before = summarize(measure(lambda i: runLiteral(name, params(i)), iterations))
+        after = summarize(measure(lambda i: runPrepared(name, params(i)), iterations))
+        print(formatSummary(name + " literal", before))
+        print(formatSummary(name + " prepared", after))
+        print("{:<32} {:.2f}x".format(name + " speedup (p50)", before["p50_us"] / max(after["p50_us"], 1e-9)))
+    Database.dropTables()
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
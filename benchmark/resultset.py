@@ -0,0 +1,99 @@
+# micro-benchmarks of ResultSet against the implementation it replaced (kept below as LegacyResultSet):
+# construction, row access by column name, full iteration and column extraction, plus allocated memory.
+# needs no database. run from the project root: python -m benchmark.resultset [rows]
+import sys
+import time
+import tracemalloc
+from Utility.DBConnector import ResultSet, ResultSetDict
+
+
+class LegacyResultSet:
+    def __init__(self, description=None, results=None):
+        self.rows = []
+        self.cols_header = []
+        self.cols = ResultSetDict()
+        self.__fromQuery(description, results)
+
+    def __getitem__(self, row):
+        return self.__getRow(row)
+
+    def __getRow(self, row: int):
+        if len(self.rows) <= row:
+            print('Invalid row ' + str(row))
+            return ResultSetDict()
+        row_to_return = ResultSetDict()
+        for val, col in zip(self.rows[row], self.cols_header):
+            row_to_return[col] = val
+        return row_to_return
+
+    def __fromQuery(self, description, results: list):
+        if results is None or len(results) == 0:  # no results
+            self.cols = ResultSetDict()
+        else:
+            self.rows = results.copy()
+            self.cols_header = [d.name for d in description]
+            self.cols = ResultSetDict()
+            for col, index in zip(self.cols_header, range(len(results[0]))):
+                self.cols[col] = index
+
+
+class Column:
+    def __init__(self, name):
+        self.name = name
+
+
+DESCRIPTION = [Column("player_id"), Column("team_id"), Column("age"), Column("height"), Column("preferred_foot")]
+
+
+def fetched(rows: int) -> list:
+    return [(i, i % 100, 20 + i % 15, 170 + i % 30, "Left" if i % 2 else "Right") for i in range(rows)]
+
+
+def timed(fn) -> float:
+    start = time.perf_counter()
+    fn()
+    return time.perf_counter() - start
+
+
+def allocated(fn) -> int:
+    tracemalloc.start()
+    result = fn()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def byName(rs):
+    total = 0
+    for i in range(rs.size() if hasattr(rs, "size") else len(rs.rows)):
+        total += rs[i]["height"]
+    return total
+
+
+def column(rs):
+    if isinstance(rs, ResultSet):
+        return rs.column("height")
+    index = rs.cols["height"]
+    return [row[index] for row in rs.rows]
+
+
+def main(rows: int):
+    results = fetched(rows)
+    cases = [("construct", lambda cls: (lambda: cls(DESCRIPTION, results))),
+             ("rs[i]['height'] over all rows", lambda cls: (lambda rs=cls(DESCRIPTION, results): byName(rs))),
+             ("column('height')", lambda cls: (lambda rs=cls(DESCRIPTION, results): column(rs)))]
+    print("rows:", rows)
+    for name, case in cases:
+        legacy = timed(case(LegacyResultSet))
+        current = timed(case(ResultSet))
+        print("{:<32} legacy={:>9.2f}ms current={:>9.2f}ms {:>6.1f}x".format(name, legacy * 1e3, current * 1e3,
+                                                                           legacy / max(current, 1e-9)))
+    legacy = allocated(lambda: LegacyResultSet(DESCRIPTION, results))
+    current = allocated(lambda: ResultSet(DESCRIPTION, results))
+    print("{:<32} legacy={:>9.1f}KB current={:>9.1f}KB".format("memory on top of fetched rows", legacy / 1024,
+                                                               current / 1024))
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000000)
@@ -0,0 +1,209 @@
+# times every public Database.py function on synthetic leagues of the given scale factors and writes the
+# results as JSON, to compare runs: latency percentiles per call and calls per second (one call at a time,
+# read cache off). the reads run on the league as generated, then every write is timed on ids after the
+# league's own, each add followed by what removes it again. the schema functions, clearTables included,
+# run on empty tables.
+# --compare reads an earlier output and lists the functions whose p50 grew by more than --threshold times,
+# exiting with status 1 when there are any.
+# run from the project root:
+#   python -m benchmark.suite [--scale 1 --scale 4 ...] [--iterations 200] [--output results.json]
+#                             [--compare baseline.json] [--threshold 1.5]
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+import Database
+import Utility.DBConnector as Connector
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from benchmark.league import League, SEED
+from benchmark.timing import measure, summarize
+
+# rows per call of the bulk functions
+BATCH = 100
+
+
+def withThroughput(summary: dict) -> dict:
+    summary["throughput_per_s"] = 1e6 / summary["mean_us"] if summary["mean_us"] > 0 else 0.0
+    return summary
+
+
+def timed(fn, iterations: int, warmup: int = 10) -> dict:
+    return withThroughput(summarize(measure(fn, iterations, warmup)))
+
+
+# (name, fn(i)) for the reads, with ids spread over the whole league
+def reads(league: League) -> list:
+    def player(i):
+        return i * 7919 % league.players + 1
+
+    def match(i):
+        return i * 7919 % league.matches + 1
+
+    def stadium(i):
+        return i * 7919 % league.stadiums + 1
+
+    def team(i):
+        return i * 7919 % league.teams + 1
+
+    return [("getMatchProfile", lambda i: Database.getMatchProfile(match(i))),
+            ("getMatchProfiles", lambda i: Database.getMatchProfiles([match(i + k) for k in range(BATCH)])),
+            ("getPlayerProfile", lambda i: Database.getPlayerProfile(player(i))),
+            ("getPlayerProfiles", lambda i: Database.getPlayerProfiles([player(i + k) for k in range(BATCH)])),
+            ("getStadiumProfile", lambda i: Database.getStadiumProfile(stadium(i))),
+            ("getStadiumProfiles", lambda i: Database.getStadiumProfiles([stadium(i + k) for k in range(BATCH)])),
+            ("averageAttendanceInStadium", lambda i: Database.averageAttendanceInStadium(stadium(i))),
+            ("stadiumTotalGoals", lambda i: Database.stadiumTotalGoals(stadium(i))),
+            ("playerIsWinner", lambda i: Database.playerIsWinner(player(i), match(i))),
+            ("getActiveTallTeams", lambda i: Database.getActiveTallTeams()),
+            ("getActiveTallRichTeams", lambda i: Database.getActiveTallRichTeams()),
+            ("popularTeams", lambda i: Database.popularTeams()),
+            ("getMostAttractiveStadiums", lambda i: Database.getMostAttractiveStadiums()),
+            ("iterMostAttractiveStadiums", lambda i: sum(1 for _ in Database.iterMostAttractiveStadiums())),
+            ("checkStadiumStats", lambda i: Database.checkStadiumStats()),
+            ("mostGoalsForTeam", lambda i: Database.mostGoalsForTeam(team(i))),
+            ("mostGoalsForTeams", lambda i: Database.mostGoalsForTeams([team(i + k) for k in range(min(BATCH, league.teams))])),
+            ("getClosePlayers", lambda i: Database.getClosePlayers(player(i))),
+            ("getDashboard", lambda i: Database.getDashboard([stadium(i + k) for k in range(min(20, league.stadiums))]))]
+
+
+# (name, fn(i)) for the writes in the order they run, call i of a function works on ids no earlier call used.
+# the single-row writes use new ids from league size + 1, the bulk ones from there + iterations, and the new
+# stadiums belong to the new teams of the same call
+def writes(league: League, iterations: int) -> list:
+    def newTeam(i):
+        return league.teams + 1 + i
+
+    def newPlayer(i):
+        return league.players + 1 + i
+
+    def newMatch(i):
+        return league.matches + 1 + i
+
+    def newStadium(i):
+        return league.stadiums + 1 + i
+
+    def bulk(new, i):
+        return [new(iterations + i * BATCH + k) for k in range(BATCH)]
+
+    def newMatchOf(m):
+        return Match(m, "Domestic", m % league.teams + 1, (m + 1) % league.teams + 1)
+
+    def newPlayerOf(p):
+        return Player(p, p % league.teams + 1, 25, 185, "Left")
+
+    return [("addTeam", lambda i: Database.addTeam(newTeam(i))),
+            ("addTeams", lambda i: Database.addTeams(bulk(newTeam, i))),
+            ("addMatch", lambda i: Database.addMatch(newMatchOf(newMatch(i)))),
+            ("addMatches", lambda i: Database.addMatches([newMatchOf(m) for m in bulk(newMatch, i)])),
+            ("addPlayer", lambda i: Database.addPlayer(newPlayerOf(newPlayer(i)))),
+            ("addPlayers", lambda i: Database.addPlayers([newPlayerOf(p) for p in bulk(newPlayer, i)])),
+            ("addStadium", lambda i: Database.addStadium(Stadium(newStadium(i), 50000, newTeam(i)))),
+            ("addStadiums", lambda i: Database.addStadiums([Stadium(s, 50000, t) for s, t in zip(bulk(newStadium, i),
+                                                                                                bulk(newTeam, i))])),
+            ("playerScoredInMatch", lambda i: Database.playerScoredInMatch(Match(newMatch(i)), Player(newPlayer(i)), 2)),
+            ("playersScoredInMatches", lambda i: Database.playersScoredInMatches(
+                [(Match(m), Player(p), 2) for m, p in zip(bulk(newMatch, i), bulk(newPlayer, i))])),
+            ("matchInStadium", lambda i: Database.matchInStadium(Match(newMatch(i)), Stadium(newStadium(i)), 45000)),
+            ("matchesInStadiums", lambda i: Database.matchesInStadiums(
+                [(Match(m), Stadium(s), 45000) for m, s in zip(bulk(newMatch, i), bulk(newStadium, i))])),
+            ("playerDidntScoreInMatch", lambda i: Database.playerDidntScoreInMatch(Match(newMatch(i)), Player(newPlayer(i)))),
+            ("matchNotInStadium", lambda i: Database.matchNotInStadium(Match(newMatch(i)), Stadium(newStadium(i)))),
+            ("deleteMatch", lambda i: Database.deleteMatch(newMatchOf(newMatch(i)))),
+            ("deletePlayer", lambda i: Database.deletePlayer(newPlayerOf(newPlayer(i)))),
+            ("deleteStadium", lambda i: Database.deleteStadium(Stadium(newStadium(i), 50000, newTeam(i))))]
+
+
+def runScale(scale: float, iterations: int, seed: int) -> dict:
+    league = League(scale, seed)
+    functions = {}
+    # the schema functions on empty tables, a few cycles of both
+    Database.dropTables()
+    created, cleared, dropped = [], [], []
+    for cycle in range(max(1, min(iterations, 5))):
+        start = time.perf_counter()
+        Database.createTables()
+        created.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        Database.clearTables()
+        cleared.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        Database.dropTables()
+        dropped.append(time.perf_counter() - start)
+    functions["createTables"] = withThroughput(summarize(created))
+    functions["clearTables"] = withThroughput(summarize(cleared))
+    functions["dropTables"] = withThroughput(summarize(dropped))
+    Database.createTables()
+    start = time.perf_counter()
+    counts = league.load()
+    loaded = time.perf_counter() - start
+    for name, fn in reads(league):
+        functions[name] = timed(fn, iterations)
+    for name, fn in writes(league, iterations):
+        functions[name] = timed(fn, iterations, 0)
+    Database.dropTables()
+    return {"league": league.describe(), "rows": counts, "load_s": loaded, "functions": functions}
+
+
+def serverVersion() -> str:
+    conn = Connector.DBConnector()
+    try:
+        _, result = conn.execute("SHOW server_version")
+        return result.rows[0][0]
+    finally:
+        conn.close()
+
+
+# the functions of scale runs present in both results whose p50 grew by more than threshold times
+def regressions(baseline: dict, results: dict, threshold: float) -> list:
+    found = []
+    before = {run["league"]["scale"]: run["functions"] for run in baseline["runs"]}
+    for run in results["runs"]:
+        old = before.get(run["league"]["scale"])
+        if old is None:
+            continue
+        for name, summary in run["functions"].items():
+            if name in old and old[name]["p50_us"] > 0 and summary["p50_us"] / old[name]["p50_us"] > threshold:
+                found.append((run["league"]["scale"], name, old[name]["p50_us"], summary["p50_us"]))
+    return found
+
+
+def main(arguments) -> int:
+    results = {"created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+               "python": platform.python_version(), "postgres": serverVersion(), "iterations": arguments.iterations,
+               "seed": arguments.seed, "runs": []}
+    for scale in arguments.scale or [1.0]:
+        run = runScale(scale, arguments.iterations, arguments.seed)
+        results["runs"].append(run)
+        print("scale {}: {} loaded in {:.2f}s".format(scale, run["rows"], run["load_s"]), file=sys.stderr)
+        for name, summary in run["functions"].items():
+            print("  {:<28} p50={:>10.1f}us p95={:>10.1f}us p99={:>10.1f}us {:>9.0f}/s".format(
+                name, summary["p50_us"], summary["p95_us"], summary["p99_us"], summary["throughput_per_s"]),
+                file=sys.stderr)
+    text = json.dumps(results, indent=2)
+    if arguments.output is None:
+        print(text)
+    else:
+        with open(arguments.output, "w") as output:
+            output.write(text + "\n")
+    if arguments.compare is None:
+        return 0
+    with open(arguments.compare) as baseline:
+        found = regressions(json.load(baseline), results, arguments.threshold)
+    for scale, name, before, after in found:
+        print("regression at scale {}: {} p50 {:.1f}us -> {:.1f}us".format(scale, name, before, after), file=sys.stderr)
+    return 1 if len(found) > 0 else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(prog="python -m benchmark.suite")
+    parser.add_argument("--scale", type=float, action="append", help="league scale factor, may be repeated")
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=SEED)
+    parser.add_argument("--output", help="file for the JSON results, stdout when not given")
+    parser.add_argument("--compare", help="earlier JSON results to check for regressions")
+    parser.add_argument("--threshold", type=float, default=1.5)
+    sys.exit(main(parser.parse_args()))
@@ -0,0 +1,37 @@
+import time
+
+
+# runs fn(i) for i in range(iterations) after a few warmup calls, returns the latency of every call in seconds
+def measure(fn, iterations: int, warmup: int = 10) -> list:
+    for i in range(warmup):
+        fn(i)
+    samples = []
+    for i in range(iterations):
+        start = time.perf_counter()
+        fn(i)
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def percentile(sortedSamples: list, p: float) -> float:
+    if len(sortedSamples) == 0:
+        return 0.0
+    index = min(len(sortedSamples) - 1, int(round(p / 100.0 * (len(sortedSamples) - 1))))
+    return sortedSamples[index]
+
+
+# latency summary in microseconds
+def summarize(samples: list) -> dict:
+    ordered = sorted(samples)
+    total = sum(ordered)
+    return {"count": len(ordered),
+            "mean_us": total / len(ordered) * 1e6 if len(ordered) > 0 else 0.0,
+            "p50_us": percentile(ordered, 50) * 1e6,
+            "p95_us": percentile(ordered, 95) * 1e6,
+            "p99_us": percentile(ordered, 99) * 1e6,
+            "max_us": ordered[-1] * 1e6 if len(ordered) > 0 else 0.0}
+
+
+def formatSummary(name: str, summary: dict) -> str:
+    return "{:<32} n={:<7} mean={:>9.1f}us p50={:>9.1f}us p95={:>9.1f}us p99={:>9.1f}us".format(
+        name, summary["count"], summary["mean_us"], summary["p50_us"], summary["p95_us"], summary["p99_us"])
@@ -0,0 +1,42 @@
+class Dashboard:
+    __slots__ = ("__activeTallTeams", "__activeTallRichTeams", "__popularTeams", "__mostAttractiveStadiums",
+                 "__stadiumAttendance", "__stadiumGoals")
+
+    def __init__(self, activeTallTeams=None, activeTallRichTeams=None, popularTeams=None, mostAttractiveStadiums=None,
+                 stadiumAttendance=None, stadiumGoals=None):
+        self.__activeTallTeams = activeTallTeams
+        self.__activeTallRichTeams = activeTallRichTeams
+        self.__popularTeams = popularTeams
+        self.__mostAttractiveStadiums = mostAttractiveStadiums
+        self.__stadiumAttendance = stadiumAttendance
+        self.__stadiumGoals = stadiumGoals
+
+    def getActiveTallTeams(self):
+        return self.__activeTallTeams
+
+    def getActiveTallRichTeams(self):
+        return self.__activeTallRichTeams
+
+    def getPopularTeams(self):
+        return self.__popularTeams
+
+    def getMostAttractiveStadiums(self):
+        return self.__mostAttractiveStadiums
+
+    # stadium id -> average attendance, for the stadiums the dashboard was asked about
+    def getStadiumAttendance(self):
+        return self.__stadiumAttendance
+
+    # stadium id -> total goals, for the stadiums the dashboard was asked about
+    def getStadiumGoals(self):
+        return self.__stadiumGoals
+
+    @staticmethod
+    def badDashboard():
+        return Dashboard()
+
+    def __str__(self):
+        return ("activeTallTeams=" + str(self.__activeTallTeams) + ", activeTallRichTeams=" +
+                str(self.__activeTallRichTeams) + ", popularTeams=" + str(self.__popularTeams) +
+                ", mostAttractiveStadiums=" + str(self.__mostAttractiveStadiums) + ", stadiumAttendance=" +
+                str(self.__stadiumAttendance) + ", stadiumGoals=" + str(self.__stadiumGoals))
@@ -0,0 +1,67 @@
+# the modules import Utility.* and Business.*, kept in utility/ and library/ in this tree, so the two
+# packages are mapped onto those directories when they can't be imported as they are. the tests that need
+# a database are skipped when database.ini's server can't be reached.
+# run from the project root: python -m pytest tests
+import importlib
+import os
+import sys
+import time
+import types
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+for package, directory in (("Utility", "utility"), ("Business", "library")):
+    try:
+        importlib.import_module(package)
+    except ImportError:
+        module = types.ModuleType(package)
+        module.__path__ = [os.path.join(ROOT, directory)]
+        sys.modules[package] = module
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+# time.monotonic, which the caches expire their entries by, stands still until the test moves clock.now
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(time, "monotonic", clock)
+    return clock
+
+
+@pytest.fixture(scope="session")
+def database():
+    import Utility.DBConnector as Connector
+    try:
+        conn = Connector.DBConnector()
+        conn.close()
+    except Exception as e:
+        pytest.skip("no database to run against: {}".format(e))
+    import Database
+    return Database
+
+
+# empty tables, dropped again after the test
+@pytest.fixture
+def tables(database):
+    database.dropTables()
+    database.createTables()
+    yield database
+    database.dropTables()
+
+
+# the benchmark.equivalence workload loaded into fresh tables
+@pytest.fixture
+def workload(database):
+    from benchmark.equivalence import Workload
+    workload = Workload(seed=7)
+    workload.load()
+    yield workload
+    database.dropTables()
@@ -0,0 +1,121 @@
+import threading
+import time
+import pytest
+import Utility.BatchLoader as BatchLoader
+
+
+class Batch:
+    def __init__(self, fail: bool = False):
+        self.calls = []
+        self.fail = fail
+
+    def __call__(self, keys: list) -> list:
+        self.calls.append(list(keys))
+        if self.fail:
+            raise ValueError("batch failed")
+        return [key * 10 for key in keys]
+
+
+# load(key) of every key on its own thread, all started together, the values (or exceptions) in the order of keys
+def loadTogether(load, keys: list) -> list:
+    results = [None] * len(keys)
+    start = threading.Barrier(len(keys))
+
+    def run(position, key):
+        start.wait()
+        try:
+            results[position] = load(key)
+        except Exception as e:
+            results[position] = e
+    threads = [threading.Thread(target=run, args=(position, key)) for position, key in enumerate(keys)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    return results
+
+
+def test_concurrent_loads_are_coalesced_and_each_gets_its_own_value():
+    batch = Batch()
+    loader = BatchLoader.BatchLoader(batch, window=0.2, maxBatchSize=100)
+    keys = [1, 2, 3, 2, 5, 6, 7, 1]
+    assert loadTogether(loader.load, keys) == [key * 10 for key in keys]
+    assert len(batch.calls) == 1
+    assert sorted(batch.calls[0]) == [1, 2, 3, 5, 6, 7]
+    stats = loader.stats()
+    assert (stats["batches"], stats["requests"], stats["largest"], stats["histogram"]) == (1, 8, 8, {8: 1})
+
+
+def test_a_full_batch_is_dispatched_without_waiting_for_the_window():
+    batch = Batch()
+    loader = BatchLoader.BatchLoader(batch, window=30.0, maxBatchSize=4)
+    started = time.monotonic()
+    assert loadTogether(loader.load, [1, 2, 3, 4]) == [10, 20, 30, 40]
+    assert time.monotonic() - started < 10
+    assert len(batch.calls) == 1
+
+
+def test_a_lone_load_waits_for_the_window_only():
+    loader = BatchLoader.BatchLoader(Batch(), window=0.01)
+    assert loader.load(4) == 40
+    assert loader.stats()["mean"] == 1.0
+
+
+def test_every_caller_of_a_failed_batch_gets_its_exception():
+    loader = BatchLoader.BatchLoader(Batch(fail=True), window=0.2)
+    results = loadTogether(loader.load, [1, 2, 3])
+    assert [type(result) for result in results] == [ValueError] * 3
+
+
+@pytest.fixture
+def registered():
+    batch = Batch()
+    BatchLoader.register("testLoad", batch)
+    yield batch
+    BatchLoader.configureCoalescing(enabled=False)
+    BatchLoader._batches.pop("testLoad", None)
+
+
+def test_loads_go_through_a_loader_only_when_coalescing_is_on(registered):
+    assert BatchLoader.load("testLoad", 1) == (False, None)
+    BatchLoader.configureCoalescing(window=0.01)
+    assert BatchLoader.load("testLoad", 1) == (True, 10)
+    assert BatchLoader.load("testLoad", "1") == (False, None)
+    assert BatchLoader.load("testLoad", 2 ** 31) == (False, None)
+    assert BatchLoader.load("unregistered", 1) == (False, None)
+    assert BatchLoader.coalescingStats()["testLoad"]["requests"] == 1
+
+
+def test_coalesced_reads_agree_with_the_plain_ones(database, workload):
+    workload.round(1)
+    reads = [("getPlayerProfile", lambda player: player.getAge(), range(-1, 30)),
+             ("stadiumTotalGoals", None, range(0, 14)), ("averageAttendanceInStadium", None, range(0, 14))]
+    expected = {name: [getattr(database, name)(key) for key in keys] for name, _, keys in reads}
+    BatchLoader.configureCoalescing(window=0.05)
+    try:
+        for name, field, keys in reads:
+            results = loadTogether(getattr(database, name), list(keys))
+            if field is not None:
+                results, expected[name] = list(map(field, results)), list(map(field, expected[name]))
+            assert results == expected[name], name
+            assert BatchLoader.coalescingStats()[name]["batches"] < len(keys)
+    finally:
+        BatchLoader.configureCoalescing(enabled=False)
+
+
+# what every call gave, an exception by its type
+def outcomes(results: list) -> list:
+    return [type(result) if isinstance(result, Exception) else result for result in results]
+
+
+def test_an_id_out_of_range_fails_no_other_call_of_its_batch(database, workload):
+    workload.round(1)
+    keys = [1, 2 ** 40, 2, -2 ** 40, 3]
+    for name in ("averageAttendanceInStadium", "stadiumTotalGoals"):
+        expected = outcomes(loadTogether(getattr(database, name), keys))
+        BatchLoader.configureCoalescing(window=0.2)
+        try:
+            assert outcomes(loadTogether(getattr(database, name), keys)) == expected, name
+            assert BatchLoader.coalescingStats()[name]["requests"] == 3
+        finally:
+            BatchLoader.configureCoalescing(enabled=False)
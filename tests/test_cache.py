@@ -0,0 +1,110 @@
+import pytest
+import Utility.Cache as Cache
+
+
+# the process-wide cache, turned off again after the test
+@pytest.fixture
+def cache():
+    Cache.configureCache(capacity=100, ttl=60.0)
+    yield Cache.getCache()
+    Cache.configureCache(enabled=False)
+
+
+def put(cache, cacheKey, value, dependencies, ttl=None):
+    cache.put(cacheKey, value, dependencies, cache.token(dependencies), ttl)
+
+
+def test_entries_expire_after_their_ttl(clock):
+    cache = Cache.Cache(capacity=10, ttl=10.0)
+    put(cache, "a", 1, [("R", 1)])
+    put(cache, "b", 2, [("R", 2)], ttl=1.0)
+    clock.now += 9.9
+    assert cache.get("a") == (True, 1)
+    assert cache.get("b") == (False, None)
+    clock.now += 0.2
+    assert cache.get("a") == (False, None)
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["expirations"], stats["size"]) == (1, 2, 2, 0)
+
+
+def test_the_least_recently_used_entry_is_evicted(clock):
+    cache = Cache.Cache(capacity=2, ttl=10.0)
+    put(cache, "a", 1, [("R", 1)])
+    put(cache, "b", 2, [("R", 2)])
+    cache.get("a")
+    put(cache, "c", 3, [("R", 3)])
+    assert [cache.get(key)[0] for key in ("a", "b", "c")] == [True, False, True]
+    assert cache.stats()["evictions"] == 1
+
+
+def test_a_keyed_write_drops_the_readers_of_its_key_and_of_the_whole_relation(clock):
+    cache = Cache.Cache()
+    put(cache, "one", 1, [("R", 1)])
+    put(cache, "two", 2, [("R", 2)])
+    put(cache, "all", 3, [("R", None)])
+    put(cache, "other", 4, [("S", 1)])
+    cache.invalidate("R", 1)
+    assert [cache.get(key)[0] for key in ("one", "two", "all", "other")] == [False, True, False, True]
+    cache.invalidate("R")
+    assert [cache.get(key)[0] for key in ("two", "other")] == [False, True]
+    assert cache.stats()["invalidations"] == 3
+
+
+def test_a_read_that_a_write_overtook_is_not_stored(clock):
+    cache = Cache.Cache()
+    token = cache.token([("R", 1)])
+    cache.invalidate("R", 2)
+    cache.put("stale", 1, [("R", 1)], token)
+    assert cache.get("stale") == (False, None)
+    token = cache.token([("R", 1)])
+    cache.clear()
+    cache.put("stale", 1, [("R", 1)], token)
+    assert cache.get("stale") == (False, None)
+    cache.put("fresh", 1, [("R", 1)], cache.token([("R", 1)]))
+    assert cache.get("fresh") == (True, 1)
+
+
+def test_cached_reads_are_served_until_a_write_invalidates_them(cache):
+    stored, calls = {1: [1], 2: [2]}, []
+
+    @Cache.cached(lambda key: [("R", key)], unless=-1)
+    def read(key):
+        calls.append(key)
+        return list(stored[key]) if key in stored else -1
+
+    @Cache.invalidates(lambda key, value: [("R", key)], lambda result: result == "ok")
+    def write(key, value):
+        if value is None:
+            return "error"
+        stored[key] = [value]
+        return "ok"
+
+    assert (read(1), read(1), read(2)) == ([1], [1], [2])
+    assert calls == [1, 2]
+    read(1).append(5)
+    assert read(1) == [1]
+    write(1, None)
+    assert read(1) == [1] and calls == [1, 2]
+    write(1, 7)
+    assert (read(1), read(2)) == ([7], [2])
+    assert calls == [1, 2, 1]
+
+
+def test_error_values_and_non_int_arguments_are_not_cached(cache):
+    calls = []
+
+    @Cache.cached(lambda key: [("R", key)], unless=-1)
+    def read(key):
+        calls.append(key)
+        return -1 if key == 3 else 0
+
+    read(3), read(3), read("4"), read("4")
+    assert calls == [3, 3, "4", "4"]
+    assert cache.stats()["size"] == 0
+
+
+def test_write_keys_other_than_ints_drop_the_whole_relation(cache):
+    put(cache, "one", 1, [("R", 1)])
+    put(cache, "two", 2, [("R", 2)])
+    Cache.invalidate([("R", "1")])
+    assert [cache.get(key)[0] for key in ("one", "two")] == [False, False]
@@ -0,0 +1,77 @@
+import pytest
+import Utility.IdentityMap as IdentityMap
+import Utility.Notify as Notify
+from Business.Player import Player
+
+
+# the process-wide identity map, turned off again after the test
+@pytest.fixture
+def identities():
+    IdentityMap.configureIdentityMap(capacity=100, ttl=300.0, negativeTtl=5.0)
+    yield
+    IdentityMap.configureIdentityMap(enabled=False)
+
+
+def remember(kind: str, entityID: int, entity):
+    hit, _, token = IdentityMap.lookup(kind, entityID)
+    assert not hit
+    IdentityMap.remember(kind, entityID, entity, token)
+
+
+def test_a_missing_id_is_remembered_for_the_negative_ttl_only(clock, identities):
+    remember("Player", 1, None)
+    remember("Player", 2, Player(2, 1, 25, 180, "Left"))
+    assert IdentityMap.lookup("Player", 1) == (True, None, None)
+    clock.now += 5.1
+    assert IdentityMap.lookup("Player", 1)[0] is False
+    assert IdentityMap.lookup("Player", 2)[0] is True
+    stats = IdentityMap.identityMapStats()
+    assert (stats["negative_hits"], stats["expirations"]) == (1, 1)
+
+
+def test_every_lookup_hands_out_its_own_copy(clock, identities):
+    player = Player(1, 1, 25, 180, "Left")
+    remember("Player", 1, player)
+    player.setAge(40)
+    first = IdentityMap.lookup("Player", 1)[1]
+    first.setAge(50)
+    second = IdentityMap.lookup("Player", 1)[1]
+    assert second is not first
+    assert second.getAge() == 25
+
+
+def test_a_write_to_the_id_drops_its_entry(clock, identities):
+    remember("Player", 1, None)
+    remember("Player", 2, None)
+    hit, _, token = IdentityMap.lookup("Player", 3)
+    Notify.dispatch([("Player", 1), ("Player", 3)])
+    IdentityMap.remember("Player", 3, None, token)
+    assert [IdentityMap.lookup("Player", i)[0] for i in (1, 2, 3)] == [False, True, False]
+
+
+def test_ids_that_are_not_ints_bypass_the_map(clock, identities):
+    assert IdentityMap.lookup("Player", "1") == (False, None, None)
+    IdentityMap.remember("Player", "1", None, None)
+    assert IdentityMap.identityMapStats()["size"] == 0
+
+
+def test_a_missing_profile_is_found_once_it_is_added(tables, identities):
+    db = tables
+    assert db.getPlayerProfile(1).getPlayerID() is None
+    assert db.getPlayerProfile(1).getPlayerID() is None
+    assert IdentityMap.identityMapStats()["negative_hits"] == 1
+    db.addTeam(1)
+    db.addPlayer(Player(1, 1, 25, 180, "Left"))
+    assert IdentityMap.identityMapStats()["size"] == 0
+    assert db.getPlayerProfile(1).getAge() == 25
+    assert [player.getPlayerID() for player in db.getPlayerProfiles([2, 1])] == [None, 1]
+
+
+def test_changing_a_profile_changes_no_one_elses(tables, identities):
+    db = tables
+    db.addTeam(1)
+    db.addPlayer(Player(1, 1, 25, 180, "Left"))
+    db.getPlayerProfile(1).setAge(99)
+    db.getPlayerProfiles([1])[0].setHeight(99)
+    player = db.getPlayerProfile(1)
+    assert (player.getAge(), player.getHeight()) == (25, 180)
@@ -0,0 +1,62 @@
+import json
+import math
+import random
+import pytest
+from Utility.Metrics import Histogram, GROWTH, LOWEST
+
+
+def exactPercentile(samples: list, p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[max(1, int(math.ceil(p / 100.0 * len(ordered)))) - 1]
+
+
+def test_percentiles_are_within_one_bucket_of_the_exact_ones():
+    rng = random.Random(3)
+    samples = [rng.lognormvariate(-7, 1.5) for _ in range(5000)]
+    histogram = Histogram()
+    for sample in samples:
+        histogram.record(sample)
+    for p in (1, 50, 90, 95, 99, 99.9, 100):
+        exact = exactPercentile(samples, p)
+        assert exact / GROWTH <= histogram.percentile(p) <= exact * GROWTH, p
+    assert histogram.percentile(100) == max(samples)
+    assert histogram.count() == len(samples)
+    assert histogram.total() == pytest.approx(sum(samples))
+
+
+def test_small_and_single_samples():
+    assert Histogram().percentile(50) == 0.0
+    histogram = Histogram()
+    histogram.record(0.0123)
+    assert histogram.percentile(50) == 0.0123
+    histogram.record(LOWEST / 10)
+    assert histogram.percentile(50) <= LOWEST * GROWTH
+
+
+def test_merged_histograms_equal_one_that_recorded_everything():
+    rng = random.Random(5)
+    samples = [rng.uniform(0.0001, 0.5) for _ in range(2000)]
+    whole, parts = Histogram(), [Histogram() for _ in range(3)]
+    for position, sample in enumerate(samples):
+        whole.record(sample)
+        parts[position % 3].record(sample)
+    merged = Histogram()
+    merged.merge(parts[0])
+    merged.mergeDict(json.loads(json.dumps(parts[1].toDict())))
+    merged.merge(Histogram.fromDict(parts[2].toDict()))
+    expected, got = whole.toDict(), merged.toDict()
+    assert (got["buckets"], got["count"], got["max"]) == (expected["buckets"], expected["count"], expected["max"])
+    assert got["sum"] == pytest.approx(expected["sum"])
+    for p in (50, 95, 99):
+        assert merged.percentile(p) == whole.percentile(p)
+
+
+def test_summary_is_in_microseconds():
+    histogram = Histogram()
+    for sample in (0.001, 0.002, 0.003):
+        histogram.record(sample)
+    summary = histogram.summary()
+    assert summary["count"] == 3
+    assert summary["mean_us"] == pytest.approx(2000)
+    assert summary["max_us"] == pytest.approx(3000)
+    assert 2000 <= summary["p50_us"] <= 2000 * GROWTH
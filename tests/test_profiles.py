@@ -0,0 +1,65 @@
+import random
+import pytest
+import Utility.IdentityMap as IdentityMap
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+
+
+def fields(entity) -> tuple:
+    if isinstance(entity, Player):
+        return entity.getPlayerID(), entity.getTeamID(), entity.getAge(), entity.getHeight(), entity.getFoot()
+    if isinstance(entity, Match):
+        return entity.getMatchID(), entity.getCompetition(), entity.getHomeTeamID(), entity.getAwayTeamID()
+    return entity.getStadiumID(), entity.getCapacity(), entity.getBelongsTo()
+
+
+@pytest.fixture
+def league(tables):
+    db = tables
+    db.addTeams(range(1, 5))
+    db.addPlayers([Player(p, p % 4 + 1, 20 + p % 10, 170 + p, "Left") for p in range(1, 31)])
+    db.addMatches([Match(m, "Domestic", 1, m % 3 + 2) for m in range(1, 11)])
+    db.addStadiums([Stadium(s, 40000 + s, s) for s in range(1, 4)])
+    return db
+
+
+@pytest.fixture(params=[False, True], ids=["without identity map", "with identity map"])
+def identities(request):
+    IdentityMap.configureIdentityMap(capacity=20, enabled=request.param)
+    yield request.param
+    IdentityMap.configureIdentityMap(enabled=False)
+
+
+@pytest.mark.parametrize("kind, largest", [("Player", 32), ("Match", 12), ("Stadium", 5)])
+def test_profiles_agree_with_one_call_per_id(league, identities, kind, largest):
+    db = league
+    rng = random.Random(largest)
+    many, one = getattr(db, "get{}Profiles".format(kind)), getattr(db, "get{}Profile".format(kind))
+    for _ in range(30):
+        ids = [rng.choice([None, "1", 1.0, 2 ** 40, -2 ** 31 - 1]) if rng.random() < 0.1 else rng.randint(-1, largest)
+               for _ in range(rng.randint(0, 25))]
+        expected = [fields(one(i)) if type(i) is int else fields(one(-1)) for i in ids]
+        assert [fields(entity) for entity in many(ids)] == expected, ids
+
+
+def test_held_ids_are_not_read_again(league):
+    db = league
+    IdentityMap.configureIdentityMap(capacity=20)
+    try:
+        db.getPlayerProfiles([3, 1, 40, 3])
+        before = IdentityMap.identityMapStats()
+        assert before["size"] == 3
+        assert [p.getPlayerID() for p in db.getPlayerProfiles([40, 1, 3])] == [None, 1, 3]
+        after = IdentityMap.identityMapStats()
+        assert (after["hits"] - before["hits"], after["misses"] - before["misses"]) == (3, 0)
+    finally:
+        IdentityMap.configureIdentityMap(enabled=False)
+
+
+def test_an_id_out_of_range_is_bad_without_failing_the_others(league, identities):
+    db = league
+    assert [p.getPlayerID() for p in db.getPlayerProfiles([1, 2 ** 40, 2, -2 ** 31 - 1, 2 ** 31 - 1])] == \
+        [1, None, 2, None, None]
+    assert [m.getMatchID() for m in db.getMatchProfiles([2 ** 31, 3])] == [None, 3]
+    assert [s.getStadiumID() for s in db.getStadiumProfiles([1, -2 ** 40])] == [1, None]
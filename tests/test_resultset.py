@@ -0,0 +1,65 @@
+from array import array
+from collections import namedtuple
+import Database
+from Utility.DBConnector import ResultSet, ResultRow
+
+Column = namedtuple("Column", "name")
+
+
+# column names come lower case from the server, like psycopg2's cursor.description
+def resultSet(names: tuple, rows: list) -> ResultSet:
+    return ResultSet([Column(name) for name in names], rows)
+
+
+def test_the_fetched_rows_are_kept_as_they_are():
+    rows = [(1, "Left", 190), (2, "Right", 180)]
+    result = resultSet(("player_id", "foot", "height"), rows)
+    assert result.rows is rows
+    assert (len(result), result.size(), result.isEmpty()) == (2, 2, False)
+    assert list(result) == rows
+    assert result.cols_header == ["player_id", "foot", "height"]
+    assert (result.cols["FOOT"], result.cols["height"], result.cols[0]) == (1, 2, None)
+
+
+def test_rows_are_read_by_name_position_or_attribute():
+    result = resultSet(("player_id", "foot", "height"), [(1, "Left", 190), (2, "Right", 180)])
+    row = result[1]
+    assert isinstance(row, ResultRow)
+    assert (row["foot"], row["FOOT"], row[0], row.height, row.Player_ID) == ("Right", "Right", 2, 180, 2)
+    assert (row.get("age"), row.get("age", 0), len(row), list(row)) == (None, 0, 3, [2, "Right", 180])
+    assert row.keys() == ["player_id", "foot", "height"]
+    assert row.items() == [("player_id", 2), ("foot", "Right"), ("height", 180)]
+    assert row == (2, "Right", 180) and row == result[1] and row != result[0]
+    assert [r.player_id for r in result.iterRows()] == [1, 2]
+
+
+def test_a_row_past_the_end_is_an_empty_dict(capsys):
+    result = resultSet(("id",), [(1,)])
+    assert result[5] == {}
+    assert "Invalid row 5" in capsys.readouterr().out
+
+
+def test_columns_come_out_as_lists_or_arrays():
+    result = resultSet(("id", "goals"), [(1, 3), (2, 0), (3, 7)])
+    assert result.column("GOALS") == [3, 0, 7]
+    assert result.column(0, "q") == array("q", [1, 2, 3])
+
+
+def test_an_empty_result_has_no_columns():
+    for result in (ResultSet(), resultSet(("id",), [])):
+        assert (result.rows, result.cols_header, result.isEmpty(), list(result.iterRows())) == ([], [], True, [])
+
+
+def test_rows_convert_to_library_objects_in_any_column_order():
+    players = Database.playersFromResultSet(resultSet(("player_id", "team_id", "age", "height", "preferred_foot"),
+                                                      [(1, 2, 25, 190, "Left"), (2, 2, 30, 180, "Right")]))
+    assert [(p.getPlayerID(), p.getTeamID(), p.getAge(), p.getHeight(), p.getFoot()) for p in players] == \
+        [(1, 2, 25, 190, "Left"), (2, 2, 30, 180, "Right")]
+    stadiums = Database.stadiumsFromResultSet(resultSet(("stadium_id", "belong_to", "capacity", "extra"),
+                                                        [(4, None, 50000, "x"), (5, 3, 60000, "y")]))
+    assert [(s.getStadiumID(), s.getCapacity(), s.getBelongsTo()) for s in stadiums] == [(4, 50000, None), (5, 60000, 3)]
+    matches = Database.matchesFromResultSet(resultSet(("awayteam_id", "match_id", "hometeam_id", "competition"),
+                                                      [(2, 9, 1, "Domestic")]))
+    assert [(m.getMatchID(), m.getCompetition(), m.getHomeTeamID(), m.getAwayTeamID()) for m in matches] == \
+        [(9, "Domestic", 1, 2)]
+    assert Database.playersFromResultSet(ResultSet()) == []
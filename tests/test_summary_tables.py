@@ -0,0 +1,139 @@
+import pytest
+import Utility.DBConnector as Connector
+from Utility.Exceptions import DatabaseException
+from Business.Match import Match
+from Business.Player import Player
+from Business.Stadium import Stadium
+from benchmark.equivalence import differences, tableDifferences
+
+ROUNDS = 12
+
+
+def execute(query: str):
+    conn = Connector.DBConnector()
+    try:
+        conn.execute(query)
+    finally:
+        conn.close()
+
+
+def test_stadium_stats_follow_every_write(database, workload):
+    for number in range(1, ROUNDS + 1):
+        workload.round(number)
+        assert differences(["StadiumStats"]) == [], number
+        assert database.checkStadiumStats() == [], number
+
+
+def test_deleting_a_match_takes_its_goals_and_attendance_out(tables):
+    db = tables
+    db.addTeams([1, 2])
+    db.addStadium(Stadium(1, 50000, 1))
+    db.addMatches([Match(1, "Domestic", 1, 2), Match(2, "Domestic", 2, 1)])
+    db.addPlayer(Player(1, 1, 25, 180, "Left"))
+    db.matchesInStadiums([(Match(1), Stadium(1), 100), (Match(2), Stadium(1), 300)])
+    db.playersScoredInMatches([(Match(1), Player(1), 3), (Match(2), Player(1), 1)])
+    assert (db.stadiumTotalGoals(1), db.averageAttendanceInStadium(1)) == (4, 200)
+    db.deleteMatch(Match(1, "Domestic", 1, 2))
+    assert (db.stadiumTotalGoals(1), db.averageAttendanceInStadium(1)) == (1, 300)
+    db.deletePlayer(Player(1, 1, 25, 180, "Left"))
+    assert db.stadiumTotalGoals(1) == 0
+    assert db.checkStadiumStats() == []
+
+
+def test_goals_of_a_match_without_a_stadium_count_nowhere(tables):
+    db = tables
+    db.addTeams([1, 2])
+    db.addStadium(Stadium(1, 50000, 1))
+    db.addMatch(Match(1, "Domestic", 1, 2))
+    db.addPlayer(Player(1, 1, 25, 180, "Left"))
+    db.playerScoredInMatch(Match(1), Player(1), 2)
+    assert db.getMostAttractiveStadiums() == [1]
+    assert db.stadiumTotalGoals(1) == 0
+    db.matchInStadium(Match(1), Stadium(1), 1000)
+    assert db.stadiumTotalGoals(1) == 2
+    db.matchNotInStadium(Match(1), Stadium(1))
+    assert db.stadiumTotalGoals(1) == 0
+    assert db.checkStadiumStats() == []
+
+
+def test_check_stadium_stats_reports_wrong_and_missing_rows(database, workload):
+    workload.round(1)
+    execute("UPDATE StadiumStats SET total_goals = total_goals + 1 WHERE stadium_id = 2; \
+             DELETE FROM StadiumStats WHERE stadium_id = 5")
+    assert database.checkStadiumStats() == [2, 5]
+    missing, extra = tableDifferences("StadiumStats")
+    assert [row[0] for row in missing] == [2, 5]
+    assert [row[0] for row in extra] == [2]
+
+
+def test_check_stadium_stats_raises_when_it_cannot_run(tables):
+    db = tables
+    db.dropTables()
+    with pytest.raises(DatabaseException.UNKNOWN_ERROR):
+        db.checkStadiumStats()
+
+
+def test_team_activity_follows_every_write(database, workload):
+    for number in range(1, ROUNDS + 1):
+        workload.round(number)
+        assert differences(["TeamActivity"]) == [], number
+
+
+def test_a_team_is_active_and_tall_from_its_second_pair(tables):
+    db = tables
+    db.addTeams([1, 2, 3])
+    db.addPlayer(Player(1, 1, 25, 195, "Left"))
+    db.addMatch(Match(1, "Domestic", 1, 2))
+    assert db.getActiveTallTeams() == []
+    db.addMatch(Match(2, "International", 3, 1))
+    assert db.getActiveTallTeams() == [1]
+    db.deleteMatch(Match(2, "International", 3, 1))
+    db.addPlayer(Player(2, 1, 25, 191, "Right"))
+    db.addPlayer(Player(3, 2, 25, 190, "Right"))
+    assert db.getActiveTallTeams() == [1]
+    db.deletePlayer(Player(1, 1, 25, 195, "Left"))
+    assert db.getActiveTallTeams() == []
+
+
+def test_player_goals_follow_every_write(database, workload):
+    for number in range(1, ROUNDS + 1):
+        workload.round(number)
+        assert differences(["PlayerGoals"]) == [], number
+        teams = list(range(0, workload.league.teams + 2))
+        assert database.mostGoalsForTeams(teams, 5) == {team: database.mostGoalsForTeam(team) for team in teams}
+
+
+def test_top_scorers_break_ties_by_the_higher_id(tables):
+    db = tables
+    db.addTeams([1, 2])
+    db.addMatch(Match(1, "Domestic", 1, 2))
+    db.addPlayers([Player(p, 1, 25, 180, "Left") for p in range(1, 8)])
+    db.playersScoredInMatches([(Match(1), Player(2), 2), (Match(1), Player(5), 2), (Match(1), Player(3), 1)])
+    assert db.mostGoalsForTeam(1) == [5, 2, 3, 7, 6]
+    assert db.mostGoalsForTeams([2, 1, 3], 2) == {2: [], 1: [5, 2], 3: []}
+    assert db.mostGoalsForTeams([1, 2], -1) == {}
+    assert db.mostGoalsForTeams([1, 2 ** 40], 2) == {}
+    db.playerDidntScoreInMatch(Match(1), Player(5))
+    assert db.mostGoalsForTeam(1) == [2, 3, 7, 6, 5]
+
+
+def test_co_scoring_follows_every_write(database, workload):
+    for number in range(1, ROUNDS + 1):
+        workload.round(number)
+        assert differences(["CoScoring"]) == [], number
+
+
+def test_a_pair_goes_with_its_last_shared_match(tables):
+    db = tables
+    db.addTeams([1, 2])
+    db.addMatches([Match(m, "Domestic", 1, 2) for m in (1, 2, 3)])
+    db.addPlayers([Player(p, 1, 25, 180, "Left") for p in (1, 2, 3)])
+    db.playersScoredInMatches([(Match(1), Player(1), 1), (Match(1), Player(2), 1), (Match(2), Player(1), 1),
+                               (Match(2), Player(2), 1), (Match(3), Player(1), 1), (Match(3), Player(3), 1)])
+    assert (db.getClosePlayers(1), db.getClosePlayers(2), db.getClosePlayers(3)) == ([2], [1], [1])
+    assert tableDifferences("CoScoring") == ([], [])
+    db.deleteMatch(Match(1, "Domestic", 1, 2))
+    assert (db.getClosePlayers(1), db.getClosePlayers(2)) == ([2, 3], [1])
+    db.playerDidntScoreInMatch(Match(2), Player(2))
+    assert (db.getClosePlayers(1), db.getClosePlayers(2)) == ([3], [])
+    assert tableDifferences("CoScoring") == ([], [])
@@ -0,0 +1,261 @@
+import asyncio
+from collections import deque
+import os
+import time
+import psycopg2
+from psycopg2 import extensions
+import Utility.DBConnector as Connector
+from Utility.DBConnector import PooledConnection, ResultSet, violations
+from Utility.Exceptions import DatabaseException
+
+
+# lets the event loop run until an asynchronous connection has finished its current operation, watching
+# the connection's socket instead of blocking on it. errors of the operation are raised from poll()
+async def _wait(connection):
+    loop = asyncio.get_running_loop()
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            return
+        future = loop.create_future()
+
+        def ready():
+            if not future.done():
+                future.set_result(None)
+
+        fd = connection.fileno()
+        if state == extensions.POLL_READ:
+            loop.add_reader(fd, ready)
+            try:
+                await future
+            finally:
+                loop.remove_reader(fd)
+        elif state == extensions.POLL_WRITE:
+            loop.add_writer(fd, ready)
+            try:
+                await future
+            finally:
+                loop.remove_writer(fd)
+        else:
+            raise psycopg2.OperationalError("bad state from poll: " + str(state))
+
+
+class AsyncConnectionPool:
+    # pool of asynchronous psycopg2 connections for the coroutines of one event loop. at most maxSize
+    # connections are ever open, a coroutine that finds them all checked out waits (without blocking
+    # the loop) for one to come back, for at most checkoutTimeout seconds. asynchronous connections
+    # are always in autocommit, every statement commits on its own
+    def __init__(self, params: dict, maxSize=10, checkoutTimeout=30.0):
+        if maxSize < 1:
+            raise ValueError("pool size must satisfy maxSize >= 1")
+        self.maxSize = maxSize
+        self.checkoutTimeout = checkoutTimeout
+        self.pid = os.getpid()
+        self.loop = asyncio.get_running_loop()
+        self.__params = params
+        self.__idle = deque()
+        self.__waiters = deque()  # futures of the coroutines waiting for a connection
+        self.__size = 0
+        self.__closed = False
+        self.__stats = {"checkouts": 0, "waits": 0, "creations": 0, "discards": 0, "timeouts": 0}
+
+    async def getConnection(self):
+        deadline = time.monotonic() + self.checkoutTimeout
+        self.__stats["checkouts"] += 1
+        waited = False
+        while True:
+            if self.__closed:
+                raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+            if len(self.__idle) > 0:
+                connection = self.__idle.pop()
+                if not connection.closed:
+                    return connection
+                self.__discard(connection)
+                continue
+            if self.__size < self.maxSize:
+                self.__size += 1
+                return await self.__create()
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.__stats["timeouts"] += 1
+                raise DatabaseException.ConnectionInvalid("Timed out waiting for a pooled connection")
+            if not waited:
+                waited = True
+                self.__stats["waits"] += 1
+            # woken with a returned connection, or with None when a slot was freed
+            waiter = self.loop.create_future()
+            self.__waiters.append(waiter)
+            timer = self.loop.call_later(remaining, self.__expire, waiter)
+            try:
+                connection = await waiter
+            except BaseException:
+                if waiter.done() and not waiter.cancelled() and waiter.result() is not None:
+                    self.putConnection(waiter.result())
+                raise
+            finally:
+                timer.cancel()
+            if connection is not None:
+                return connection
+
+    # give a borrowed connection back, one left in the middle of a query (its coroutine was cancelled)
+    # or broken is closed instead
+    def putConnection(self, connection):
+        if connection.closed or self.__closed or connection.isexecuting():
+            self.__discard(connection)
+            return
+        while len(self.__waiters) > 0:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(connection)
+                return
+        self.__idle.append(connection)
+
+    def close(self):
+        self.__closed = True
+        idle = list(self.__idle)
+        self.__idle.clear()
+        self.__size -= len(idle)
+        for connection in idle:
+            connection.close()
+        while len(self.__waiters) > 0:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def stats(self) -> dict:
+        stats = dict(self.__stats)
+        stats["size"] = self.__size
+        stats["idle"] = len(self.__idle)
+        stats["in_use"] = self.__size - len(self.__idle)
+        stats["waiting"] = len(self.__waiters)
+        return stats
+
+    async def __create(self):
+        connection = None
+        try:
+            connection = psycopg2.connect(connection_factory=PooledConnection, async_=True, **self.__params)
+            await _wait(connection)
+        except BaseException as e:
+            if connection is not None:
+                connection.close()
+            self.__release()
+            if isinstance(e, Exception):
+                raise DatabaseException.ConnectionInvalid("Could not connect to database")
+            raise
+        self.__stats["creations"] += 1
+        return connection
+
+    def __discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        self.__stats["discards"] += 1
+        self.__release()
+
+    # checkoutTimeout passed for a waiting coroutine, it wakes up with None and times out
+    def __expire(self, waiter):
+        if not waiter.done():
+            waiter.set_result(None)
+
+    # a connection slot was freed, the first waiter may open a new one
+    def __release(self):
+        self.__size -= 1
+        while len(self.__waiters) > 0:
+            waiter = self.__waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+
+
+_asyncPool = None
+_asyncPoolSettings = {}
+
+
+# change the settings of the asynchronous pool (maxSize, checkoutTimeout), the current pool is closed and
+# a new one is created on next use
+def configureAsyncPool(**settings):
+    global _asyncPool
+    _asyncPoolSettings.update(settings)
+    pool, _asyncPool = _asyncPool, None
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+# the pool of the running event loop, a pool made for another loop (or inherited through fork()) is
+# replaced since its connections and waiters belong to that loop
+def getAsyncPool() -> AsyncConnectionPool:
+    global _asyncPool
+    loop = asyncio.get_running_loop()
+    if _asyncPool is None or _asyncPool.loop is not loop or _asyncPool.pid != os.getpid():
+        if _asyncPool is not None and _asyncPool.pid == os.getpid() and not _asyncPool.loop.is_closed():
+            _asyncPool.close()
+        _asyncPool = AsyncConnectionPool(Connector.DBConnector.parameters(), **_asyncPoolSettings)
+    return _asyncPool
+
+
+def closeAsyncPool():
+    global _asyncPool
+    pool, _asyncPool = _asyncPool, None
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+def asyncPoolStats() -> dict:
+    pool = _asyncPool
+    if pool is None:
+        return {}
+    return pool.stats()
+
+
+class AsyncDBConnector:
+    # use connect(), a connector holds a connection of the running loop's pool until close()
+    def __init__(self, pool: AsyncConnectionPool, connection):
+        self.__pool = pool
+        self.connection = connection
+        self.cursor = connection.cursor()
+
+    @staticmethod
+    async def connect():
+        pool = getAsyncPool()
+        return AsyncDBConnector(pool, await pool.getConnection())
+
+    # the connection goes back to the pool
+    def close(self):
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+        if self.connection is not None:
+            self.__pool.putConnection(self.connection)
+            self.connection = None
+
+    # executes a statement registered with DBConnector.registerStatement, preparing it first if this
+    # connection has not done so yet. returns the number of rows effected and a ResultSet like the
+    # synchronous executePrepared, and raises the same DatabaseExceptions
+    async def executePrepared(self, name: str, params=()) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        statement = Connector._statements[name]
+        if len(params) != statement.paramCount:
+            raise DatabaseException.UNKNOWN_ERROR("Statement " + name + " expects " + str(statement.paramCount) +
+                                                  " parameters")
+        await self.__prepare(statement)
+        with violations():
+            self.cursor.execute(statement.execute, params)
+            await _wait(self.connection)
+        row_effected = max(self.cursor.rowcount, 0)
+        results = self.cursor.fetchall() if self.cursor.description is not None else None
+        return row_effected, ResultSet(self.cursor.description, results)
+
+    async def __prepare(self, statement):
+        connection = self.connection
+        with violations():
+            if connection.preparedGeneration != Connector._statementsGeneration:
+                self.cursor.execute("DEALLOCATE ALL")
+                await _wait(connection)
+                connection.prepared.clear()
+                connection.preparedGeneration = Connector._statementsGeneration
+            if statement.name not in connection.prepared:
+                self.cursor.execute(statement.prepare)
+                await _wait(connection)
+                connection.prepared.add(statement.name)
@@ -0,0 +1,33 @@
+import importlib
+import os
+import threading
+
+# the modules implementing the Database.py API, by backend name
+MODULES = {"postgres": "Database", "memory": "MemoryDatabase"}
+
+_name = os.environ.get("DATABASE_BACKEND", "postgres")
+_module = None
+_lock = threading.Lock()
+
+
+# makes name the backend current() returns from now on and returns its module. the environment variable
+# DATABASE_BACKEND picks the backend of a process that never selects one, postgres when it is not set
+def select(name: str):
+    global _name, _module
+    if name not in MODULES:
+        raise ValueError("unknown backend {}, one of {}".format(name, ", ".join(sorted(MODULES))))
+    module = importlib.import_module(MODULES[name])
+    with _lock:
+        _name, _module = name, module
+    return module
+
+
+# the module of the current backend, for code that should run on either:
+#   db = Backend.current(); db.addTeam(1); db.getActiveTallTeams()
+def current():
+    module = _module
+    return module if module is not None else select(_name)
+
+
+def name() -> str:
+    return _name
@@ -0,0 +1,129 @@
+import threading
+import Utility.DBConnector as Connector
+
+
+# one pending call of BatchLoader.load, filled in by whichever thread dispatches its batch
+class _Slot:
+    __slots__ = ("key", "value", "error", "done")
+
+    def __init__(self, key):
+        self.key = key
+        self.value = None
+        self.error = None
+        self.done = threading.Event()
+
+
+# coalesces single-key calls made from many threads into one call of batch(keys), which returns the values
+# of the keys in the same order. the first call of a batch waits up to window seconds for others to join,
+# a batch that reaches maxBatchSize is dispatched at once, and every caller gets back its own key's value
+# (or the batch's exception)
+class BatchLoader:
+    def __init__(self, batch, window: float = 0.002, maxBatchSize: int = 100):
+        self.batch = batch
+        self.window = window
+        self.maxBatchSize = maxBatchSize
+        self.__pending = []
+        self.__condition = threading.Condition()
+        self.__batches = 0
+        self.__requests = 0
+        self.__largest = 0
+        self.__histogram = {}
+
+    def load(self, key):
+        slot = _Slot(key)
+        with self.__condition:
+            batch = self.__pending
+            batch.append(slot)
+            leader = len(batch) == 1
+            if len(batch) >= self.maxBatchSize:
+                self.__pending = []
+                self.__condition.notify_all()
+            if leader:
+                self.__condition.wait_for(lambda: self.__pending is not batch, self.window)
+                if self.__pending is batch:
+                    self.__pending = []
+        if leader:
+            self.__dispatch(batch)
+        slot.done.wait()
+        if slot.error is not None:
+            raise slot.error
+        return slot.value
+
+    def stats(self) -> dict:
+        with self.__condition:
+            return {"batches": self.__batches, "requests": self.__requests, "largest": self.__largest,
+                    "mean": self.__requests / self.__batches if self.__batches > 0 else 0.0,
+                    "histogram": dict(sorted(self.__histogram.items()))}
+
+    def __dispatch(self, batch: list):
+        keys = list(dict.fromkeys(slot.key for slot in batch))
+        with self.__condition:
+            self.__batches += 1
+            self.__requests += len(batch)
+            self.__largest = max(self.__largest, len(batch))
+            # batch sizes counted in power of two buckets, 1, 2, 4 (3-4), 8 (5-8), ...
+            bucket = 1 << (len(batch) - 1).bit_length()
+            self.__histogram[bucket] = self.__histogram.get(bucket, 0) + 1
+        try:
+            values = dict(zip(keys, self.batch(keys)))
+            for slot in batch:
+                slot.value = values[slot.key]
+        except Exception as e:
+            for slot in batch:
+                slot.error = e
+        finally:
+            for slot in batch:
+                slot.done.set()
+
+
+# the Database.py functions that can coalesce register their batch form here. coalescing is off until
+# configureCoalescing() is called, then each function gets its loader on its first call
+_batches = {}
+_settings = None
+_loaders = {}
+_loadersLock = threading.Lock()
+
+
+# the keys a batch can take, the ids of the INTEGER columns
+_INTEGER = range(-2 ** 31, 2 ** 31)
+
+
+def register(name: str, batch):
+    _batches[name] = batch
+
+
+# turn coalescing on, each batch collecting for up to window seconds and at most maxBatchSize calls, or off
+# with enabled=False. the loaders and their stats start over
+def configureCoalescing(window: float = 0.002, maxBatchSize: int = 100, enabled: bool = True):
+    global _settings, _loaders
+    with _loadersLock:
+        _settings = (window, maxBatchSize) if enabled else None
+        _loaders = {}
+
+
+def _loader(name: str):
+    loader = _loaders.get(name)
+    if loader is None:
+        with _loadersLock:
+            settings = _settings
+            if settings is None or name not in _batches:
+                return None
+            loader = _loaders.setdefault(name, BatchLoader(_batches[name], *settings))
+    return loader
+
+
+# (True, value) when the call of name for key went through its loader, (False, None) when the caller has to
+# run it itself: coalescing is off, the key is not an int of the INTEGER range (which would fail the whole
+# batch's query), or a transaction() is open on this thread
+def load(name: str, key) -> (bool, object):
+    if _settings is None or type(key) is not int or key not in _INTEGER or \
+            Connector.currentTransaction() is not None:
+        return False, None
+    loader = _loader(name)
+    if loader is None:
+        return False, None
+    return True, loader.load(key)
+
+
+def coalescingStats() -> dict:
+    return {name: loader.stats() for name, loader in list(_loaders.items())}
@@ -0,0 +1,250 @@
+from collections import OrderedDict
+from functools import wraps
+import inspect
+import threading
+import time
+import Utility.DBConnector as Connector
+import Utility.Notify as Notify
+
+
+# a bounded LRU of read results, each entry kept for at most ttl seconds. every entry records what it
+# was read from as (relation, key) pairs, key None meaning all of the relation, so that a write can drop
+# exactly the entries it can change: a write to one key of a relation drops the entries that read that
+# key or the whole relation, a write with key None drops every entry that read the relation
+class Cache:
+    def __init__(self, capacity: int = 1024, ttl: float = 60.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        # cache key -> (expiry, value, dependencies), least recently used first
+        self.__entries = OrderedDict()
+        # relation -> {key -> cache keys of the entries that read it}
+        self.__readers = {}
+        # bumped on every invalidation of a relation, a read that saw another generation when it started
+        # may hold data from before the write and is not stored
+        self.__generations = {}
+        self.__epoch = 0
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+        self.__evictions = 0
+        self.__expirations = 0
+        self.__invalidations = 0
+
+    def get(self, cacheKey) -> (bool, object):
+        with self.__lock:
+            entry = self.__entries.get(cacheKey)
+            if entry is not None and entry[0] <= time.monotonic():
+                self.__remove(cacheKey)
+                self.__expirations += 1
+                entry = None
+            if entry is None:
+                self.__misses += 1
+                return False, None
+            self.__entries.move_to_end(cacheKey)
+            self.__hits += 1
+            return True, entry[1]
+
+    # taken before reading from the database and handed back to put
+    def token(self, dependencies: list) -> tuple:
+        with self.__lock:
+            return self.__epoch, tuple(self.__generations.get(relation, 0) for relation, key in dependencies)
+
+    # ttl overrides the cache's own for this entry
+    def put(self, cacheKey, value, dependencies: list, token: tuple, ttl: float = None):
+        with self.__lock:
+            if token != (self.__epoch, tuple(self.__generations.get(relation, 0) for relation, key in dependencies)):
+                return
+            if cacheKey in self.__entries:
+                self.__remove(cacheKey)
+            self.__entries[cacheKey] = (time.monotonic() + (self.ttl if ttl is None else ttl), value, dependencies)
+            for relation, key in dependencies:
+                self.__readers.setdefault(relation, {}).setdefault(key, set()).add(cacheKey)
+            while len(self.__entries) > self.capacity:
+                self.__remove(next(iter(self.__entries)))
+                self.__evictions += 1
+
+    def invalidate(self, relation: str, key=None):
+        with self.__lock:
+            self.__generations[relation] = self.__generations.get(relation, 0) + 1
+            readers = self.__readers.get(relation)
+            if readers is None:
+                return
+            if key is None:
+                cacheKeys = set().union(*readers.values())
+            else:
+                cacheKeys = readers.get(key, set()) | readers.get(None, set())
+            for cacheKey in cacheKeys:
+                if cacheKey in self.__entries:
+                    self.__remove(cacheKey)
+                    self.__invalidations += 1
+
+    def clear(self):
+        with self.__lock:
+            self.__entries.clear()
+            self.__readers.clear()
+            self.__epoch += 1
+
+    def stats(self) -> dict:
+        with self.__lock:
+            return {"hits": self.__hits, "misses": self.__misses, "evictions": self.__evictions,
+                    "expirations": self.__expirations, "invalidations": self.__invalidations,
+                    "size": len(self.__entries), "capacity": self.capacity}
+
+    def __remove(self, cacheKey):
+        expiry, value, dependencies = self.__entries.pop(cacheKey)
+        for relation, key in dependencies:
+            readers = self.__readers[relation]
+            readers[key].discard(cacheKey)
+            if len(readers[key]) == 0:
+                del readers[key]
+
+
+# the process-wide cache is off until configureCache() is called. another process's writes are seen once
+# the entries they change expire, or as soon as they are published with Notify.configureNotifications()
+_cache = None
+_cacheLock = threading.Lock()
+
+
+# turn the cache on with the given capacity and ttl (in seconds), or off with enabled=False,
+# whatever was cached before is dropped
+def configureCache(capacity: int = 1024, ttl: float = 60.0, enabled: bool = True):
+    global _cache
+    with _cacheLock:
+        _cache = Cache(capacity, ttl) if enabled else None
+
+
+def getCache():
+    return _cache
+
+
+def clearCache():
+    cache = _cache
+    if cache is not None:
+        cache.clear()
+
+
+def cacheStats() -> dict:
+    cache = _cache
+    if cache is None:
+        return {}
+    return cache.stats()
+
+
+def _invalidateLocal(changes: list):
+    cache = _cache
+    if cache is None:
+        return
+    for relation, key in changes:
+        cache.invalidate(relation, key)
+
+
+Notify.subscribe(_invalidateLocal, clearCache)
+
+
+# drops what the given (relation, key) pairs can change from every local cache and publishes them to the
+# other processes. inside a transaction() other threads keep reading the committed data until the unit
+# ends, so the entries are dropped again then. only int keys name a row, anything else drops the relation
+def invalidate(changes: list):
+    changes = _keys(changes)
+    Notify.dispatch(changes)
+    unit = Connector.currentTransaction()
+    if unit is not None:
+        unit.onEnd.append(lambda: Notify.dispatch(changes))
+    Notify.publish(changes)
+
+
+# invalidate for the writes of AsyncDatabase.py, which run outside transaction() and publish without
+# blocking the event loop
+async def invalidateAsync(changes: list):
+    changes = _keys(changes)
+    Notify.dispatch(changes)
+    await Notify.publishAsync(changes)
+
+
+def _keys(changes: list) -> list:
+    return [(relation, key if type(key) is int else None) for relation, key in changes]
+
+
+# drops everything here and in the other processes, after the tables were created, cleared or dropped
+def invalidateAll():
+    Notify.resync()
+    Notify.publish(None)
+
+
+# read-through caching of a Database.py read function, keyed by the function and its arguments.
+# dependencies(*args) lists the (relation, key) pairs the result is read from. results equal to
+# unless (the function's error value) are not stored, and calls inside a transaction() bypass the
+# cache since they must see the unit's own writes. only calls with int arguments are cached, the
+# database would read "5" as 5 but a write to 5 would not drop it. a coroutine function (the
+# AsyncDatabase.py variant of a read) shares the entries of the function with the same name
+def cached(dependencies, unless=None):
+    def decorate(fn):
+        name = fn.__name__
+
+        def lookup(args, kwargs):
+            cache = _cache
+            if cache is None or Connector.currentTransaction() is not None or \
+                    not all(type(arg) is int for arg in args + tuple(kwargs.values())):
+                return None, None, False, None
+            cacheKey = (name, args, tuple(sorted(kwargs.items())))
+            hit, value = cache.get(cacheKey)
+            if hit:
+                return cache, cacheKey, True, list(value) if isinstance(value, list) else value
+            return cache, cacheKey, False, None
+
+        def store(cache, cacheKey, reads, token, value):
+            if unless is None or value != unless:
+                cache.put(cacheKey, list(value) if isinstance(value, list) else value, reads, token)
+
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                cache, cacheKey, hit, value = lookup(args, kwargs)
+                if cache is None:
+                    return await fn(*args, **kwargs)
+                if hit:
+                    return value
+                reads = dependencies(*args, **kwargs)
+                token = cache.token(reads)
+                value = await fn(*args, **kwargs)
+                store(cache, cacheKey, reads, token, value)
+                return value
+        else:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                cache, cacheKey, hit, value = lookup(args, kwargs)
+                if cache is None:
+                    return fn(*args, **kwargs)
+                if hit:
+                    return value
+                reads = dependencies(*args, **kwargs)
+                token = cache.token(reads)
+                value = fn(*args, **kwargs)
+                store(cache, cacheKey, reads, token, value)
+                return value
+        wrapper.dependencies = dependencies
+        return wrapper
+    return decorate
+
+
+# invalidation after a Database.py write function, changes(*args) lists the (relation, key) pairs the
+# write can change, applied when succeeded(result) holds. coroutine functions are wrapped the same way
+def invalidates(changes, succeeded):
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @wraps(fn)
+            async def wrapper(*args, **kwargs):
+                result = await fn(*args, **kwargs)
+                if succeeded(result):
+                    await invalidateAsync(changes(*args, **kwargs))
+                return result
+        else:
+            @wraps(fn)
+            def wrapper(*args, **kwargs):
+                result = fn(*args, **kwargs)
+                if succeeded(result):
+                    invalidate(changes(*args, **kwargs))
+                return result
+        wrapper.changes = changes
+        return wrapper
+    return decorate
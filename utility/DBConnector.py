@@ -1,157 +1,872 @@
-import psycopg2
-from psycopg2 import errors, sql
-from configparser import ConfigParser
-from Utility.Exceptions import DatabaseException
-import os
-from typing import Union
-
-
-class ResultSetDict(dict):
-    def __getitem__(self, item):
-        if type(item) is not str:
-            return None
-        return super().__getitem__(item.lower())
-
-
-class ResultSet:
-    # constructor
-    def __init__(self, description=None, results=None):
-        self.rows = []
-        self.cols_header = []
-        self.cols = ResultSetDict()
-        self.__fromQuery(description, results)
-
-    def __getitem__(self, row):
-        return self.__getRow(row)
-
-    # so you can use print(ResultSet)
-    def __str__(self):
-        string = ""
-        for col in self.cols_header:
-            string += str(col) + "   "
-        string += '\n'
-        for row in self.rows:
-            for val in row:
-                string += str(val) + "   "
-            string += '\n'
-        return string
-
-    # what is the size of the ResultSet?
-    def size(self):
-        return len(self.rows)
-
-    # is the ResultSet empty?
-    def isEmpty(self):
-        return self.size() == 0
-
-    def __getRow(self, row: int):
-        if len(self.rows) <= row:
-            print('Invalid row ' + str(row))
-            return ResultSetDict()
-        row_to_return = ResultSetDict()
-        for val, col in zip(self.rows[row], self.cols_header):
-            row_to_return[col] = val
-        return row_to_return
-
-    def __fromQuery(self, description, results: list):
-        if results is None or len(results) == 0:  # no results
-            self.cols = ResultSetDict()
-        else:
-            self.rows = results.copy()
-            self.cols_header = [d.name for d in description]
-            self.cols = ResultSetDict()
-            for col, index in zip(self.cols_header, range(len(results[0]))):
-                self.cols[col] = index
-
-
-class DBConnector:
-    # constructor
-    def __init__(self):
-        try:
-            # Obtain the configuration parameters
-            params = DBConnector.__config()
-            self.connection = psycopg2.connect(**params)
-            self.connection.autocommit = False
-            self.cursor = self.connection.cursor()
-        except Exception as e:
-            self.connection = None
-            self.cursor = None
-            raise DatabaseException.ConnectionInvalid("Could not connect to database")
-
-    # close connection
-    def close(self):
-        if self.cursor is not None:
-            self.cursor.close()
-        if self.connection is not None:
-            self.connection.close()
-
-    # commit connection's changes
-    def commit(self):
-        if self.connection is not None:
-            try:
-                self.connection.commit()
-            except Exception:
-                raise DatabaseException.ConnectionInvalid("Could not commit changes")
-
-    # rollback connection's changes
-    def rollback(self):
-        if self.connection is not None:
-            try:
-                self.connection.rollback()
-            except Exception:
-                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
-
-    # executes the query, if it is SELECT you may ask to print the results with printSchema
-    # returns the number of rows effected and a ResultSet (for SELECT)
-    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
-        if self.connection is None:
-            raise DatabaseException.ConnectionInvalid("Connection Invalid")
-
-        # try execute the query
-        try:
-            self.cursor.execute(query)
-            row_effected = max(self.cursor.rowcount, 0)
-            self.commit()
-        except errors.lookup("23502"):
-            raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
-        except errors.lookup("23503"):
-            raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
-        except errors.lookup("23505"):
-            raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
-        except errors.lookup("23514"):
-            raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
-
-        # get entries in case of SELECT
-        if self.cursor.description is not None:
-            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
-        else:
-            entries = ResultSet()
-
-        # print SELECT entries
-        if printSchema:
-            print(entries)
-
-        return row_effected, entries
-
-    # grant credentials
-    @staticmethod
-    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
-                 section='postgresql'):
-        # create a parser
-        parser = ConfigParser()
-        # read config file
-        parser.read(filename)
-
-        # get section
-        db = {}
-        if parser.has_section(section):
-            params = parser.items(section)
-            for param in params:
-                db[param[0]] = param[1]
-        else:
-            # file not found
-            db = DBConnector.__config(
-                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
-            if db is None:
-                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
-        return db
+import psycopg2
+from psycopg2 import errors, sql, extensions, extras
+from configparser import ConfigParser
+from Utility.Exceptions import DatabaseException
+from array import array
+from collections import deque
+from contextlib import contextmanager
+import io
+from operator import itemgetter
+import os
+import re
+import sys
+import threading
+import time
+from typing import Union
+
+
+class ResultSetDict(dict):
+    def __getitem__(self, item):
+        if type(item) is not str:
+            return None
+        return super().__getitem__(item.lower())
+
+
+# a view of one row of a ResultSet, values are read straight from the fetched tuple through the
+# column index the ResultSet computed once. row["col"] (case insensitive), row[0] and row.col all work
+class ResultRow:
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: tuple, index: dict):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, item):
+        if type(item) is str:
+            return self._values[self._index[item.lower()]]
+        return self._values[item]
+
+    def __getattr__(self, name):
+        try:
+            return self._values[self._index[name.lower()]]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __eq__(self, other):
+        if isinstance(other, ResultRow):
+            return self._values == other._values
+        return self._values == other
+
+    def __repr__(self):
+        return "ResultRow(" + ", ".join(col + "=" + repr(self._values[index]) for col, index in self._index.items()) + ")"
+
+    def get(self, col: str, default=None):
+        index = self._index.get(col.lower())
+        return default if index is None else self._values[index]
+
+    def keys(self):
+        return list(self._index.keys())
+
+    def values(self):
+        return list(self._values)
+
+    def items(self):
+        return [(col, self._values[index]) for col, index in self._index.items()]
+
+
+class ResultSet:
+    __slots__ = ("rows", "cols_header", "cols", "_index")
+
+    # constructor, the fetched rows are kept as they are, not copied
+    def __init__(self, description=None, results=None):
+        self.rows = []
+        self.cols_header = []
+        self.cols = ResultSetDict()
+        self._index = {}
+        self.__fromQuery(description, results)
+
+    def __getitem__(self, row):
+        return self.__getRow(row)
+
+    def __iter__(self):
+        return iter(self.rows)
+
+    def __len__(self):
+        return len(self.rows)
+
+    # so you can use print(ResultSet)
+    def __str__(self):
+        string = ""
+        for col in self.cols_header:
+            string += str(col) + "   "
+        string += '\n'
+        for row in self.rows:
+            for val in row:
+                string += str(val) + "   "
+            string += '\n'
+        return string
+
+    # what is the size of the ResultSet?
+    def size(self):
+        return len(self.rows)
+
+    # is the ResultSet empty?
+    def isEmpty(self):
+        return self.size() == 0
+
+    # every row as a ResultRow view
+    def iterRows(self):
+        index = self._index
+        for values in self.rows:
+            yield ResultRow(values, index)
+
+    # all values of one column, as an array.array when a typecode (e.g. "q" or "d") is given
+    def column(self, col: Union[str, int], typecode: str = None):
+        position = col if type(col) is int else self._index[col.lower()]
+        values = list(map(itemgetter(position), self.rows))
+        if typecode is None:
+            return values
+        return array(typecode, values)
+
+    def __getRow(self, row: int):
+        if len(self.rows) <= row:
+            print('Invalid row ' + str(row))
+            return ResultSetDict()
+        return ResultRow(self.rows[row], self._index)
+
+    def __fromQuery(self, description, results: list):
+        if results is None or len(results) == 0:  # no results
+            return
+        self.rows = results
+        self.cols_header = [d.name for d in description]
+        for index, col in enumerate(self.cols_header):
+            self.cols[col] = index
+            self._index[col.lower()] = index
+
+
+# connections handed out by the pool remember which named statements they already prepared
+class PooledConnection(extensions.connection):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.prepared = set()
+        self.preparedGeneration = 0
+
+
+# rows of a query read through a server-side cursor, fetchSize rows per round trip while iterating,
+# so only one batch is held in memory. iterating yields row tuples like ResultSet.rows
+class StreamingResultSet:
+    def __init__(self, cursor, fetchSize: int):
+        self.cursor = cursor
+        self.fetchSize = fetchSize
+        self.cols_header = []
+        self.cols = ResultSetDict()
+
+    def __iter__(self):
+        while self.cursor is not None and not self.cursor.closed:
+            rows = self.cursor.fetchmany(self.fetchSize)
+            if len(self.cols_header) == 0 and self.cursor.description is not None:
+                self.cols_header = [d.name for d in self.cursor.description]
+                for index, col in enumerate(self.cols_header):
+                    self.cols[col] = index
+            if len(rows) == 0:
+                self.close()
+                return
+            yield from rows
+
+    # releases the server-side cursor, also done when iteration ends and when the DBConnector closes
+    def close(self):
+        if self.cursor is not None and not self.cursor.closed:
+            self.cursor.close()
+        self.cursor = None
+
+
+class ConnectionPool:
+    # thread-safe pool of open connections, shared by every DBConnector of the process.
+    # minSize connections are kept open even when idle, at most maxSize are ever open,
+    # connections idle for more than idleTimeout seconds are closed, and a connection
+    # that was idle for more than healthCheckInterval seconds is pinged before reuse
+    def __init__(self, params: dict, minSize=1, maxSize=10, idleTimeout=300.0, healthCheckInterval=30.0,
+                 checkoutTimeout=30.0):
+        if minSize < 0 or maxSize < 1 or minSize > maxSize:
+            raise ValueError("pool sizes must satisfy 0 <= minSize <= maxSize and maxSize >= 1")
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.idleTimeout = idleTimeout
+        self.healthCheckInterval = healthCheckInterval
+        self.checkoutTimeout = checkoutTimeout
+        self.pid = os.getpid()
+        self.__params = params
+        self.__condition = threading.Condition()
+        self.__idle = deque()  # (connection, returned at), most recently returned on the right
+        self.__size = 0  # open connections, idle and checked out
+        self.__closed = False
+        self.__stats = {"checkouts": 0, "waits": 0, "creations": 0, "discards": 0, "timeouts": 0,
+                        "health_checks": 0}
+
+    # borrow a connection, blocks while maxSize connections are already checked out
+    def getConnection(self):
+        deadline = time.monotonic() + self.checkoutTimeout
+        waited = False
+        with self.__condition:
+            self.__stats["checkouts"] += 1
+        while True:
+            connection, returnedAt = None, None
+            with self.__condition:
+                while True:
+                    if self.__closed:
+                        raise DatabaseException.ConnectionInvalid("Connection pool is closed")
+                    self.__pruneIdle()
+                    if len(self.__idle) > 0:
+                        connection, returnedAt = self.__idle.pop()
+                        break
+                    if self.__size < self.maxSize:
+                        self.__size += 1  # reserve the slot, connect outside the lock
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.__stats["timeouts"] += 1
+                        raise DatabaseException.ConnectionInvalid("Timed out waiting for a pooled connection")
+                    if not waited:
+                        waited = True
+                        self.__stats["waits"] += 1
+                    self.__condition.wait(remaining)
+            if connection is None:
+                return self.__create()
+            if self.__isHealthy(connection, returnedAt):
+                return connection
+            self.__discard(connection)
+
+    # give a borrowed connection back, any open transaction is rolled back first
+    def putConnection(self, connection):
+        try:
+            if not connection.closed and \
+                    connection.info.transaction_status != extensions.TRANSACTION_STATUS_IDLE:
+                connection.rollback()
+        except Exception:
+            pass
+        if connection.closed or self.__closed:
+            self.__discard(connection)
+            return
+        with self.__condition:
+            self.__idle.append((connection, time.monotonic()))
+            self.__condition.notify()
+
+    # close every idle connection, connections still checked out are closed when returned
+    def close(self):
+        with self.__condition:
+            self.__closed = True
+            idle = list(self.__idle)
+            self.__idle.clear()
+            self.__size -= len(idle)
+            self.__condition.notify_all()
+        for connection, _ in idle:
+            connection.close()
+
+    def stats(self) -> dict:
+        with self.__condition:
+            stats = dict(self.__stats)
+            stats["size"] = self.__size
+            stats["idle"] = len(self.__idle)
+            stats["in_use"] = self.__size - len(self.__idle)
+        return stats
+
+    def __create(self):
+        try:
+            connection = psycopg2.connect(connection_factory=PooledConnection, **self.__params)
+            connection.autocommit = False
+        except Exception:
+            with self.__condition:
+                self.__size -= 1
+                self.__condition.notify()
+            raise
+        with self.__condition:
+            self.__stats["creations"] += 1
+        return connection
+
+    def __discard(self, connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+        with self.__condition:
+            self.__size -= 1
+            self.__stats["discards"] += 1
+            self.__condition.notify()
+
+    def __isHealthy(self, connection, returnedAt) -> bool:
+        if connection.closed:
+            return False
+        if time.monotonic() - returnedAt < self.healthCheckInterval:
+            return True
+        with self.__condition:
+            self.__stats["health_checks"] += 1
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            connection.rollback()
+            return True
+        except Exception:
+            return False
+
+    # called with the lock held, closes the oldest idle connections past idleTimeout
+    def __pruneIdle(self):
+        now = time.monotonic()
+        while len(self.__idle) > 0 and self.__size > self.minSize and now - self.__idle[0][1] > self.idleTimeout:
+            connection, _ = self.__idle.popleft()
+            self.__size -= 1
+            self.__stats["discards"] += 1
+            connection.close()
+
+
+_pool = None
+_poolSettings = {}
+_poolLock = threading.Lock()
+
+
+# change the settings of the process-wide pool (minSize, maxSize, idleTimeout, healthCheckInterval,
+# checkoutTimeout), the current pool is closed and a new one is created on next use
+def configurePool(**settings):
+    global _pool
+    with _poolLock:
+        _poolSettings.update(settings)
+        pool, _pool = _pool, None
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+def getPool() -> ConnectionPool:
+    global _pool
+    with _poolLock:
+        # a pool inherited through fork() shares its sockets with the parent, never reuse it
+        if _pool is None or _pool.pid != os.getpid():
+            _pool = ConnectionPool(DBConnector.parameters(), **_poolSettings)
+        return _pool
+
+
+def closePool():
+    global _pool
+    with _poolLock:
+        pool, _pool = _pool, None
+    if pool is not None and pool.pid == os.getpid():
+        pool.close()
+
+
+def poolStats() -> dict:
+    return getPool().stats()
+
+
+# named statements, prepared once per pooled connection and executed with bound parameters
+class Statement:
+    def __init__(self, name: str, query: str):
+        self.name = name
+        self.query = query
+        self.prepare = sql.SQL("PREPARE {} AS ").format(sql.Identifier(name)) + sql.SQL(query)
+        placeholders = [int(n) for n in re.findall(r"\$(\d+)", query)]
+        self.paramCount = max(placeholders) if len(placeholders) > 0 else 0
+        # the same statement for a server-side cursor, DECLARE cannot wrap an EXECUTE
+        self.declare = re.sub(r"\$(\d+)", r"%(p\1)s", query.replace("%", "%%"))
+        self.execute = sql.SQL("EXECUTE {}").format(sql.Identifier(name))
+        if self.paramCount > 0:
+            self.execute += sql.SQL("({})").format(sql.SQL(", ").join([sql.Placeholder()] * self.paramCount))
+
+
+_statements = {}
+_statementsGeneration = 0
+
+
+# register a statement under a name, the query uses $1, $2, ... for its parameters
+def registerStatement(name: str, query: str) -> Statement:
+    statement = Statement(name, query)
+    _statements[name] = statement
+    return statement
+
+
+# forget what every pooled connection prepared, used after the schema is dropped or recreated
+def resetStatements():
+    global _statementsGeneration
+    _statementsGeneration += 1
+
+
+# observers of every statement run through a DBConnector, replaced (never changed in place) on every update
+_instruments = ()
+
+
+# fn(record) is called after every statement run through a DBConnector's execute, executePrepared or
+# executeValues, on the calling thread, with record a dict of:
+#   function   the Database.py function the statement ran for (the outermost one on the stack), or
+#              module.function of the nearest caller when it did not come from Database.py
+#   statement  the registered name for executePrepared, "query" for execute and "values" for executeValues
+#   query      the text sent to the server
+#   phases     {phase: seconds} of the phases the statement went through: connect (borrowing the connection,
+#              counted with the first statement of a DBConnector), prepare, compose, execute, commit, fetch
+#              and resultset
+#   total      the sum of the phases in seconds
+#   rows       the rows effected
+#   error      the class name of the exception the statement raised, or None
+# instruments must be quick and must not raise. with none added nothing is measured
+def addInstrument(fn):
+    global _instruments
+    _instruments = _instruments + (fn,)
+
+
+def removeInstrument(fn):
+    global _instruments
+    _instruments = tuple(instrument for instrument in _instruments if instrument is not fn)
+
+
+# the function a statement runs for, see addInstrument
+def _caller() -> str:
+    frame = sys._getframe(2)
+    function, outside = None, None
+    while frame is not None:
+        module = frame.f_globals.get("__name__")
+        if module == "Database":
+            function = frame.f_code.co_name
+        elif outside is None and module != __name__:
+            outside = module + "." + frame.f_code.co_name
+        frame = frame.f_back
+    return function or outside or "unknown"
+
+
+# times the phases of one statement and hands the record to the instruments once it is done
+class _Probe:
+    def __init__(self, statement: str, connect: float):
+        self.statement = statement
+        self.function = _caller()
+        self.phases = {"connect": connect} if connect > 0 else {}
+        self.__last = time.perf_counter()
+
+    # the time since the previous lap (or the start) was spent in phase
+    def lap(self, phase: str):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self.__last
+        self.__last = now
+
+    def finish(self, query, rows: int, error):
+        if isinstance(query, bytes):
+            query = query.decode("utf-8", "replace")
+        record = {"function": self.function, "statement": self.statement, "query": str(query),
+                  "phases": self.phases, "total": sum(self.phases.values()), "rows": rows,
+                  "error": None if error is None else type(error).__name__}
+        for instrument in _instruments:
+            try:
+                instrument(record)
+            except Exception:
+                pass
+
+
+# turns integrity errors raised inside the block into the matching DatabaseException, and any other error
+# of the server (a value out of range, a missing table) into UNKNOWN_ERROR
+@contextmanager
+def violations():
+    try:
+        yield
+    except errors.lookup("23502"):
+        raise DatabaseException.NOT_NULL_VIOLATION("NOT_NULL_VIOLATION")
+    except errors.lookup("23503"):
+        raise DatabaseException.FOREIGN_KEY_VIOLATION("FOREIGN_KEY_VIOLATION")
+    except errors.lookup("23505"):
+        raise DatabaseException.UNIQUE_VIOLATION("UNIQUE_VIOLATION")
+    except errors.lookup("23514"):
+        raise DatabaseException.CHECK_VIOLATION("CHECK_VIOLATION")
+    except psycopg2.Error as e:
+        raise DatabaseException.UNKNOWN_ERROR(str(e).strip())
+
+
+# one value in COPY text format
+def _copyValue(value) -> str:
+    if value is None:
+        return "\\N"
+    return str(value).replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
+
+
+# a unit of work: every DBConnector created on the owning thread while it is open shares its connection,
+# and nothing is committed before the block ends. without savepoints the first failed call aborts the
+# whole unit, with savepoints each DBConnector runs under its own savepoint and a failed call only
+# undoes itself
+class Transaction:
+    def __init__(self, savepoints: bool):
+        self.savepoints = savepoints
+        self.failed = False
+        self.committed = False
+        # called once the unit has ended, committed or not
+        self.onEnd = []
+        self.__pool = getPool()
+        self.__savepointCount = 0
+        self.connection = self.__pool.getConnection()
+
+    def nextSavepoint(self) -> str:
+        self.__savepointCount += 1
+        return "unit_of_work_" + str(self.__savepointCount)
+
+    # ends the unit, commits unless told otherwise or a call failed, and gives the connection back
+    def end(self, commit: bool):
+        connection, self.connection = self.connection, None
+        try:
+            if connection.info.transaction_status == extensions.TRANSACTION_STATUS_INERROR:
+                self.failed = True
+            if commit and not self.failed:
+                try:
+                    connection.commit()
+                    self.committed = True
+                except Exception:
+                    self.failed = True
+                    raise DatabaseException.ConnectionInvalid("Could not commit changes")
+        finally:
+            self.__pool.putConnection(connection)
+            for callback in self.onEnd:
+                callback()
+
+
+_local = threading.local()
+
+
+def currentTransaction() -> Union[Transaction, None]:
+    return getattr(_local, "transaction", None)
+
+
+# with transaction() as unit: ... runs every Database.py call of the block over one connection and
+# one commit, rolling back if the block raises or (without savepoints) if any call failed.
+# a nested block joins the enclosing unit
+@contextmanager
+def transaction(savepoints: bool = False):
+    current = currentTransaction()
+    if current is not None:
+        yield current
+        return
+    try:
+        unit = Transaction(savepoints)
+    except DatabaseException.ConnectionInvalid:
+        raise
+    except Exception:
+        raise DatabaseException.ConnectionInvalid("Could not connect to database")
+    _local.transaction = unit
+    try:
+        yield unit
+    except BaseException:
+        _local.transaction = None
+        unit.end(commit=False)
+        raise
+    _local.transaction = None
+    unit.end(commit=True)
+
+
+class DBConnector:
+    __params = None
+
+    # constructor, borrows a connection from the process-wide pool, or joins the
+    # transaction opened with transaction() on this thread
+    def __init__(self):
+        self.connection = None
+        self.cursor = None
+        self.__explicit = False  # inside begin() ... commit()/rollback(), statements are not committed one by one
+        self.__transaction = currentTransaction()
+        self.__savepoint = None
+        self.__streams = []
+        started = time.perf_counter()
+        self.__connectTime = 0.0  # reported with the first measured statement, see addInstrument
+        if self.__transaction is not None:
+            self.__join()
+            self.__connectTime = time.perf_counter() - started
+            return
+        try:
+            self.__pool = getPool()
+            self.connection = self.__pool.getConnection()
+            self.cursor = self.connection.cursor()
+            self.__connectTime = time.perf_counter() - started
+        except Exception as e:
+            if self.connection is not None:
+                self.__pool.putConnection(self.connection)
+            self.connection = None
+            self.cursor = None
+            raise DatabaseException.ConnectionInvalid("Could not connect to database")
+
+    def __join(self):
+        unit = self.__transaction
+        if unit.failed:
+            return  # the unit is aborted, every statement of this call fails with ConnectionInvalid
+        try:
+            self.cursor = unit.connection.cursor()
+            if unit.savepoints:
+                savepoint = unit.nextSavepoint()
+                self.cursor.execute(sql.SQL("SAVEPOINT {}").format(sql.Identifier(savepoint)))
+                self.__savepoint = savepoint
+        except Exception:
+            unit.failed = True
+            self.cursor = None
+            raise DatabaseException.ConnectionInvalid("Could not join transaction")
+        self.connection = unit.connection
+
+    # connection parameters, database.ini is parsed only once per process
+    @staticmethod
+    def parameters() -> dict:
+        if DBConnector.__params is None:
+            DBConnector.__params = DBConnector.__config()
+        return DBConnector.__params
+
+    # close connection, the underlying connection goes back to the pool
+    def close(self):
+        for stream in self.__streams:
+            try:
+                stream.close()
+            except Exception:
+                pass
+        self.__streams = []
+        if self.__transaction is not None and self.connection is not None:
+            self.__leave()
+        if self.cursor is not None:
+            self.cursor.close()
+            self.cursor = None
+        if self.connection is not None:
+            self.__pool.putConnection(self.connection)
+            self.connection = None
+
+    # a call that ends inside a transaction() block keeps the connection open for the next one,
+    # its savepoint (if any) is released, or rolled back first if its last statement failed
+    def __leave(self):
+        failed = self.connection.info.transaction_status == extensions.TRANSACTION_STATUS_INERROR
+        try:
+            if self.__savepoint is not None:
+                if failed:
+                    self.cursor.execute(sql.SQL("ROLLBACK TO SAVEPOINT {}").format(sql.Identifier(self.__savepoint)))
+                self.cursor.execute(sql.SQL("RELEASE SAVEPOINT {}").format(sql.Identifier(self.__savepoint)))
+            elif failed:
+                self.__transaction.failed = True
+        except Exception:
+            self.__transaction.failed = True
+        self.cursor.close()
+        self.cursor = None
+        self.connection = None
+
+    # start an explicit transaction, execute stops committing after every statement
+    # until commit() or rollback() is called
+    def begin(self):
+        self.__explicit = True
+
+    # commit connection's changes, inside a transaction() block changes are committed when the block ends
+    def commit(self):
+        self.__explicit = False
+        if self.__transaction is not None:
+            return
+        if self.connection is not None:
+            try:
+                self.connection.commit()
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not commit changes")
+
+    # rollback connection's changes, inside a transaction() block only this call's savepoint is rolled
+    # back, or the whole unit if it runs without savepoints
+    def rollback(self):
+        self.__explicit = False
+        if self.__transaction is not None and self.connection is not None:
+            try:
+                if self.__savepoint is not None:
+                    self.cursor.execute(sql.SQL("ROLLBACK TO SAVEPOINT {}").format(sql.Identifier(self.__savepoint)))
+                    return
+                self.__transaction.failed = True
+                self.connection.rollback()
+                return
+            except Exception:
+                self.__transaction.failed = True
+                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+        if self.connection is not None:
+            try:
+                self.connection.rollback()
+            except Exception:
+                raise DatabaseException.ConnectionInvalid("Could not rollback changes")
+
+    def savepoint(self, name: str):
+        self.__savepointCommand("SAVEPOINT {}", name)
+
+    def rollbackToSavepoint(self, name: str):
+        self.__savepointCommand("ROLLBACK TO SAVEPOINT {}", name)
+
+    def releaseSavepoint(self, name: str):
+        self.__savepointCommand("RELEASE SAVEPOINT {}", name)
+
+    def __savepointCommand(self, command: str, name: str):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        try:
+            self.cursor.execute(sql.SQL(command).format(sql.Identifier(name)))
+        except Exception:
+            raise DatabaseException.ConnectionInvalid("Savepoint " + name + " failed")
+
+    # streams rows (tuples in the order of columns) into table with COPY FROM STDIN,
+    # returns the number of rows copied, the whole copy fails on the first violating row
+    def copyFrom(self, table: str, columns, rows) -> int:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        query = sql.SQL("COPY {} ({}) FROM STDIN").format(sql.SQL(table), sql.SQL(", ").join(map(sql.SQL, columns)))
+        data = io.StringIO()
+        for row in rows:
+            data.write("\t".join(map(_copyValue, row)))
+            data.write("\n")
+        data.seek(0)
+        with violations():
+            self.cursor.copy_expert(query, data)
+            row_effected = max(self.cursor.rowcount, 0)
+            if not self.__explicit and self.__transaction is None:
+                self.commit()
+        return row_effected
+
+    # executes the query, if it is SELECT you may ask to print the results with printSchema
+    # returns the number of rows effected and a ResultSet (for SELECT)
+    def execute(self, query: Union[str, sql.Composed], printSchema=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        if len(_instruments) > 0:
+            return self.__runMeasured(query, None, printSchema, self.__probe("query"))
+        return self.__run(query, None, printSchema)
+
+    # executes a statement registered with registerStatement, preparing it first if this
+    # connection has not done so yet, returns the same as execute
+    def executePrepared(self, name: str, params=(), printSchema=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        statement = _statements[name]
+        if len(params) != statement.paramCount:
+            raise DatabaseException.UNKNOWN_ERROR("Statement " + name + " expects " + str(statement.paramCount) +
+                                                  " parameters")
+        if len(_instruments) > 0:
+            probe = self.__probe(name)
+            try:
+                self.__prepare(statement)
+            except Exception as e:
+                probe.finish(statement.prepare.as_string(self.cursor), 0, e)
+                raise
+            probe.lap("prepare")
+            return self.__runMeasured(statement.execute, params, printSchema, probe)
+        self.__prepare(statement)
+        return self.__run(statement.execute, params, printSchema)
+
+    # runs a registered statement through a server-side cursor and returns its rows as a lazy
+    # StreamingResultSet, which stays readable until the DBConnector is closed
+    def stream(self, name: str, params=(), fetchSize: int = 1000) -> StreamingResultSet:
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        statement = _statements[name]
+        if len(params) != statement.paramCount:
+            raise DatabaseException.UNKNOWN_ERROR("Statement " + name + " expects " + str(statement.paramCount) +
+                                                  " parameters")
+        cursor = self.connection.cursor(name="stream_" + str(id(self)) + "_" + str(len(self.__streams)))
+        cursor.itersize = fetchSize
+        stream = StreamingResultSet(cursor, fetchSize)
+        self.__streams.append(stream)
+        with violations():
+            cursor.execute(statement.declare, {"p" + str(i + 1): value for i, value in enumerate(params)})
+        return stream
+
+    def __prepare(self, statement: Statement):
+        connection = self.connection
+        with violations():
+            if connection.preparedGeneration != _statementsGeneration:
+                self.cursor.execute("DEALLOCATE ALL")
+                connection.prepared.clear()
+                connection.preparedGeneration = _statementsGeneration
+            if statement.name not in connection.prepared:
+                self.cursor.execute(statement.prepare)
+                connection.prepared.add(statement.name)
+
+    # executes a query holding a single VALUES %s placeholder, expanded to one tuple per row (formatted
+    # with template) so that all rows are sent in one round trip, returns the same as execute
+    def executeValues(self, query: Union[str, sql.Composed], rows, template=None, printSchema=False) -> (int, ResultSet):
+        if self.connection is None:
+            raise DatabaseException.ConnectionInvalid("Connection Invalid")
+        probe = self.__probe("values") if len(_instruments) > 0 else None
+        try:
+            with violations():
+                # execute_values composes, executes and fetches in one go, measured as execute
+                results = extras.execute_values(self.cursor, query, rows, template, page_size=max(len(rows), 1),
+                                                fetch=True)
+                row_effected = max(self.cursor.rowcount, 0)
+                if probe is not None:
+                    probe.lap("execute")
+                if not self.__explicit and self.__transaction is None:
+                    self.commit()
+                    if probe is not None:
+                        probe.lap("commit")
+        except Exception as e:
+            if probe is not None:
+                probe.finish(self.cursor.query or query, 0, e)
+            raise
+        entries = ResultSet(self.cursor.description, results)
+        if probe is not None:
+            probe.lap("resultset")
+            probe.finish(self.cursor.query, row_effected, None)
+        if printSchema:
+            print(entries)
+        return row_effected, entries
+
+    def __run(self, query, params, printSchema) -> (int, ResultSet):
+        # try execute the query
+        with violations():
+            self.cursor.execute(query, params)
+            row_effected = max(self.cursor.rowcount, 0)
+            if not self.__explicit and self.__transaction is None:
+                self.commit()
+
+        # get entries in case of SELECT
+        if self.cursor.description is not None:
+            entries = ResultSet(self.cursor.description, self.cursor.fetchall())
+        else:
+            entries = ResultSet()
+
+        # print SELECT entries
+        if printSchema:
+            print(entries)
+
+        return row_effected, entries
+
+    def __probe(self, statement: str) -> _Probe:
+        probe = _Probe(statement, self.__connectTime)
+        self.__connectTime = 0.0
+        return probe
+
+    # __run timing every phase for the instruments, the query is composed apart from executing it so that
+    # the two can be told apart
+    def __runMeasured(self, query, params, printSchema, probe: _Probe) -> (int, ResultSet):
+        text = query
+        try:
+            text = self.cursor.mogrify(query, params)
+            probe.lap("compose")
+            with violations():
+                self.cursor.execute(text)
+                row_effected = max(self.cursor.rowcount, 0)
+                probe.lap("execute")
+                if not self.__explicit and self.__transaction is None:
+                    self.commit()
+                    probe.lap("commit")
+            if self.cursor.description is not None:
+                results = self.cursor.fetchall()
+                probe.lap("fetch")
+                entries = ResultSet(self.cursor.description, results)
+            else:
+                entries = ResultSet()
+            probe.lap("resultset")
+        except Exception as e:
+            probe.finish(text, 0, e)
+            raise
+        probe.finish(text, row_effected, None)
+        if printSchema:
+            print(entries)
+        return row_effected, entries
+
+    # grant credentials
+    @staticmethod
+    def __config(filename=os.path.join(os.path.join(os.getcwd(), "Utility"), 'database.ini'),
+                 section='postgresql'):
+        # create a parser
+        parser = ConfigParser()
+        # read config file
+        parser.read(filename)
+
+        # get section
+        db = {}
+        if parser.has_section(section):
+            params = parser.items(section)
+            for param in params:
+                db[param[0]] = param[1]
+        else:
+            # file not found
+            db = DBConnector.__config(
+                filename=os.path.join(os.path.join(os.path.dirname(os.getcwd()), 'Utility'), 'database.ini'))
+            if db is None:
+                raise DatabaseException.database_ini_ERROR("Please modify database.ini file under Utility")
+        return db
@@ -0,0 +1,101 @@
+import copy
+import threading
+import Utility.DBConnector as Connector
+import Utility.Notify as Notify
+from Utility.Cache import Cache
+
+
+# the player, match and stadium rows get*Profile read, by id, so repeated profile lookups cost no round
+# trip. every caller gets its own copy of the entity, the setters of one cannot change what the others see.
+# ids found missing are remembered too, for the shorter negativeTtl since another process may add them.
+# kind is the entity's table, and entries are dropped by the (kind, id) invalidations of the writes
+class IdentityMap:
+    def __init__(self, capacity: int = 10000, ttl: float = 300.0, negativeTtl: float = 5.0):
+        self.negativeTtl = negativeTtl
+        self.__entries = Cache(capacity, ttl)
+        self.__negativeHits = 0
+
+    # (True, entity) when known, (True, None) when known to be missing
+    def get(self, kind: str, entityID: int) -> (bool, object):
+        hit, entity = self.__entries.get((kind, entityID))
+        if hit and entity is None:
+            self.__negativeHits += 1
+        return hit, entity
+
+    def token(self, kind: str, entityID: int) -> tuple:
+        return self.__entries.token([(kind, entityID)])
+
+    # entity None remembers that the id does not exist
+    def put(self, kind: str, entityID: int, entity, token: tuple):
+        self.__entries.put((kind, entityID), entity, [(kind, entityID)], token,
+                           self.negativeTtl if entity is None else None)
+
+    def invalidate(self, relation: str, key=None):
+        self.__entries.invalidate(relation, key)
+
+    def clear(self):
+        self.__entries.clear()
+
+    def stats(self) -> dict:
+        stats = self.__entries.stats()
+        stats["negative_hits"] = self.__negativeHits
+        return stats
+
+
+# the process-wide identity map is off until configureIdentityMap() is called
+_identities = None
+_identitiesLock = threading.Lock()
+
+
+# turn the identity map on with the given capacity and ttls (in seconds), or off with enabled=False,
+# whatever was held before is dropped
+def configureIdentityMap(capacity: int = 10000, ttl: float = 300.0, negativeTtl: float = 5.0, enabled: bool = True):
+    global _identities
+    with _identitiesLock:
+        _identities = IdentityMap(capacity, ttl, negativeTtl) if enabled else None
+
+
+def clearIdentityMap():
+    identities = _identities
+    if identities is not None:
+        identities.clear()
+
+
+def identityMapStats() -> dict:
+    identities = _identities
+    if identities is None:
+        return {}
+    return identities.stats()
+
+
+def _invalidateLocal(changes: list):
+    identities = _identities
+    if identities is None:
+        return
+    for relation, key in changes:
+        identities.invalidate(relation, key)
+
+
+Notify.subscribe(_invalidateLocal, clearIdentityMap)
+
+
+# the entity held for kind and entityID as (hit, entity, token), entity None for a known missing id. on a
+# miss the token goes to remember() with what the database returned. inside a transaction() the map is
+# bypassed, the unit must see its own writes
+def lookup(kind: str, entityID) -> (bool, object, tuple):
+    identities = _identities
+    if identities is None or type(entityID) is not int or Connector.currentTransaction() is not None:
+        return False, None, None
+    hit, entity = identities.get(kind, entityID)
+    if hit:
+        return True, copy.copy(entity), None
+    return False, None, identities.token(kind, entityID)
+
+
+# holds a copy of the entity a read returned, the caller keeps the one it has
+def remember(kind: str, entityID: int, entity, token: tuple):
+    identities = _identities
+    if identities is None or token is None:
+        return
+    identities.put(kind, entityID, copy.copy(entity), token)
+
@@ -0,0 +1,231 @@
+import datetime
+import http.server
+import math
+import threading
+from collections import deque
+import Utility.DBConnector as Connector
+
+# bucket i of a Histogram holds the values in [LOWEST * GROWTH^i, LOWEST * GROWTH^(i+1)), so every value
+# is known to within GROWTH (4%) however large it is
+LOWEST = 1e-6
+GROWTH = 1.04
+_logGrowth = math.log(GROWTH)
+
+
+# latencies in seconds, kept in logarithmic buckets so that recording is cheap, memory stays bounded
+# whatever the number of samples, and histograms of other threads or processes can be merged exactly.
+# percentiles are read at the upper bound of their bucket
+class Histogram:
+    def __init__(self):
+        self.__buckets = {}
+        self.__count = 0
+        self.__sum = 0.0
+        self.__max = 0.0
+        self.__lock = threading.Lock()
+
+    def record(self, seconds: float):
+        bucket = int(math.log(seconds / LOWEST) / _logGrowth) if seconds > LOWEST else 0
+        with self.__lock:
+            self.__buckets[bucket] = self.__buckets.get(bucket, 0) + 1
+            self.__count += 1
+            self.__sum += seconds
+            if seconds > self.__max:
+                self.__max = seconds
+
+    def merge(self, other: "Histogram"):
+        self.mergeDict(other.toDict())
+
+    # adds the samples of a histogram's toDict()
+    def mergeDict(self, state: dict):
+        with self.__lock:
+            for bucket, count in state["buckets"].items():
+                self.__buckets[int(bucket)] = self.__buckets.get(int(bucket), 0) + count
+            self.__count += state["count"]
+            self.__sum += state["sum"]
+            self.__max = max(self.__max, state["max"])
+
+    def count(self) -> int:
+        return self.__count
+
+    # the sum of the samples in seconds
+    def total(self) -> float:
+        return self.__sum
+
+    # the value below which a fraction p/100 of the samples fall, in seconds
+    def percentile(self, p: float) -> float:
+        with self.__lock:
+            if self.__count == 0:
+                return 0.0
+            rank = max(1, int(math.ceil(p / 100.0 * self.__count)))
+            seen = 0
+            for bucket in sorted(self.__buckets):
+                seen += self.__buckets[bucket]
+                if seen >= rank:
+                    return min(LOWEST * GROWTH ** (bucket + 1), self.__max)
+            return self.__max
+
+    # latency summary in microseconds, like benchmark.timing.summarize
+    def summary(self) -> dict:
+        return {"count": self.__count,
+                "mean_us": self.__sum / self.__count * 1e6 if self.__count > 0 else 0.0,
+                "p50_us": self.percentile(50) * 1e6,
+                "p95_us": self.percentile(95) * 1e6,
+                "p99_us": self.percentile(99) * 1e6,
+                "max_us": self.__max * 1e6}
+
+    # plain data, to send to another process or write as JSON
+    def toDict(self) -> dict:
+        with self.__lock:
+            return {"buckets": {str(bucket): count for bucket, count in self.__buckets.items()},
+                    "count": self.__count, "sum": self.__sum, "max": self.__max}
+
+    @staticmethod
+    def fromDict(state: dict) -> "Histogram":
+        histogram = Histogram()
+        histogram.mergeDict(state)
+        return histogram
+
+
+# aggregates the statements run through DBConnector (it is the instrument, see Connector.addInstrument):
+# a Histogram of the total and of every phase per function and statement, the exceptions raised, and a
+# slow-query log. statements taking at least slowThreshold seconds (None for no log) are written as one
+# line each to slowLog (a file path, appended to, or an open stream) when given, and the last slowKept are
+# kept in memory
+class QueryMetrics:
+    def __init__(self, slowThreshold: float = 0.1, slowLog=None, slowKept: int = 100):
+        self.slowThreshold = slowThreshold
+        self.__slowLog = open(slowLog, "a", buffering=1) if isinstance(slowLog, str) else slowLog
+        self.__ownsLog = isinstance(slowLog, str)
+        self.__slow = deque(maxlen=slowKept)
+        self.__statements = {}  # (function, statement): {"total": Histogram, "phases": {}, "errors": {}}
+        self.__lock = threading.Lock()
+
+    def __call__(self, record: dict):
+        key = (record["function"], record["statement"])
+        with self.__lock:
+            entry = self.__statements.get(key)
+            if entry is None:
+                entry = self.__statements[key] = {"total": Histogram(), "phases": {}, "errors": {}}
+            for phase in record["phases"]:
+                if phase not in entry["phases"]:
+                    entry["phases"][phase] = Histogram()
+            if record["error"] is not None:
+                entry["errors"][record["error"]] = entry["errors"].get(record["error"], 0) + 1
+        entry["total"].record(record["total"])
+        for phase, seconds in record["phases"].items():
+            entry["phases"][phase].record(seconds)
+        if self.slowThreshold is not None and record["total"] >= self.slowThreshold:
+            self.__logSlow(record)
+
+    # {function: {statement: {"total": summary, "phases": {phase: summary}, "errors": {class name: count}}}}
+    # with the summaries of Histogram.summary
+    def stats(self) -> dict:
+        with self.__lock:
+            entries = list(self.__statements.items())
+        stats = {}
+        for (function, statement), entry in sorted(entries):
+            stats.setdefault(function, {})[statement] = {
+                "total": entry["total"].summary(),
+                "phases": {phase: histogram.summary() for phase, histogram in entry["phases"].items()},
+                "errors": dict(entry["errors"])}
+        return stats
+
+    # the records of the last slow statements, oldest first, each with the time it finished ("at")
+    def slowQueries(self) -> list:
+        with self.__lock:
+            return list(self.__slow)
+
+    def reset(self):
+        with self.__lock:
+            self.__statements = {}
+            self.__slow.clear()
+
+    # the metrics in the Prometheus text format, for a scraper: the total and per-phase latencies as
+    # summaries (p50, p95, p99, sum and count) and the errors as counters
+    def export(self) -> str:
+        with self.__lock:
+            entries = sorted(self.__statements.items())
+        lines = ["# HELP db_statement_seconds Time of the statements run through DBConnector, by phase.",
+                 "# TYPE db_statement_seconds summary"]
+        errors = ["# HELP db_statement_errors_total Statements run through DBConnector that raised.",
+                  "# TYPE db_statement_errors_total counter"]
+        for (function, statement), entry in entries:
+            labels = 'function="{}",statement="{}"'.format(_label(function), _label(statement))
+            for phase, histogram in [("total", entry["total"])] + sorted(entry["phases"].items()):
+                series = labels + ',phase="{}"'.format(phase)
+                for quantile in (0.5, 0.95, 0.99):
+                    lines.append('db_statement_seconds{{{},quantile="{}"}} {:.9f}'.format(
+                        series, quantile, histogram.percentile(quantile * 100)))
+                lines.append("db_statement_seconds_sum{{{}}} {:.9f}".format(series, histogram.total()))
+                lines.append("db_statement_seconds_count{{{}}} {}".format(series, histogram.count()))
+            for error, count in sorted(entry["errors"].items()):
+                errors.append('db_statement_errors_total{{{},error="{}"}} {}'.format(labels, _label(error), count))
+        return "\n".join(lines + errors) + "\n"
+
+    def close(self):
+        if self.__ownsLog and self.__slowLog is not None:
+            self.__slowLog.close()
+        self.__slowLog = None
+
+    def __logSlow(self, record: dict):
+        at = datetime.datetime.now().isoformat(timespec="milliseconds")
+        line = "{} {:.3f}ms {} {} {}{} {}".format(
+            at, record["total"] * 1e3, record["function"], record["statement"],
+            " ".join("{}={:.3f}ms".format(phase, seconds * 1e3) for phase, seconds in record["phases"].items()),
+            "" if record["error"] is None else " error=" + record["error"], " ".join(record["query"].split()))
+        with self.__lock:
+            self.__slow.append(dict(record, at=at))
+            if self.__slowLog is not None:
+                self.__slowLog.write(line + "\n")
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_queryMetrics = None
+
+
+# measure every statement from now on with a new QueryMetrics (see there for the settings), replacing the
+# current one, and return it
+def enableQueryMetrics(slowThreshold: float = 0.1, slowLog=None, slowKept: int = 100) -> QueryMetrics:
+    global _queryMetrics
+    disableQueryMetrics()
+    _queryMetrics = QueryMetrics(slowThreshold, slowLog, slowKept)
+    Connector.addInstrument(_queryMetrics)
+    return _queryMetrics
+
+
+def disableQueryMetrics():
+    global _queryMetrics
+    metrics, _queryMetrics = _queryMetrics, None
+    if metrics is not None:
+        Connector.removeInstrument(metrics)
+        metrics.close()
+
+
+# the QueryMetrics of enableQueryMetrics, None while statements are not measured
+def queryMetrics():
+    return _queryMetrics
+
+
+class _MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        metrics = _queryMetrics
+        body = (metrics.export() if metrics is not None else "").encode("utf-8")
+        self.send_response(200 if self.path in ("/", "/metrics") else 404)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+# serves the export of the current QueryMetrics at http://host:port/metrics from a daemon thread, for a
+# local scraper, until shutdown() is called on the returned server
+def serveMetrics(port: int = 9464, host: str = "127.0.0.1") -> http.server.HTTPServer:
+    server = http.server.ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
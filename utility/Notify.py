@@ -0,0 +1,200 @@
+import json
+import os
+import select
+import socket
+import threading
+import uuid
+from typing import Union
+import psycopg2
+from psycopg2 import sql
+import Utility.DBConnector as Connector
+from Utility.AsyncDBConnector import AsyncDBConnector
+
+# every process using Database.py tells the others what its writes changed over this channel, as the same
+# (relation, key) pairs the local caches are invalidated with
+CHANNEL = "league_changes"
+
+Connector.registerStatement("publishChanges", "SELECT pg_notify($1, $2)")
+
+
+# receives the changes the other processes publish on a dedicated connection, and hands them to the
+# subscribers. while it is not connected notifications are lost, so after every (re)connection the
+# subscribers are told to drop everything they hold
+class Listener(threading.Thread):
+    def __init__(self, channel: str, reconnectDelay: float = 1.0, pollInterval: float = 0.5):
+        super().__init__(name="league-changes-listener", daemon=True)
+        self.channel = channel
+        self.reconnectDelay = reconnectDelay
+        self.pollInterval = pollInterval
+        self.pid = os.getpid()
+        self.listening = threading.Event()
+        self.__stopped = threading.Event()
+        self.__received = 0
+        self.__applied = 0
+        self.__reconnects = 0
+
+    def run(self):
+        while not self.__stopped.is_set():
+            connection = None
+            try:
+                connection = psycopg2.connect(**Connector.DBConnector.parameters())
+                connection.autocommit = True
+                connection.cursor().execute(sql.SQL("LISTEN {}").format(sql.Identifier(self.channel)))
+                resync()
+                self.listening.set()
+                while not self.__stopped.is_set():
+                    if select.select([connection], [], [], self.pollInterval) == ([], [], []):
+                        continue
+                    connection.poll()
+                    while connection.notifies:
+                        self.__deliver(connection.notifies.pop(0).payload)
+            except Exception:
+                self.listening.clear()
+                self.__reconnects += 1
+                self.__stopped.wait(self.reconnectDelay)
+            finally:
+                if connection is not None:
+                    connection.close()
+        self.listening.clear()
+
+    def stop(self, timeout: float = None):
+        self.__stopped.set()
+        if self.is_alive() and threading.current_thread() is not self:
+            self.join(timeout)
+
+    def stats(self) -> dict:
+        return {"received": self.__received, "applied": self.__applied, "reconnects": self.__reconnects,
+                "listening": self.listening.is_set()}
+
+    def __deliver(self, payload: str):
+        self.__received += 1
+        try:
+            message = json.loads(payload)
+            if message["origin"] == _origin():
+                return
+            changes = message["changes"]
+            if changes is not None:
+                changes = [(relation, key) for relation, key in changes]
+        except (ValueError, KeyError, TypeError):
+            return
+        if changes is None:
+            resync()
+        else:
+            dispatch(changes)
+        self.__applied += 1
+
+
+_subscribers = []
+_listener = None
+_channel = None
+_published = 0
+_notifyLock = threading.Lock()
+_origins = {}
+
+
+# identifies this process in what it publishes, so it skips its own notifications
+def _origin() -> str:
+    pid = os.getpid()
+    if pid not in _origins:
+        _origins[pid] = "{}-{}-{}".format(socket.gethostname(), pid, uuid.uuid4().hex[:8])
+    return _origins[pid]
+
+
+# onChanges(changes) is called with the (relation, key) pairs a write of this process or, once published,
+# of another one changed. onResync() when everything may have changed or notifications were missed
+def subscribe(onChanges, onResync):
+    _subscribers.append((onChanges, onResync))
+
+
+def dispatch(changes: list):
+    for onChanges, onResync in list(_subscribers):
+        onChanges(changes)
+
+
+def resync():
+    for onChanges, onResync in list(_subscribers):
+        onResync()
+
+
+# start publishing this process's changes on channel and, with listen, applying the other processes'.
+# the listener belongs to the process that started it, a forked child has to call this again
+def configureNotifications(listen: bool = True, channel: str = CHANNEL):
+    global _listener, _channel
+    with _notifyLock:
+        listener = _listener
+        if listener is not None and listener.pid == os.getpid():
+            listener.stop()
+        _channel = channel
+        _listener = Listener(channel) if listen else None
+        if _listener is not None:
+            _listener.start()
+
+
+def disableNotifications():
+    global _listener, _channel
+    with _notifyLock:
+        listener, _listener, _channel = _listener, None, None
+    if listener is not None and listener.pid == os.getpid():
+        listener.stop()
+
+
+# waits until the listener is connected and listening, False if it is not running or timeout passed
+def waitListening(timeout: float = None) -> bool:
+    listener = _listener
+    if listener is None or listener.pid != os.getpid():
+        return False
+    return listener.listening.wait(timeout)
+
+
+# tells the other processes what a write changed, None meaning anything may have. inside a transaction()
+# the notification is sent on the unit's connection, so it is delivered if the unit commits and dropped
+# if it rolls back
+def publish(changes: Union[list, None]):
+    global _published
+    params = _publishParams(changes)
+    if params is None:
+        return
+    conn = None
+    try:
+        conn = Connector.DBConnector()
+        conn.executePrepared("publishChanges", params)
+        _published += 1
+    except Exception:
+        pass
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# publish for the coroutines of AsyncDatabase.py, sent over the running loop's pool instead of blocking it
+async def publishAsync(changes: Union[list, None]):
+    global _published
+    params = _publishParams(changes)
+    if params is None:
+        return
+    conn = None
+    try:
+        conn = await AsyncDBConnector.connect()
+        await conn.executePrepared("publishChanges", params)
+        _published += 1
+    except Exception:
+        pass
+    finally:
+        if conn is not None:
+            conn.close()
+
+
+# (channel, payload) of a publishChanges statement, None when there is nothing to publish
+def _publishParams(changes: Union[list, None]) -> Union[tuple, None]:
+    channel = _channel
+    if channel is None or (changes is not None and len(changes) == 0):
+        return None
+    return channel, json.dumps({"origin": _origin(), "changes": changes})
+
+
+def notificationStats() -> dict:
+    listener = _listener
+    stats = {"published": _published, "channel": _channel}
+    if listener is not None and listener.pid == os.getpid():
+        stats.update(listener.stats())
+    return stats